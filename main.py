@@ -1,27 +1,55 @@
+import os
 import streamlit as st
 
+from src.utils import instrumentation
 from src.utils.database_operations import DatabaseManipulator
-from src.pages import home, investment_rules, insert_form, view_investments
+from src.utils.log_config import configure_logging
+from src.utils.quote_refresher import QuoteRefresher
+from src.utils.result_cache import QUOTE_REFRESH_SECONDS
+from src.pages import diagnostics, home, investment_rules, insert_form, view_investments
 
 PAGES = {
     "Home": home,
     "Insert Form": insert_form,
     "View Investments": view_investments,
-    "Investment Rules": investment_rules
+    "Investment Rules": investment_rules,
+    diagnostics.DIAGNOSTICS_PAGE: diagnostics,
 }
 
 
-def init_db(database_name: str) -> None:
+@st.cache_resource
+def start_logging() -> None:
+    """Logging is configured once per server process, before anything logs."""
+    configure_logging()
+
+
+@st.cache_resource
+def init_db(database_name: str) -> DatabaseManipulator:
     return DatabaseManipulator(database_name)
 
 
+@st.cache_resource
+def start_quote_refresher(database_name: str) -> QuoteRefresher:
+    """One background quote refresher per server process."""
+    interval = float(os.environ.get("ETF_QUOTE_REFRESH_SECONDS", QUOTE_REFRESH_SECONDS))
+    return QuoteRefresher(database_name, interval=interval).start()
+
+
 def main(database_manipulator: DatabaseManipulator):
     st.sidebar.title("Pages")
     selection = st.sidebar.radio("Navigate", list(PAGES.keys()))
     page = PAGES[selection]
-    page.app(database_manipulator)
+
+    recording = instrumentation.start_recording(selection)
+    try:
+        with instrumentation.span(f"page.{selection}"):
+            page.app(database_manipulator)
+    finally:
+        diagnostics.record_report(instrumentation.stop_recording(recording))
 
 
 if __name__ == "__main__":
+    start_logging()
     database_manipulator = init_db("etf_investments.db")
+    start_quote_refresher("etf_investments.db")
     main(database_manipulator)
\ No newline at end of file
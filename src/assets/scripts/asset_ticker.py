@@ -1,24 +1,47 @@
-import yfinance as yf
+from datetime import datetime
 
-from datetime import datetime, timedelta
+from src.assets.scripts.price_provider import PriceProvider, YFinancePriceProvider
+from src.utils.instrumentation import increment, traced
 
 
 class AssetTicker:
-    def __init__(self, ticker: str) -> yf.Ticker:
+    def __init__(
+        self, ticker: str, price_store=None, price_provider: PriceProvider = None
+    ) -> None:
         if not isinstance(ticker, str):
             raise TypeError(f"Expected a string for ticker, got {type(ticker).__name__}")
-        self.asset = yf.Ticker(ticker)
+        self.ticker = ticker
+        self.price_store = price_store
+        self.price_provider = price_provider or YFinancePriceProvider()
 
+    @staticmethod
+    @traced("AssetTicker.get_current_prices")
+    def get_current_prices(tickers: list, price_provider: PriceProvider = None) -> dict:
+        """Fetch the latest close of every ticker in a single bulk request."""
+        return (price_provider or YFinancePriceProvider()).get_current_prices(tickers)
+
+    @traced("AssetTicker.get_current_price")
     def get_current_price(self) -> float:
-        return round(self.asset.history(period="1d")["Close"].iloc[-1], 2)
+        return self.price_provider.get_current_price(self.ticker)
 
     def get_long_name(self) -> str:
-        return self.asset.info.get("longName", "Unknown Asset")
-
-    def get_previous_price(self, date: datetime) -> yf.Ticker:
-        return round(
-            self.asset.history(start=date, end=date + timedelta(days=1))["Close"].iloc[
-                -1
-            ],
-            2,
-        )
+        return self.get_metadata()["long_name"]
+
+    @traced("AssetTicker.get_metadata")
+    def get_metadata(self) -> dict:
+        return self.price_provider.get_metadata(self.ticker)
+
+    @traced("AssetTicker.get_previous_price")
+    def get_previous_price(self, date: datetime) -> float:
+        if self.price_store is not None:
+            stored_close = self.price_store.get_close(self.ticker, date)
+            if stored_close is not None:
+                increment("price_store.hits")
+                return stored_close
+            increment("price_store.misses")
+
+        close = self.price_provider.get_previous_price(self.ticker, date)
+
+        if self.price_store is not None:
+            self.price_store.save_close(self.ticker, date, close)
+        return close
@@ -0,0 +1,172 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+
+from src.utils.instrumentation import increment, traced
+
+
+class PriceProvider(ABC):
+    """Source of closes and metadata that AssetTicker and DataLoader read from."""
+
+    @abstractmethod
+    def get_current_price(self, ticker: str) -> float:
+        ...
+
+    @abstractmethod
+    def get_current_prices(self, tickers: list) -> dict:
+        ...
+
+    @abstractmethod
+    def get_previous_price(self, ticker: str, close_date: date) -> float:
+        ...
+
+    @abstractmethod
+    def get_history(self, tickers: list, start: date, end: date) -> pd.DataFrame:
+        """Daily closes between start and end (exclusive), one column per ticker."""
+        ...
+
+    @abstractmethod
+    def get_metadata(self, ticker: str) -> dict:
+        ...
+
+
+class YFinancePriceProvider(PriceProvider):
+    @traced("yfinance.get_current_price")
+    def get_current_price(self, ticker: str) -> float:
+        increment("network_calls")
+        return round(yf.Ticker(ticker).history(period="1d")["Close"].iloc[-1], 2)
+
+    def get_current_prices(self, tickers: list) -> dict:
+        if not tickers:
+            return {}
+
+        closes = self.get_history(tickers, period="5d")
+        last_closes = closes.ffill().iloc[-1]
+        return {
+            ticker: round(float(last_closes[ticker]), 2)
+            for ticker in tickers
+            if ticker in last_closes.index and pd.notna(last_closes[ticker])
+        }
+
+    @traced("yfinance.get_previous_price")
+    def get_previous_price(self, ticker: str, close_date: date) -> float:
+        increment("network_calls")
+        return round(
+            yf.Ticker(ticker)
+            .history(start=close_date, end=close_date + timedelta(days=1))["Close"]
+            .iloc[-1],
+            2,
+        )
+
+    @traced("yfinance.get_history")
+    def get_history(
+        self, tickers: list, start: date = None, end: date = None, period: str = None
+    ) -> pd.DataFrame:
+        increment("network_calls")
+        if period is not None:
+            history = yf.download(tickers, period=period, progress=False)
+        else:
+            history = yf.download(tickers, start=start, end=end, progress=False)
+
+        closes = history["Close"]
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=tickers[0])
+        return closes
+
+    @traced("yfinance.get_metadata")
+    def get_metadata(self, ticker: str) -> dict:
+        increment("network_calls")
+        info = yf.Ticker(ticker).info
+        return {
+            "long_name": info.get("longName", "Unknown Asset"),
+            "currency": info.get("currency"),
+            "exchange": info.get("exchange"),
+        }
+
+
+class LocalPriceProvider(PriceProvider):
+    """Network-free provider backed by a ticker x date table of closes."""
+
+    def __init__(self, closes: pd.DataFrame, metadata: dict = None) -> None:
+        self.closes = closes.sort_index()
+        self.metadata = metadata or {}
+        self._series = {}
+
+    @classmethod
+    def from_records(cls, records: pd.DataFrame, metadata: dict = None):
+        """Build from long-format rows with ticker, date and close columns."""
+        closes = records.pivot_table(
+            index="date", columns="ticker", values="close", aggfunc="last"
+        )
+        closes.index = pd.to_datetime(closes.index)
+        closes.columns.name = None
+        return cls(closes, metadata)
+
+    @classmethod
+    def from_csv(cls, path: str, metadata: dict = None):
+        return cls.from_records(pd.read_csv(path), metadata)
+
+    @classmethod
+    def from_parquet(cls, path: str, metadata: dict = None):
+        return cls.from_records(pd.read_parquet(path), metadata)
+
+    @classmethod
+    def from_sqlite(cls, database: str, metadata: dict = None):
+        """Read closes from a priceHistory(ticker, date, close) table."""
+        with sqlite3.connect(database) as conn:
+            records = pd.read_sql_query(
+                "SELECT ticker, date, close FROM priceHistory", conn
+            )
+        conn.close()
+        return cls.from_records(records, metadata)
+
+    def __series(self, ticker: str) -> tuple:
+        """Sorted close dates (as datetime64[D]) and values of one ticker, built once."""
+        if ticker not in self._series:
+            if ticker not in self.closes.columns:
+                raise KeyError(f"No local prices for {ticker}")
+            closes = self.closes[ticker].dropna()
+            self._series[ticker] = (
+                closes.index.to_numpy(dtype="datetime64[D]"),
+                closes.to_numpy(dtype=float),
+            )
+        return self._series[ticker]
+
+    def get_current_price(self, ticker: str) -> float:
+        _, closes = self.__series(ticker)
+        return round(float(closes[-1]), 2)
+
+    def get_current_prices(self, tickers: list) -> dict:
+        last_closes = self.closes.ffill().iloc[-1] if len(self.closes) else pd.Series()
+        return {
+            ticker: round(float(last_closes[ticker]), 2)
+            for ticker in tickers
+            if ticker in last_closes.index and pd.notna(last_closes[ticker])
+        }
+
+    def get_previous_price(self, ticker: str, close_date: date) -> float:
+        """Close on `close_date`, or the last close before it for market holidays."""
+        dates, closes = self.__series(ticker)
+        position = np.searchsorted(dates, np.datetime64(close_date, "D"), side="right")
+        if position == 0:
+            raise KeyError(f"No local price for {ticker} on or before {close_date}")
+        return round(float(closes[position - 1]), 2)
+
+    def get_history(self, tickers: list, start: date, end: date) -> pd.DataFrame:
+        window = self.closes.loc[
+            (self.closes.index >= pd.Timestamp(start))
+            & (self.closes.index < pd.Timestamp(end))
+        ]
+        return window.reindex(columns=tickers)
+
+    def get_metadata(self, ticker: str) -> dict:
+        return {
+            "long_name": "Unknown Asset",
+            "currency": None,
+            "exchange": None,
+            **self.metadata.get(ticker, {}),
+        }
@@ -1,14 +1,48 @@
 import logging
 
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 
 from src.assets.scripts.asset_ticker import AssetTicker
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
+
+DEEMED_DISPOSAL_PERIOD = timedelta(days=365.25 * 8)
+
+
+@dataclass(frozen=True)
+class DeemedDisposalValuation:
+    deemed_disposal_date: date
+    triggered: bool
+    deemed_disposal_price: float
+    deemed_disposal_gain_loss: float
+    realized_gain_loss: float
+    formatted_deemed_disposal_date: str
 
 
 class SharesDetail:
+    """One lot. Slotted, with its dates parsed once and the derived dates kept alongside."""
+
+    __slots__ = (
+        "_purchased_date",
+        "_deemed_disposal_date",
+        "_last_close_date",
+        "_sale_date",
+        "_formatted_sale_date",
+        "initial_amount",
+        "initial_unit_price",
+        "transaction_fee",
+        "current_price",
+        "deemed_disposal_realized_gain_loss",
+        "deemed_disposal_price",
+        "sold_share_status",
+        "remaining_shares",
+        "quantity_sold",
+        "sale_price",
+        "today",
+        "_valuation",
+    )
+
     def __init__(
         self,
         purchased_date: str,
@@ -21,8 +55,10 @@ class SharesDetail:
         sale_date: datetime,
         quantity_sold: int,
         sale_price: float,
+        today: date = None,
     ) -> None:
-        self.purchased_date = datetime.strptime(purchased_date, "%Y-%m-%d").date()
+        self._valuation = None
+        self.purchased_date = date.fromisoformat(purchased_date)
         self.initial_amount = initial_amount
         self.initial_unit_price = initial_unit_price
         self.transaction_fee = transaction_fee
@@ -34,6 +70,32 @@ class SharesDetail:
         self.sale_date = sale_date
         self.quantity_sold = quantity_sold
         self.sale_price = sale_price
+        self.today = today
+
+    @property
+    def purchased_date(self) -> date:
+        return self._purchased_date
+
+    @purchased_date.setter
+    def purchased_date(self, purchased_date: date) -> None:
+        self._purchased_date = purchased_date
+        self._deemed_disposal_date = purchased_date + DEEMED_DISPOSAL_PERIOD
+        self._last_close_date = self._deemed_disposal_date - timedelta(
+            days=(self._deemed_disposal_date.weekday() - 4) % 7
+        )
+        self._valuation = None
+
+    @property
+    def sale_date(self) -> str:
+        return self._sale_date
+
+    @sale_date.setter
+    def sale_date(self, sale_date: str) -> None:
+        self._sale_date = sale_date
+        self._formatted_sale_date = (
+            date.fromisoformat(sale_date).strftime("%d/%m/%Y") if sale_date else None
+        )
+        self._valuation = None
 
     def get_total_cost(self) -> float:
         return self.initial_amount * self.initial_unit_price
@@ -45,11 +107,12 @@ class SharesDetail:
             2,
         )
 
-    def get_deemed_disposal_date(self) -> datetime:
-        return self.purchased_date + timedelta(days=365.25 * 8)
+    def get_deemed_disposal_date(self) -> date:
+        return self._deemed_disposal_date
 
     def is_deemed_disposal_triggered(self) -> bool:
-        return datetime.now().date() >= self.get_deemed_disposal_date()
+        today = self.today or datetime.now().date()
+        return today >= self.get_deemed_disposal_date()
 
     @property
     def deemed_disposal_triggered_status(self) -> str:
@@ -57,13 +120,7 @@ class SharesDetail:
 
     def get_deemed_disposal_price(self, asset_ticker: AssetTicker) -> float:
         if self.is_deemed_disposal_triggered():
-            deemed_disposal_date = self.get_deemed_disposal_date()
-
-            last_asset_close_date = deemed_disposal_date - timedelta(
-                days=(deemed_disposal_date.weekday() - 4) % 7
-            )
-
-            return asset_ticker.get_previous_price(last_asset_close_date)
+            return asset_ticker.get_previous_price(self._last_close_date)
 
     def get_deemed_disposal_gain_loss(self, asset_ticker: AssetTicker) -> float:
         if self.is_deemed_disposal_triggered():
@@ -95,12 +152,49 @@ class SharesDetail:
             else None
         )
 
-    def get_sale_date(self) -> datetime:
-        return (
-            datetime.strptime(self.sale_date, "%Y-%m-%d").strftime("%d/%m/%Y")
-            if self.sale_date
-            else None
-        )
+    def get_valuation(self, asset_ticker: AssetTicker) -> DeemedDisposalValuation:
+        """Value the lot once, so the deemed disposal close is fetched a single time."""
+        if self._valuation is None:
+            deemed_disposal_date = self.get_deemed_disposal_date()
+            triggered = self.is_deemed_disposal_triggered()
+            deemed_disposal_price = self.get_deemed_disposal_price(asset_ticker)
+
+            deemed_disposal_gain_loss = (
+                round(
+                    self.initial_amount
+                    * (deemed_disposal_price - self.initial_unit_price),
+                    2,
+                )
+                if triggered
+                else 0
+            )
+
+            sale_gain_loss = self.quantity_sold * (
+                self.sale_price - self.initial_unit_price
+            )
+            if self.sold_share_status != "No":
+                realized_gain_loss = round(
+                    sale_gain_loss - deemed_disposal_gain_loss, 2
+                )
+            else:
+                realized_gain_loss = round(sale_gain_loss, 2)
+
+            self._valuation = DeemedDisposalValuation(
+                deemed_disposal_date=deemed_disposal_date,
+                triggered=triggered,
+                deemed_disposal_price=deemed_disposal_price,
+                deemed_disposal_gain_loss=deemed_disposal_gain_loss,
+                realized_gain_loss=realized_gain_loss,
+                formatted_deemed_disposal_date=(
+                    deemed_disposal_date.strftime("%d/%m/%Y")
+                    if deemed_disposal_price
+                    else None
+                ),
+            )
+        return self._valuation
+
+    def get_sale_date(self) -> str:
+        return self._formatted_sale_date
 
     def get_quantity_sold(self) -> int:
         return self.quantity_sold if self.quantity_sold else 0
@@ -0,0 +1,168 @@
+"""Time the database, valuation and page data paths on synthetic portfolios.
+
+Usage: python -m src.benchmarks.run_benchmarks --sizes 1000:50 10000:200 --output results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+from datetime import datetime
+
+from src.benchmarks.synthetic_portfolio import (
+    generate_portfolio,
+    generate_price_provider,
+    generate_tickers,
+)
+from src.utils.connection_manager import ConnectionManager
+from src.utils.data_loader import DataLoader
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.metadata_cache import AssetMetadataCache
+from src.utils.result_cache import RESULT_CACHE, load_portfolio_cached
+
+DEFAULT_SCENARIOS = ["1000:50", "10000:200", "100000:500"]
+DEFAULT_OUTPUT = os.path.join("exports", "benchmark_results.json")
+
+
+def time_call(function, repeats: int) -> dict:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return {
+        "repeats": repeats,
+        "min_s": min(durations),
+        "median_s": statistics.median(durations),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(lots: int, ticker_count: int, repeats: int, scalar_limit: int, workdir: str) -> list:
+    database = os.path.join(workdir, f"portfolio_{lots}_{ticker_count}.db")
+    tickers = generate_tickers(ticker_count)
+    database_manipulator = DatabaseManipulator(database, connection_manager=ConnectionManager())
+
+    start = time.perf_counter()
+    generate_portfolio(database_manipulator, lots, tickers)
+    price_provider = generate_price_provider(tickers)
+    setup_s = time.perf_counter() - start
+
+    investments = database_manipulator.fetch_investments()
+    metadata_cache = AssetMetadataCache(os.path.join(workdir, "asset_metadata.json"))
+    results = []
+
+    def record(
+        benchmark: str,
+        function,
+        benchmark_repeats: int = repeats,
+        per_call: int = 1,
+        measure_memory: bool = False,
+    ):
+        timing = time_call(function, benchmark_repeats)
+        if measure_memory:
+            timing["memory_bytes"] = int(function().memory_usage(deep=True).sum())
+        if per_call > 1:
+            timing = {
+                **timing,
+                "calls": per_call,
+                "min_s": timing["min_s"] / per_call,
+                "median_s": timing["median_s"] / per_call,
+            }
+        results.append({"benchmark": benchmark, "lots": lots, "tickers": ticker_count, **timing})
+        print(f"{benchmark:<40} lots={lots:<7} tickers={ticker_count:<4} median={timing['median_s']:.4f}s")
+
+    results.append({"benchmark": "setup", "lots": lots, "tickers": ticker_count, "repeats": 1, "min_s": setup_s, "median_s": setup_s})
+
+    record("DatabaseManipulator.fetch_investments", database_manipulator.fetch_investments)
+
+    if lots <= scalar_limit:
+        record(
+            "DataLoader.load_data",
+            lambda: DataLoader(investments, price_provider=price_provider).load_data(),
+            benchmark_repeats=1,
+            measure_memory=True,
+        )
+    record(
+        "DataLoader.load_data_vectorized",
+        lambda: DataLoader(investments, price_provider=price_provider).load_data_vectorized(),
+        measure_memory=True,
+    )
+
+    def assemble_home_page_cold():
+        RESULT_CACHE.invalidate()
+        load_portfolio_cached(database_manipulator, price_provider, metadata_cache)
+
+    record("home page data (cold cache)", assemble_home_page_cold)
+    record(
+        "home page data (warm cache)",
+        lambda: load_portfolio_cached(database_manipulator, price_provider, metadata_cache),
+    )
+
+    rng = random.Random(0)
+    update_calls = 100
+
+    def update_investments():
+        for _ in range(update_calls):
+            database_manipulator.update_investments(
+                rng.randint(1, lots), "Partially Sold", 0, datetime.now().strftime("%Y-%m-%d"), 0, 1.0
+            )
+
+    record("DatabaseManipulator.update_investments", update_investments, benchmark_repeats=1, per_call=update_calls)
+
+    RESULT_CACHE.invalidate()
+    database_manipulator.close()
+    return results
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SCENARIOS, help="lots:tickers pairs")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scalar-limit", type=int, default=10000, help="largest portfolio valued with the per-row path")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            lots, ticker_count = (int(value) for value in size.split(":"))
+            report["results"].extend(
+                run_scenario(lots, ticker_count, args.repeats, args.scalar_limit, workdir)
+            )
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
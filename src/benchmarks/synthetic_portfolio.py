@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date, timedelta
+
+from src.assets.scripts.price_provider import LocalPriceProvider
+from src.utils.database_operations import DatabaseManipulator
+
+FIRST_PURCHASE_DATE = date(2008, 1, 2)
+
+
+def generate_tickers(count: int) -> list:
+    return [f"ETF{index:04d}.AS" for index in range(count)]
+
+
+def generate_prices(
+    tickers: list, start: date = FIRST_PURCHASE_DATE, end: date = None, seed: int = 0
+) -> pd.DataFrame:
+    """Business-day random-walk closes, one column per ticker."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, end or date.today())
+    log_returns = rng.normal(0.0003, 0.01, size=(len(dates), len(tickers)))
+    start_prices = rng.uniform(20, 400, size=len(tickers))
+    closes = np.round(start_prices * np.exp(np.cumsum(log_returns, axis=0)), 2)
+    return pd.DataFrame(closes, index=dates, columns=tickers)
+
+
+def generate_portfolio(
+    database_manipulator: DatabaseManipulator,
+    lots: int,
+    tickers: list,
+    sold_fraction: float = 0.3,
+    max_sales_per_lot: int = 3,
+    seed: int = 0,
+) -> None:
+    """Fill the database with `lots` purchases and a varied sales history."""
+    rng = np.random.default_rng(seed)
+    today = date.today()
+    span_days = (today - FIRST_PURCHASE_DATE).days
+
+    purchase_offsets = rng.integers(0, span_days, size=lots)
+    amounts = rng.integers(1, 500, size=lots)
+    unit_prices = np.round(rng.uniform(20, 400, size=lots), 2)
+    fees = np.round(rng.uniform(0, 5, size=lots), 2)
+    lot_tickers = rng.choice(tickers, size=lots)
+
+    database_manipulator.insert_investments_many(
+        (
+            (
+                str(lot_tickers[index]),
+                (FIRST_PURCHASE_DATE + timedelta(days=int(purchase_offsets[index]))).isoformat(),
+                int(amounts[index]),
+                float(unit_prices[index]),
+                float(fees[index]),
+                "No",
+            )
+            for index in range(lots)
+        ),
+        chunk_size=5000,
+    )
+
+    with database_manipulator.connect() as conn:
+        first_id = conn.execute("SELECT MIN(id) FROM assetInvestments;").fetchone()[0]
+        sales = []
+        statuses = []
+        for index in np.flatnonzero(rng.random(lots) < sold_fraction):
+            investment_id = first_id + int(index)
+            remaining = int(amounts[index])
+            sale_day = FIRST_PURCHASE_DATE + timedelta(days=int(purchase_offsets[index]))
+            for _ in range(int(rng.integers(1, max_sales_per_lot + 1))):
+                if remaining == 0:
+                    break
+                sale_day += timedelta(days=int(rng.integers(1, 400)))
+                if sale_day > today:
+                    break
+                quantity = int(rng.integers(1, remaining + 1))
+                remaining -= quantity
+                sales.append(
+                    (
+                        investment_id,
+                        remaining,
+                        sale_day.isoformat(),
+                        quantity,
+                        round(float(rng.uniform(20, 400)), 2),
+                    )
+                )
+            if remaining < amounts[index]:
+                statuses.append(("Sold" if remaining == 0 else "Partially Sold", investment_id))
+
+        conn.executemany(
+            """
+            INSERT INTO assetSalesHistory (
+                investmentId, remainingShares, saleDate, quantitySold, salePrice
+            ) VALUES (?, ?, ?, ?, ?)
+        """,
+            sales,
+        )
+        conn.executemany(
+            "UPDATE assetInvestments SET soldShareStatus = ? WHERE id = ?", statuses
+        )
+        conn.commit()
+
+
+def generate_price_provider(tickers: list, seed: int = 0) -> LocalPriceProvider:
+    return LocalPriceProvider(
+        generate_prices(tickers, seed=seed),
+        metadata={ticker: {"long_name": f"Synthetic {ticker}"} for ticker in tickers},
+    )
@@ -0,0 +1,56 @@
+import pandas as pd
+import streamlit as st
+
+from datetime import datetime
+
+from src.utils import instrumentation
+from src.utils.database_operations import DatabaseManipulator
+
+DIAGNOSTICS_PAGE = "Diagnostics"
+
+
+def record_report(report: dict, history_size: int = 20) -> None:
+    """Keep the last `history_size` rerun breakdowns in the session."""
+    if report is None:
+        return
+    history = st.session_state.setdefault("diagnostics", [])
+    history.append(report)
+    del history[:-history_size]
+
+
+def app(database_manipulator: DatabaseManipulator):
+    st.title("Diagnostics")
+
+    enabled = st.checkbox(
+        "Record timings for each rerun", value=instrumentation.is_enabled()
+    )
+    instrumentation.set_enabled(enabled)
+
+    reports = [
+        report
+        for report in st.session_state.get("diagnostics", [])
+        if report["name"] != DIAGNOSTICS_PAGE
+    ]
+    if not reports:
+        st.info("No reruns recorded yet. Enable recording and open another page.")
+        return
+
+    labels = [
+        f"{datetime.fromtimestamp(report['started_at']).strftime('%H:%M:%S')} - {report['name']}"
+        for report in reports
+    ]
+    selected = st.selectbox("Rerun", range(len(reports)), index=len(reports) - 1, format_func=labels.__getitem__)
+    report = reports[selected]
+
+    st.subheader("Spans")
+    st.dataframe(pd.DataFrame(report["spans"], columns=["span", "calls", "total_ms", "max_ms"]), hide_index=True)
+
+    st.subheader("Counters")
+    st.dataframe(
+        pd.DataFrame(list(report["counters"].items()), columns=["counter", "value"]),
+        hide_index=True,
+    )
+
+    if st.button("Clear history"):
+        st.session_state["diagnostics"] = []
+        st.rerun()
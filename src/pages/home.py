@@ -1,10 +1,23 @@
 import logging
 import streamlit as st
-from src.utils.data_loader import DataLoader
 from src.utils.database_operations import DatabaseManipulator
+from src.utils.holdings_view import (
+    PAGE_SIZES,
+    SOLD_SHARE_STATUSES,
+    filter_holdings,
+    get_page_count,
+    paginate,
+)
+from src.utils.log_config import fields
+from src.utils.quote_refresher import format_quote_age, get_quote_refresher
+from src.utils.result_cache import (
+    get_upcoming_deemed_disposals_cached,
+    load_portfolio_cached,
+    load_portfolio_history_cached,
+)
+from src.utils.valuation_engine import format_valued_dates
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
 
 st.set_page_config(page_title="Home", page_icon=":house:", layout="centered")
 
@@ -20,29 +33,86 @@ def app(database_manipulator: DatabaseManipulator):
     """)
 
     # Fetch and display investment data
-    investments = database_manipulator.fetch_investments()
-    
-    if investments:
-        data_loader = DataLoader(investments)
-        df = data_loader.load_data()
-        LOGGER.info(f"df: {df.columns}")
+    df = load_portfolio_cached(database_manipulator)
+
+    if df is not None:
+        LOGGER.debug("df: %s", df.columns)
 
         st.title("Investment Portfolio")
         st.write("### Investment Details")
-        st.dataframe(df, hide_index=True)
-
-        # Create a placeholder for displaying icons and investment data
-        for idx, row in df.iterrows():
-            # Display each row in the dataframe with an "info" button
-            with st.container():
-                col1, col2 = st.columns([4, 1])
-                with col1:
-                    st.write(f"**{row['Asset Name']}** ({row['Ticker']})")
-                    st.write(f"Purchase Date: {row['Purchase Date']} | Remaining Shares: {row['Remaining Shares']}")
-                with col2:
-                    # Create an icon button for detailed view
-                    if st.button("ℹ️", key=f"info_{idx}"):
-                        show_details(row)
+        show_quote_age(database_manipulator)
+        show_holdings(df)
+
+        show_upcoming_deemed_disposals(database_manipulator, df)
+
+        show_portfolio_history(database_manipulator)
+
+def show_quote_age(database_manipulator: DatabaseManipulator):
+    quote_refresher = get_quote_refresher(database_manipulator.database)
+    if quote_refresher is None:
+        return
+
+    last_published = quote_refresher.quote_store.get_last_published()
+    if last_published is None:
+        st.caption("Waiting for the first quote refresh.")
+    else:
+        st.caption(f"Quotes updated {format_quote_age(last_published)}.")
+
+def show_holdings(df):
+    """One page of lots at a time; only the selected lot gets a detail panel."""
+    search_col, status_col = st.columns([2, 2])
+    with search_col:
+        search = st.text_input("Search ticker or asset name")
+    with status_col:
+        statuses = st.multiselect("Sold Share Status", SOLD_SHARE_STATUSES)
+    holdings = filter_holdings(df, search, statuses)
+
+    page_size_col, page_col = st.columns([1, 1])
+    with page_size_col:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    page_count = get_page_count(len(holdings), page_size)
+    with page_col:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+    visible = format_valued_dates(paginate(holdings, page, page_size))
+
+    st.caption(f"{len(holdings)} of {len(df)} lots | page {page} of {page_count}")
+    event = st.dataframe(
+        visible,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="holdings",
+    )
+
+    selected_rows = event.selection.rows
+    if selected_rows and selected_rows[0] < len(visible):
+        show_details(visible.iloc[selected_rows[0]])
+
+def show_portfolio_history(database_manipulator: DatabaseManipulator):
+    st.write("### Portfolio History")
+    if not st.toggle("Show daily value since the first purchase"):
+        return
+
+    history = load_portfolio_history_cached(database_manipulator)
+    if history.empty:
+        st.write("No price history available yet.")
+        return
+
+    st.line_chart(history[["Value", "Cost Basis"]])
+    st.line_chart(history[["Unrealized Gain/Loss"]])
+
+def show_upcoming_deemed_disposals(database_manipulator: DatabaseManipulator, df):
+    st.write("### Upcoming Deemed Disposals")
+    days = st.number_input("Within the next N days", min_value=1, max_value=3650, value=90)
+    current_prices = df.groupby("Ticker", observed=True)["Current Price"].first().to_dict()
+    upcoming = get_upcoming_deemed_disposals_cached(database_manipulator, current_prices, days=days)
+
+    if upcoming.empty:
+        st.write(f"No deemed disposals in the next {days} days.")
+        return
+
+    st.metric("Estimated Exit Tax", f"{upcoming['Estimated Exit Tax'].sum():,.2f}")
+    st.dataframe(upcoming, hide_index=True)
 
 def show_details(row):
     """Display a detailed view of the selected investment in an expandable form."""
@@ -77,4 +147,10 @@ def show_details(row):
             if st.form_submit_button("Update Investment"):
                 # Logic to update database (if needed)
                 st.success("Investment updated successfully!")
-                LOGGER.info(f"Updated investment {row['ID']} with new quantity {updated_quantity_sold} and sale price {updated_sale_price}")
+                LOGGER.info(
+                    "Updated investment %s",
+                    row["ID"],
+                    extra=fields(
+                        quantity_sold=updated_quantity_sold, sale_price=updated_sale_price
+                    ),
+                )
@@ -4,9 +4,9 @@ import yfinance as yf
 import streamlit as st
 
 from src.utils.database_operations import DatabaseManipulator
+from src.utils.investment_importer import InvestmentImporter, InvestmentImportError
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
 
 def app(database_manipulator: DatabaseManipulator):
 
@@ -33,3 +33,19 @@ def app(database_manipulator: DatabaseManipulator):
             )
 
             st.success(f"Investment added: {ticker.upper()}", icon="✅")
+
+    st.divider()
+    st.write("### Import from CSV")
+    st.write(
+        "Columns: ticker, purchaseDate (YYYY-MM-DD or DD/MM/YYYY), "
+        "initialAmount, initialUnitPrice, transactionFee"
+    )
+    uploaded_file = st.file_uploader("Purchase history", type="csv")
+
+    if uploaded_file is not None and st.button("Import"):
+        try:
+            inserted = InvestmentImporter(database_manipulator).import_csv(uploaded_file)
+        except InvestmentImportError as error:
+            st.error(f"Nothing was imported. {error}")
+        else:
+            st.success(f"Imported {inserted} investments", icon="✅")
@@ -2,90 +2,22 @@ import logging
 import pandas as pd
 import streamlit as st
 
-from src.assets.scripts.asset_ticker import AssetTicker
-from src.assets.scripts.shares_detail import SharesDetail
+from src.utils.data_loader import DataLoader
 from src.utils.database_operations import DatabaseManipulator
+from src.utils.fifo_ledger import InsufficientSharesError
+from src.utils.portfolio_export import FILE_FORMATS, export_portfolio
+from src.utils.result_cache import fetch_investments_cached, load_portfolio_cached
 
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
-
-
-def load_data(investments: list) -> pd.DataFrame:
-    investment_data = []
-    for investment in investments:
-        LOGGER.info(f"values: {investment}")
-
-        (
-            investment_id,
-            ticker,
-            purchased_date_str,
-            initial_amount,
-            initial_unit_price,
-            transaction_fee,
-            sold_share_status,
-            remaining_shares,
-            sale_date,
-            quantity_sold,
-            sale_price,
-        ) = investment
-
-        asset_ticker = AssetTicker(ticker=ticker)
-        current_price = asset_ticker.get_current_price()
-        asset_name = asset_ticker.get_long_name()
-
-        share_detail = SharesDetail(
-            purchased_date=purchased_date_str,
-            initial_amount=initial_amount,
-            initial_unit_price=initial_unit_price,
-            transaction_fee=transaction_fee,
-            current_price=current_price,
-            sold_share_status=sold_share_status,
-            remaining_shares=remaining_shares,
-            sale_date=sale_date,
-            quantity_sold=quantity_sold,
-            sale_price=sale_price,
-        )
 
-        purchased_date = share_detail.purchased_date.strftime("%d/%m/%Y")
-        total_cost = share_detail.get_total_cost()
-        unrealized_gain_loss = share_detail.get_unrealized_gain_loss()
-        deemed_disposal_date = share_detail.get_deemed_disposal_date()
-        deemed_disposal_triggered = share_detail.deemed_disposal_triggered_status
-        deemed_disposal_price = share_detail.get_deemed_disposal_price(asset_ticker)
-        deemed_disposal_realized_gain_loss = share_detail.get_deemed_disposal_gain_loss(
-            asset_ticker
-        )
-        realized_gain_loss = share_detail.get_realized_gain_loss(asset_ticker)
-        deemed_disposal_date = share_detail.formatted_deemed_disposal_date(asset_ticker)
-        sale_date = share_detail.get_sale_date()
-        quantity_sold = share_detail.get_quantity_sold()
-
-        investment_data.append(
-            {
-                "ID": investment_id,
-                "Ticker": ticker,
-                "Asset Name": asset_name,
-                "Purchase Date": purchased_date,
-                "Initial Amount": initial_amount,
-                "Initial Unit Price": initial_unit_price,
-                "Total Cost": total_cost,
-                "Current Price": current_price,
-                "Transaction Fee": transaction_fee,
-                "Unrealized Gain/Loss": unrealized_gain_loss,
-                "Is Older Than Eight Years": deemed_disposal_triggered,
-                "Deemed Disposal Date": deemed_disposal_date,
-                "Deemed Disposal Price": deemed_disposal_price,
-                "Sold Share Status": sold_share_status,
-                "Sale Date": sale_date,
-                "Quantity Sold": quantity_sold,
-                "Sale Price": sale_price,
-                "Remaining Shares": remaining_shares,
-                "Realized Gain/Loss (Deemed Disposal)": deemed_disposal_realized_gain_loss,
-                "Realized Gain/Loss": realized_gain_loss,
-            }
-        )
-    return pd.DataFrame(investment_data)
+
+def load_data(
+    investments: list, price_store=None, metadata_cache=None
+) -> pd.DataFrame:
+    return DataLoader(
+        investments, price_store=price_store, metadata_cache=metadata_cache
+    ).load_data()
 
 
 # DELETE AFTERWARDS
@@ -114,8 +46,63 @@ def load_data(investments: list) -> pd.DataFrame:
 #     return pd.DataFrame(investment_data)
 
 
+def export_snapshot(database_manipulator: DatabaseManipulator):
+    st.write("### Export Portfolio Snapshot")
+    file_format = st.radio("Format", list(FILE_FORMATS), horizontal=True)
+    directory = st.text_input("Export directory", value="exports")
+
+    if st.button("Export"):
+        paths = export_portfolio(
+            database_manipulator,
+            directory,
+            valued=load_portfolio_cached(database_manipulator),
+            file_format=file_format,
+        )
+        st.success("Exported " + ", ".join(paths.values()))
+
+
+def sell_by_ticker(database_manipulator: DatabaseManipulator, investments: list):
+    st.write("### Sell by Ticker (FIFO)")
+    tickers = sorted({investment[1] for investment in investments if investment[7] > 0})
+    if not tickers:
+        st.write("No open positions.")
+        return
+
+    ticker = st.selectbox("Ticker", tickers)
+    open_shares = sum(investment[7] for investment in investments if investment[1] == ticker)
+    st.write(f"**Open shares:** {open_shares}")
+    quantity = st.number_input("Quantity to Sell", min_value=1, max_value=open_shares, value=1)
+    sale_date = st.date_input("Sale Date", key="fifo_sale_date")
+    sale_price = st.number_input("Sale Price", min_value=0.0, key="fifo_sale_price")
+
+    if st.button("Sell Shares"):
+        try:
+            matches = database_manipulator.sell_shares_fifo(
+                ticker, quantity, sale_date.strftime("%Y-%m-%d"), sale_price
+            )
+        except InsufficientSharesError as error:
+            st.error(str(error))
+            return
+
+        st.success(f"Sold {quantity} {ticker} across {len(matches)} lot(s).")
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Investment ID": match.investment_id,
+                        "Quantity Sold": match.quantity,
+                        "Remaining Shares": match.remaining_shares,
+                        "Realized Gain/Loss": match.gain,
+                    }
+                    for match in matches
+                ]
+            ),
+            hide_index=True,
+        )
+
+
 def app(database_manipulator: DatabaseManipulator):
-    investments = database_manipulator.fetch_investments()
+    investments = fetch_investments_cached(database_manipulator)
 
     if st.button("Truncate Investments Table"):
         database_manipulator.truncate_table()
@@ -124,6 +111,10 @@ def app(database_manipulator: DatabaseManipulator):
 
     st.divider()
 
+    if investments:
+        export_snapshot(database_manipulator)
+        st.divider()
+
     # DELETE AFTERWARDS
     # x = database_manipulator.temp_function()
     # y = history_assets(x)
@@ -139,21 +130,24 @@ def app(database_manipulator: DatabaseManipulator):
 
         # st.divider()
 
-        investments = database_manipulator.fetch_investments()
-        investment_ids = [investment[0] for investment in investments]
+        sell_by_ticker(database_manipulator, investments)
+
+        st.divider()
+
+        investments_by_id = {investment[0]: investment for investment in investments}
+        investment_ids = list(investments_by_id)
 
         if investment_ids:
             selected_id = st.selectbox(
                 "Select an Investment ID to Update", investment_ids
             )
-            selected_investment = database_manipulator.fetch_investments(selected_id)
+            selected_investment = [investments_by_id[selected_id]]
 
-            LOGGER.info(f"selected_investment: {selected_investment}")
-            LOGGER.info(f"-" * 40)
+            LOGGER.debug("selected_investment: %s", selected_investment)
 
             if selected_investment:
                 selected_row = selected_investment[0]
-                LOGGER.info(f"selected_row: {selected_row}")
+                LOGGER.debug("selected_row: %s", selected_row)
 
                 investment_id = selected_row[0]
                 ticker = selected_row[1]
@@ -161,7 +155,7 @@ def app(database_manipulator: DatabaseManipulator):
                 sold_share_status = selected_row[6]
                 remaining_shares = selected_row[7]
 
-                LOGGER.info(f"sold_share_status: {sold_share_status}")
+                LOGGER.debug("sold_share_status: %s", sold_share_status)
 
                 st.write(f"**Ticker:** {ticker}")
                 st.write(f"**Total of shares:** {remaining_shares}")
@@ -1,9 +1,14 @@
+import sys
 import pytest
 import pandas as pd
 
+from pathlib import Path
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
 from assets.scripts.asset_ticker import AssetTicker
 
 
@@ -28,6 +33,21 @@ def test_get_long_name(mock_yf_ticker):
     assert asset_name == "Mock Asset"
 
 
+def test_get_metadata(mock_yf_ticker):
+    mock_yf_ticker.info = {
+        "longName": "Mock Asset",
+        "currency": "EUR",
+        "exchange": "AMS",
+    }
+    asset = AssetTicker("Mock")
+
+    assert asset.get_metadata() == {
+        "long_name": "Mock Asset",
+        "currency": "EUR",
+        "exchange": "AMS",
+    }
+
+
 def test_get_previous_price(mock_yf_ticker):
     asset = AssetTicker("Mock")
     test_date = datetime.now() - timedelta(days=5)
@@ -36,6 +56,53 @@ def test_get_previous_price(mock_yf_ticker):
     assert previous_price == 97.0
 
 
+def test_get_previous_price_reads_price_store(mock_yf_ticker):
+    price_store = Mock()
+    price_store.get_close.return_value = 42.0
+    asset = AssetTicker("Mock", price_store=price_store)
+    test_date = datetime(2018, 10, 26).date()
+
+    previous_price = asset.get_previous_price(test_date)
+
+    assert previous_price == 42.0
+    price_store.get_close.assert_called_once_with("Mock", test_date)
+    mock_yf_ticker.history.assert_not_called()
+    price_store.save_close.assert_not_called()
+
+
+def test_get_previous_price_fills_price_store(mock_yf_ticker):
+    price_store = Mock()
+    price_store.get_close.return_value = None
+    mock_yf_ticker.history.return_value = pd.DataFrame({"Close": [97.004]})
+    asset = AssetTicker("Mock", price_store=price_store)
+    test_date = datetime(2018, 10, 26).date()
+
+    previous_price = asset.get_previous_price(test_date)
+
+    assert previous_price == 97.0
+    price_store.save_close.assert_called_once_with("Mock", test_date, 97.0)
+
+
+def test_get_current_prices(monkeypatch):
+    columns = pd.MultiIndex.from_product([["Close"], ["IWDA.AS", "VUAA.L"]])
+    history = pd.DataFrame([[95.123, None], [96.456, 101.0]], columns=columns)
+    mock_download = Mock(return_value=history)
+    monkeypatch.setattr("yfinance.download", mock_download)
+
+    current_prices = AssetTicker.get_current_prices(["IWDA.AS", "VUAA.L"])
+
+    assert current_prices == {"IWDA.AS": 96.46, "VUAA.L": 101.0}
+    mock_download.assert_called_once()
+
+
+def test_get_current_prices_empty(monkeypatch):
+    mock_download = Mock()
+    monkeypatch.setattr("yfinance.download", mock_download)
+
+    assert AssetTicker.get_current_prices([]) == {}
+    mock_download.assert_not_called()
+
+
 def test_get_unkown_name():
     with patch("yfinance.Ticker") as MockTicker:
         mock_ticker = MockTicker.return_value
@@ -57,3 +124,20 @@ def test_invalid_ticker_type():
             str(excinfo.value)
             == f"Expected a string for ticker, got {type(invalid_ticker).__name__}"
         )
+
+
+def test_asset_ticker_uses_price_provider():
+    price_provider = Mock()
+    price_provider.get_current_price.return_value = 12.5
+    price_provider.get_previous_price.return_value = 9.0
+    price_provider.get_metadata.return_value = {"long_name": "Local Asset"}
+    price_provider.get_current_prices.return_value = {"Mock": 12.5}
+
+    asset = AssetTicker("Mock", price_provider=price_provider)
+    test_date = datetime(2018, 10, 26).date()
+
+    assert asset.get_current_price() == 12.5
+    assert asset.get_previous_price(test_date) == 9.0
+    assert asset.get_long_name() == "Local Asset"
+    assert AssetTicker.get_current_prices(["Mock"], price_provider) == {"Mock": 12.5}
+    price_provider.get_previous_price.assert_called_once_with("Mock", test_date)
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import pytest
+import tempfile
+
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.benchmarks import run_benchmarks
+from src.benchmarks.synthetic_portfolio import (
+    generate_portfolio,
+    generate_price_provider,
+    generate_tickers,
+)
+from src.utils.database_operations import DatabaseManipulator
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_generate_portfolio(db_manipulator):
+    tickers = generate_tickers(5)
+
+    generate_portfolio(db_manipulator, 200, tickers, sold_fraction=0.5)
+    investments = db_manipulator.fetch_investments()
+
+    assert len(investments) == 200
+    assert {investment[1] for investment in investments} <= set(tickers)
+    assert min(investment[2] for investment in investments) < "2016-01-01"
+    assert all(investment[7] >= 0 for investment in investments)
+    sold = [investment for investment in investments if investment[6] != "No"]
+    assert sold
+    assert all(investment[7] == 0 for investment in sold if investment[6] == "Sold")
+
+
+def test_generate_price_provider():
+    tickers = generate_tickers(3)
+    price_provider = generate_price_provider(tickers)
+
+    assert set(price_provider.get_current_prices(tickers)) == set(tickers)
+    assert price_provider.get_metadata(tickers[0])["long_name"] == f"Synthetic {tickers[0]}"
+
+
+def test_run_benchmarks_writes_report(tmp_path):
+    output = tmp_path / "exports" / "results.json"
+
+    run_benchmarks.main(["--sizes", "50:3", "--repeats", "1", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    benchmarks = {result["benchmark"] for result in report["results"]}
+    assert {
+        "DatabaseManipulator.fetch_investments",
+        "DatabaseManipulator.update_investments",
+        "DataLoader.load_data",
+        "DataLoader.load_data_vectorized",
+        "home page data (cold cache)",
+    } <= benchmarks
+    assert all(result["median_s"] >= 0 for result in report["results"])
+    assert all(
+        result["memory_bytes"] > 0
+        for result in report["results"]
+        if result["benchmark"].startswith("DataLoader.")
+    )
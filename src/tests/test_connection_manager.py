@@ -0,0 +1,79 @@
+import os
+import sys
+import pytest
+import tempfile
+import threading
+
+from pathlib import Path
+from unittest.mock import Mock
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.connection_manager import ConnectionManager
+
+
+@pytest.fixture
+def connection_manager():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    manager = ConnectionManager(busy_timeout=2.5)
+    try:
+        yield manager, db_path
+    finally:
+        manager.close(db_path)
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_connection_pragmas(connection_manager):
+    manager, db_path = connection_manager
+    conn = manager.get_connection(db_path)
+
+    assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1
+    assert conn.execute("PRAGMA cache_size;").fetchone()[0] == -20000
+    assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 2500
+
+
+def test_connection_reused_within_thread(connection_manager):
+    manager, db_path = connection_manager
+    assert manager.get_connection(db_path) is manager.get_connection(db_path)
+
+
+def test_connection_per_thread(connection_manager):
+    manager, db_path = connection_manager
+    main_connection = manager.get_connection(db_path)
+    thread_connections = []
+
+    def worker():
+        thread_connections.append(manager.get_connection(db_path))
+        manager.close(db_path)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert thread_connections[0] is not main_connection
+
+
+def test_close_opens_new_connection(connection_manager):
+    manager, db_path = connection_manager
+    first_connection = manager.get_connection(db_path)
+
+    manager.close(db_path)
+
+    assert manager.get_connection(db_path) is not first_connection
+
+
+def test_initialize_once(connection_manager):
+    manager, db_path = connection_manager
+    initializer = Mock()
+
+    manager.initialize_once(db_path, "schema", initializer)
+    manager.initialize_once(db_path, "schema", initializer)
+    manager.initialize_once(db_path, "other", initializer)
+
+    assert initializer.call_count == 2
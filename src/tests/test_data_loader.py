@@ -1,4 +1,6 @@
 import sys
+import time
+import threading
 import pytest
 import pandas as pd
 
@@ -10,9 +12,10 @@ src_path = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(src_path))
 
 from src.utils.data_loader import DataLoader
+from src.utils.valuation_engine import VALUED_DTYPES, format_valued_dates
 
 from src.assets.scripts.asset_ticker import AssetTicker
-from src.assets.scripts.shares_detail import SharesDetail
+from src.assets.scripts.shares_detail import DeemedDisposalValuation, SharesDetail
 
 
 @pytest.fixture
@@ -37,7 +40,7 @@ def mock_yf_ticker(monkeypatch):
 def test_data_loader_init(mock_investments_sample):
     data_loader = DataLoader(mock_investments_sample)
     assert data_loader.investments == mock_investments_sample
-    assert data_loader.investment_data == []
+    assert data_loader.current_prices == {}
 
 
 def test_process_investment(mock_data_loader, mock_yf_ticker):
@@ -55,7 +58,7 @@ def test_process_investment(mock_data_loader, mock_yf_ticker):
         "ID": 1,
         "Ticker": "IWDA.AS",
         "Asset Name": "Mock Asset",
-        "Purchase Date": "01/11/2024",
+        "Purchase Date": "2024-11-01",
         "Initial Amount": 1,
         "Initial Unit Price": 10.0,
         "Total Cost": 10.0,
@@ -91,18 +94,18 @@ def expected_df():
             "ID": 1,
             "Ticker": "AAPL",
             "Asset Name": "Apple Inc.",
-            "Purchase Date": "01/01/2023",
+            "Purchase Date": pd.Timestamp("2023-01-01"),
             "Initial Amount": 100,
             "Initial Unit Price": 150.0,
             "Total Cost": 15100.0,
             "Current Price": 160.0,
             "Transaction Fee": 10.0,
             "Unrealized Gain/Loss": 1000.0,
-            "Is Older Than Eight Years": False,
-            "Deemed Disposal Date": "01/01/2031",
+            "Is Older Than Eight Years": "No",
+            "Deemed Disposal Date": pd.Timestamp("2031-01-01"),
             "Deemed Disposal Price": 165.0,
             "Sold Share Status": "Partially Sold",
-            "Sale Date": "01/12/2023",
+            "Sale Date": pd.Timestamp("2023-12-01"),
             "Quantity Sold": 50,
             "Sale Price": 160.0,
             "Remaining Shares": 50,
@@ -113,49 +116,301 @@ def expected_df():
             "ID": 2,
             "Ticker": "MSFT",
             "Asset Name": "Microsoft Corp.",
-            "Purchase Date": "01/05/2022",
+            "Purchase Date": pd.Timestamp("2022-05-01"),
             "Initial Amount": 200,
             "Initial Unit Price": 250.0,
             "Total Cost": 50200.0,
             "Current Price": 260.0,
             "Transaction Fee": 15.0,
             "Unrealized Gain/Loss": 2000.0,
-            "Is Older Than Eight Years": False,
-            "Deemed Disposal Date": "01/05/2030",
+            "Is Older Than Eight Years": "No",
+            "Deemed Disposal Date": pd.Timestamp("2030-05-01"),
             "Deemed Disposal Price": 270.0,
             "Sold Share Status": "Sold",
-            "Sale Date": "01/07/2023",
+            "Sale Date": pd.Timestamp("2023-07-01"),
             "Quantity Sold": 200,
             "Sale Price": 260.0,
             "Remaining Shares": 0,
             "Realized Gain/Loss (Deemed Disposal)": 2000.0,
             "Realized Gain/Loss": 1500.0,
         }
-    ])
+    ]).astype(VALUED_DTYPES)
 
 @patch('src.utils.data_loader.AssetTicker')
 @patch('src.utils.data_loader.SharesDetail')
 def test_load_data(mock_shares_detail, mock_asset_ticker, mock_investments, expected_df):
     mock_asset_ticker_instance = Mock()
     mock_asset_ticker.return_value = mock_asset_ticker_instance
-    mock_asset_ticker_instance.get_current_price.side_effect = [160.0, 260.0]
+    mock_asset_ticker.get_current_prices.return_value = {"AAPL": 160.0, "MSFT": 260.0}
     mock_asset_ticker_instance.get_long_name.side_effect = ["Apple Inc.", "Microsoft Corp."]
 
     mock_shares_detail_instance = Mock()
     mock_shares_detail.return_value = mock_shares_detail_instance
-    mock_shares_detail_instance.purchased_date.strftime.side_effect = ["01/01/2023", "01/05/2022"]
     mock_shares_detail_instance.get_total_cost.side_effect = [15100.0, 50200.0]
     mock_shares_detail_instance.get_unrealized_gain_loss.side_effect = [1000.0, 2000.0]
-    mock_shares_detail_instance.get_deemed_disposal_date.side_effect = ["01/01/2031", "01/05/2030"]
-    mock_shares_detail_instance.deemed_disposal_triggered_status = False
-    mock_shares_detail_instance.get_deemed_disposal_price.side_effect = [165.0, 270.0]
-    mock_shares_detail_instance.get_deemed_disposal_gain_loss.side_effect = [1000.0, 2000.0]
-    mock_shares_detail_instance.get_realized_gain_loss.side_effect = [800.0, 1500.0]
-    mock_shares_detail_instance.formatted_deemed_disposal_date.side_effect = ["01/01/2031", "01/05/2030"]
-    mock_shares_detail_instance.get_sale_date.side_effect = ["01/12/2023", "01/07/2023"]
+    mock_shares_detail_instance.get_valuation.side_effect = [
+        DeemedDisposalValuation(
+            deemed_disposal_date=datetime(2031, 1, 1).date(),
+            triggered=False,
+            deemed_disposal_price=165.0,
+            deemed_disposal_gain_loss=1000.0,
+            realized_gain_loss=800.0,
+            formatted_deemed_disposal_date="01/01/2031",
+        ),
+        DeemedDisposalValuation(
+            deemed_disposal_date=datetime(2030, 5, 1).date(),
+            triggered=False,
+            deemed_disposal_price=270.0,
+            deemed_disposal_gain_loss=2000.0,
+            realized_gain_loss=1500.0,
+            formatted_deemed_disposal_date="01/05/2030",
+        ),
+    ]
     mock_shares_detail_instance.get_quantity_sold.side_effect = [50, 200]
 
     data_loader = DataLoader(mock_investments)
     result_df = data_loader.load_data()
 
     pd.testing.assert_frame_equal(result_df, expected_df)
+    mock_asset_ticker.get_current_prices.assert_called_once_with(
+        ["AAPL", "MSFT"], price_provider=None
+    )
+    mock_asset_ticker_instance.get_current_price.assert_not_called()
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_fetch_quotes_distinct_tickers(mock_asset_ticker):
+    investments = [
+        [1, "IWDA.AS", "2023-01-01", 10, 80.0, 1.0, "No", 10, None, 0, 0],
+        [2, "VUAA.L", "2023-02-01", 5, 90.0, 1.0, "No", 5, None, 0, 0],
+        [3, "IWDA.AS", "2023-03-01", 20, 82.0, 1.0, "No", 20, None, 0, 0],
+    ]
+    mock_asset_ticker.get_current_prices.return_value = {"IWDA.AS": 95.0, "VUAA.L": 100.0}
+
+    data_loader = DataLoader(investments)
+    current_prices = data_loader.fetch_quotes()
+
+    assert current_prices == {"IWDA.AS": 95.0, "VUAA.L": 100.0}
+    mock_asset_ticker.get_current_prices.assert_called_once_with(
+        ["IWDA.AS", "VUAA.L"], price_provider=None
+    )
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_missing_quote_fetched_once_per_ticker(mock_asset_ticker):
+    investments = [
+        [investment_id, "IWDA.AS", "2023-01-01", 10, 80.0, 1.0, "No", 10, None, 0, 0]
+        for investment_id in range(1, 31)
+    ]
+    mock_asset_ticker.get_current_prices.return_value = {}
+    mock_asset_ticker.return_value.get_current_price.return_value = 95.0
+    mock_asset_ticker.return_value.get_long_name.return_value = "iShares Core MSCI World"
+
+    result_df = DataLoader(investments).load_data()
+
+    assert result_df["Current Price"].tolist() == [95.0] * 30
+    mock_asset_ticker.return_value.get_current_price.assert_called_once()
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_failed_quote_is_missing_price(mock_asset_ticker):
+    investments = [
+        [1, "DLST.AS", "2023-01-01", 10, 80.0, 1.0, "No", 10, None, 0, 0],
+        [2, "DLST.AS", "2023-02-01", 5, 90.0, 1.0, "No", 5, None, 0, 0],
+    ]
+    mock_asset_ticker.get_current_prices.return_value = {}
+    mock_asset_ticker.return_value.get_current_price.side_effect = IndexError("delisted")
+    mock_asset_ticker.return_value.get_long_name.return_value = "Delisted ETF"
+
+    result_df = DataLoader(investments).load_data()
+
+    assert result_df["Current Price"].isna().all()
+    assert result_df["Unrealized Gain/Loss"].isna().all()
+    mock_asset_ticker.return_value.get_current_price.assert_called_once()
+
+
+def test_process_investment_reads_name_from_metadata_cache(mock_investments_sample, mock_yf_ticker):
+    metadata_cache = Mock()
+    metadata_cache.get_long_name.return_value = "Cached Asset"
+    data_loader = DataLoader(mock_investments_sample, metadata_cache=metadata_cache)
+
+    result = data_loader.process_investment(mock_investments_sample)
+
+    assert result["Asset Name"] == "Cached Asset"
+    metadata_cache.get_long_name.assert_called_once()
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_vectorized_saves_metadata_once(mock_asset_ticker, max_workers, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker()
+    mock_asset_ticker.get_current_prices.return_value = {}
+    metadata_cache = Mock()
+    metadata_cache.get_long_name.side_effect = lambda asset_ticker: asset_ticker.get_long_name()
+
+    DataLoader(
+        many_ticker_investments, metadata_cache=metadata_cache, max_workers=max_workers
+    ).load_data_vectorized()
+
+    assert metadata_cache.get_long_name.call_count == 5
+    metadata_cache.save.assert_called_once()
+
+
+def make_asset_ticker(delay=0.0):
+    def asset_ticker_factory(ticker, price_store=None, price_provider=None):
+        asset_ticker = Mock()
+        asset_ticker.ticker = ticker
+
+        def get_long_name():
+            time.sleep(delay)
+            return f"{ticker} ETF"
+
+        asset_ticker.get_long_name.side_effect = get_long_name
+        asset_ticker.get_current_price.return_value = 50.0
+        asset_ticker.get_previous_price.side_effect = lambda close_date: float(close_date.day)
+        return asset_ticker
+
+    return asset_ticker_factory
+
+
+@pytest.fixture
+def many_ticker_investments():
+    return [
+        [investment_id, f"ETF{investment_id % 5}.AS", "2010-11-01", 10, 10.0, 1.0, "No", 10, None, 0, 0]
+        for investment_id in range(1, 21)
+    ]
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_vectorized_concurrent_keeps_order(mock_asset_ticker, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker()
+    mock_asset_ticker.get_current_prices.return_value = {
+        f"ETF{index}.AS": 20.0 + index for index in range(4)
+    }
+
+    data_loader = DataLoader(many_ticker_investments, max_workers=4)
+    result_df = data_loader.load_data_vectorized()
+
+    assert result_df["ID"].tolist() == list(range(1, 21))
+    assert result_df["Asset Name"].tolist() == [investment[1] + " ETF" for investment in many_ticker_investments]
+    assert data_loader.current_prices["ETF4.AS"] == 50.0
+    assert data_loader.deemed_disposal_prices == {
+        (f"ETF{index}.AS", datetime(2018, 10, 26).date()): 26.0 for index in range(5)
+    }
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_concurrent_overlaps_requests(mock_asset_ticker, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker(delay=0.2)
+    mock_asset_ticker.get_current_prices.return_value = {
+        f"ETF{index}.AS": 20.0 for index in range(5)
+    }
+
+    start = time.perf_counter()
+    result_df = DataLoader(many_ticker_investments, max_workers=5).load_data()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+    assert result_df["ID"].tolist() == list(range(1, 21))
+    assert result_df["Asset Name"].tolist() == [investment[1] + " ETF" for investment in many_ticker_investments]
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_vectorized_concurrent_timeout(mock_asset_ticker, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker(delay=0.3)
+    mock_asset_ticker.get_current_prices.return_value = {
+        f"ETF{index}.AS": 20.0 for index in range(5)
+    }
+
+    result_df = DataLoader(
+        many_ticker_investments, max_workers=5, timeout=0.05
+    ).load_data_vectorized()
+
+    assert set(result_df["Asset Name"]) == {"Unknown Asset"}
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_vectorized_concurrent_timeout_is_shared(mock_asset_ticker, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker(delay=0.6)
+    mock_asset_ticker.get_current_prices.return_value = {
+        f"ETF{index}.AS": 20.0 for index in range(5)
+    }
+
+    start = time.perf_counter()
+    DataLoader(many_ticker_investments, max_workers=5, timeout=0.1).load_data_vectorized()
+    elapsed = time.perf_counter() - start
+
+    # Five slow names share one 0.1s deadline rather than waiting 0.1s each.
+    assert elapsed < 0.4
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_chunked_matches_vectorized(mock_asset_ticker, many_ticker_investments):
+    mock_asset_ticker.side_effect = make_asset_ticker()
+    mock_asset_ticker.get_current_prices.side_effect = lambda tickers, price_provider=None: {
+        ticker: 20.0 for ticker in tickers
+    }
+    expected = DataLoader(many_ticker_investments).load_data_vectorized()
+
+    mock_asset_ticker.get_current_prices.reset_mock()
+    chunks = (many_ticker_investments[start:start + 6] for start in range(0, 20, 6))
+    result_df = DataLoader([]).load_data_chunked(chunks)
+
+    pd.testing.assert_frame_equal(result_df, expected)
+    quoted = [ticker for call in mock_asset_ticker.get_current_prices.call_args_list for ticker in call.args[0]]
+    assert sorted(quoted) == sorted({investment[1] for investment in many_ticker_investments})
+
+
+def test_load_data_chunked_empty():
+    assert DataLoader([]).load_data_chunked(iter([])).empty
+
+
+@pytest.fixture
+def two_ticker_investments():
+    return [
+        [investment_id, f"ETF{investment_id % 2}.AS", "2010-11-01", 10, 10.0, 1.0, "No", 10, None, 0, 0]
+        for investment_id in range(1, 31)
+    ]
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_concurrent_uses_prefetched_closes(mock_asset_ticker, two_ticker_investments):
+    fetched_on = []
+
+    def asset_ticker_factory(ticker, price_store=None, price_provider=None):
+        asset_ticker = make_asset_ticker()(ticker)
+
+        def get_previous_price(close_date):
+            fetched_on.append(threading.current_thread().name)
+            return 15.0
+
+        asset_ticker.get_previous_price.side_effect = get_previous_price
+        return asset_ticker
+
+    mock_asset_ticker.side_effect = asset_ticker_factory
+    mock_asset_ticker.get_current_prices.return_value = {"ETF0.AS": 20.0, "ETF1.AS": 20.0}
+
+    result_df = DataLoader(two_ticker_investments, max_workers=2).load_data()
+
+    assert result_df["Deemed Disposal Price"].eq(15.0).all()
+    assert len(fetched_on) == 2
+    assert threading.current_thread().name not in fetched_on
+
+
+@patch('src.utils.data_loader.AssetTicker')
+def test_load_data_resolves_each_name_and_close_once(mock_asset_ticker, two_ticker_investments):
+    asset_tickers = []
+
+    def asset_ticker_factory(ticker, price_store=None, price_provider=None):
+        asset_tickers.append(make_asset_ticker()(ticker))
+        return asset_tickers[-1]
+
+    mock_asset_ticker.side_effect = asset_ticker_factory
+    mock_asset_ticker.get_current_prices.return_value = {"ETF0.AS": 20.0, "ETF1.AS": 20.0}
+
+    data_loader = DataLoader(two_ticker_investments)
+    data_loader.load_data()
+
+    assert sum(asset_ticker.get_long_name.call_count for asset_ticker in asset_tickers) == 2
+    assert sum(asset_ticker.get_previous_price.call_count for asset_ticker in asset_tickers) == 2
+    assert data_loader.asset_names == {"ETF0.AS": "ETF0.AS ETF", "ETF1.AS": "ETF1.AS ETF"}
@@ -1,11 +1,17 @@
 import os
+import sys
 import pytest
 import tempfile
 import sqlite3
 
+from pathlib import Path
 from datetime import datetime
 
-from utils.database_operations import DatabaseManipulator
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from utils.database_operations import FETCH_INVESTMENTS_QUERY, DatabaseManipulator
+from src.utils.fifo_ledger import InsufficientSharesError
 
 
 @pytest.fixture
@@ -56,7 +62,10 @@ def db_creation():
         yield db_manipulator, db_path
 
     finally:
-        os.remove(db_path)
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
 
 def test_truncate_table(db_creation):
@@ -146,6 +155,18 @@ def test_fetch_investments_all(db_creation):
     assert investments[1][1] == "GOOGL"
 
 
+def test_iter_investments_in_chunks(db_creation):
+    db_manipulator, _ = db_creation
+    db_manipulator.insert_investments_many(
+        [("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No")] * 3
+    )
+
+    chunks = list(db_manipulator.iter_investments(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [row for chunk in chunks for row in chunk] == db_manipulator.fetch_investments()
+
+
 def test_fetch_investments_by_id(db_creation):
     db_manipulator, _ = db_creation
 
@@ -159,6 +180,41 @@ def test_fetch_investments_by_id(db_creation):
     assert investments[0][1] == "GOOGL"
 
 
+def test_fetch_investments_by_ids(db_creation):
+    db_manipulator, _ = db_creation
+    db_manipulator.insert_investments_many(
+        [("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No")] * 8
+    )
+    by_id = {row[0]: row for row in db_manipulator.fetch_investments()}
+
+    investments = db_manipulator.fetch_investments_by_ids([7, 2, 99, 7, 4, 1, 10], batch_size=4)
+
+    assert investments == [by_id[7], by_id[2], by_id[4], by_id[1], by_id[10]]
+    assert db_manipulator.fetch_investments_by_ids([]) == []
+
+
+def test_fetch_investments_by_ids_reuses_statements(db_creation):
+    db_manipulator, _ = db_creation
+    db_manipulator.insert_investments_many(
+        [("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No")] * 40
+    )
+    statements = []
+    db_manipulator.connect().set_trace_callback(statements.append)
+    try:
+        for count in range(1, 43):
+            db_manipulator.fetch_investments_by_ids(range(1, count + 1), batch_size=16)
+    finally:
+        db_manipulator.connect().set_trace_callback(None)
+
+    # The trace shows bound values, so count the ids each statement was compiled for.
+    lookups = {
+        statement.split("ai.id IN (")[1].count(",") + 1
+        for statement in statements
+        if "ai.id IN" in statement
+    }
+    assert lookups == {1, 2, 4, 8, 16}
+
+
 def test_update_investments(db_creation):
     db_manipulator, db_path = db_creation
 
@@ -198,3 +254,228 @@ def test_update_investments(db_creation):
         assert latest_sales_row[3] == sale_date
         assert latest_sales_row[4] == quantity_sold
         assert latest_sales_row[5] == sale_price
+
+
+def test_sales_history_index_created(db_creation):
+    _, db_path = db_creation
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='assetSalesHistory';"
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+
+    assert "idxSalesHistoryInvestmentSaleDate" in indexes
+
+
+def test_create_indexes_on_existing_database():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    try:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE assetSalesHistory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    investmentId INTEGER NOT NULL,
+                    remainingShares INTEGER NOT NULL DEFAULT 0,
+                    saleDate TEXT,
+                    quantitySold INTEGER NOT NULL,
+                    salePrice REAL NOT NULL
+                );
+            """)
+            conn.execute("""
+                INSERT INTO assetSalesHistory (investmentId, remainingShares, saleDate, quantitySold, salePrice)
+                VALUES (1, 100, NULL, 0, 0)
+            """)
+        conn.close()
+
+        db_manipulator = DatabaseManipulator(database=db_path)
+        plan = db_manipulator.explain_query_plan(
+            "SELECT id FROM assetSalesHistory WHERE investmentId = ?", (1,)
+        )
+        db_manipulator.close()
+
+        assert any("idxSalesHistoryInvestmentSaleDate" in step for step in plan), plan
+    finally:
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_fetch_investments_query_plan_reads_ledger_only(db_creation):
+    db_manipulator, _ = db_creation
+
+    plan = db_manipulator.explain_query_plan(FETCH_INVESTMENTS_QUERY)
+
+    assert not any("sa" in step.split() or "assetSalesHistory" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_update_lookup_query_plan_uses_index(db_creation):
+    db_manipulator, _ = db_creation
+
+    plan = db_manipulator.explain_query_plan(
+        "SELECT id FROM assetSalesHistory WHERE investmentId = ?", (1,)
+    )
+
+    assert len(plan) == 1
+    assert plan[0].startswith("SEARCH"), plan
+    assert "idxSalesHistoryInvestmentSaleDate (investmentId=?)" in plan[0], plan
+
+
+def test_insert_investments_many(db_creation):
+    db_manipulator, db_path = db_creation
+
+    investments = [
+        ("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No"),
+        ("EMIM.AS", "2021-03-04", 25, 28.5, 1.5, "No"),
+        ("CSPX.L", "2022-05-06", 3, 400.0, 2.0, "No"),
+    ]
+
+    inserted = db_manipulator.insert_investments_many(iter(investments), chunk_size=2)
+
+    assert inserted == 3
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id, ticker, initialAmount FROM assetInvestments WHERE id > 2 ORDER BY id"
+        )
+        rows = cursor.fetchall()
+        assert [row[1] for row in rows] == ["VUAA.L", "EMIM.AS", "CSPX.L"]
+
+        cursor.execute(
+            """
+            SELECT investmentId, remainingShares, saleDate, quantitySold, salePrice
+            FROM assetSalesHistory WHERE investmentId > 2 ORDER BY investmentId
+            """
+        )
+        seed_rows = cursor.fetchall()
+        assert seed_rows == [(row[0], row[2], None, 0, 0) for row in rows]
+
+
+def test_insert_investments_many_rolls_back_on_error(db_creation):
+    db_manipulator, db_path = db_creation
+
+    def investments():
+        yield ("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No")
+        raise ValueError("bad row")
+
+    with pytest.raises(ValueError):
+        db_manipulator.insert_investments_many(investments(), chunk_size=1)
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM assetInvestments;")
+        assert cursor.fetchone()[0] == 2
+        cursor.execute("SELECT COUNT(*) FROM assetSalesHistory;")
+        assert cursor.fetchone()[0] == 2
+
+
+def test_get_version_bumped_by_writes(db_creation):
+    db_manipulator, _ = db_creation
+    version = db_manipulator.get_version()
+
+    db_manipulator.insert_investment("TEST", "2024-01-02", 10, 1.0, 0.0, "No")
+    assert db_manipulator.get_version() == version + 1
+
+    db_manipulator.insert_investments_many([("TEST", "2024-01-02", 10, 1.0, 0.0, "No")])
+    assert db_manipulator.get_version() == version + 2
+
+    db_manipulator.update_investments(1, "Partially Sold", 5, "2024-02-01", 5, 2.0)
+    assert db_manipulator.get_version() == version + 3
+
+    db_manipulator.fetch_investments()
+    assert db_manipulator.get_version() == version + 3
+
+    db_manipulator.truncate_table()
+    assert db_manipulator.get_version() == version + 4
+
+
+def test_lot_ledger_backfilled_for_existing_rows(db_creation):
+    db_manipulator, db_path = db_creation
+
+    investments = db_manipulator.fetch_investments()
+
+    assert [investment[0] for investment in investments] == [1, 2]
+    assert investments[0][7:] == (100, "2023-02-01", 0, 0.0)
+
+
+def test_fetch_investments_averages_only_real_sales(db_creation):
+    db_manipulator, _ = db_creation
+
+    db_manipulator.update_investments(1, "Partially Sold", 90, "2024-12-01", 10, 160.0)
+    db_manipulator.update_investments(1, "Partially Sold", 60, "2024-12-15", 30, 180.0)
+
+    investment = db_manipulator.fetch_investments(1)[0]
+
+    assert investment[7] == 60
+    assert investment[8] == "2024-12-15"
+    assert investment[9] == 40
+    assert investment[10] == 175.0
+
+
+def test_sell_shares_fifo_across_lots(db_creation):
+    db_manipulator, db_path = db_creation
+    db_manipulator.insert_investment("IWDA.AS", "2020-01-02", 20, 50.0, 1.0, "No")
+    db_manipulator.insert_investment("IWDA.AS", "2021-01-02", 30, 60.0, 1.0, "No")
+    version = db_manipulator.get_version()
+
+    matches = db_manipulator.sell_shares_fifo("IWDA.AS", 35, "2025-01-10", 70.0)
+
+    assert [(match.investment_id, match.quantity, match.remaining_shares) for match in matches] == [
+        (3, 20, 0),
+        (4, 15, 15),
+    ]
+    assert db_manipulator.get_version() == version + 1
+
+    investments = {investment[0]: investment for investment in db_manipulator.fetch_investments()}
+    assert investments[3][6] == "Sold"
+    assert investments[3][7] == 0
+    assert investments[4][6] == "Partially Sold"
+    assert investments[4][7] == 15
+    assert investments[1][7] == 100
+
+    assert db_manipulator.fetch_realized_gains() == [
+        ("GOOGL", 0, 0.0, 0.0),
+        ("IWDA.AS", 35, 2450.0, 550.0),
+    ]
+
+
+def test_sell_shares_fifo_insufficient_shares_rolls_back(db_creation):
+    db_manipulator, db_path = db_creation
+
+    with pytest.raises(InsufficientSharesError):
+        db_manipulator.sell_shares_fifo("GOOGL", 51, "2025-01-10", 250.0)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM assetSalesHistory").fetchone()[0] == 2
+    assert db_manipulator.fetch_investments(2)[0][7] == 50
+
+
+def test_fetch_deemed_disposals_range(db_creation):
+    db_manipulator, _ = db_creation
+    db_manipulator.insert_investment("VUAA.L", "2017-03-01", 10, 40.0, 1.0, "No")
+    db_manipulator.insert_investment("VUAA.L", "2017-06-01", 10, 45.0, 1.0, "No")
+    db_manipulator.insert_investment("EMIM.AS", "2017-04-01", 5, 25.0, 1.0, "No")
+    db_manipulator.sell_shares_fifo("EMIM.AS", 5, "2024-01-02", 30.0)
+
+    upcoming = db_manipulator.fetch_deemed_disposals("2025-01-01", "2025-04-30")
+
+    assert upcoming == [(3, "VUAA.L", "2017-03-01", "2025-03-01", 10, 40.0)]
+
+
+def test_fetch_deemed_disposals_uses_schedule_index(db_creation):
+    db_manipulator, _ = db_creation
+
+    plan = db_manipulator.explain_query_plan(
+        """
+        SELECT investmentId FROM lotLedger
+        WHERE deemedDisposalDate BETWEEN ? AND ? AND remainingShares > 0
+    """,
+        ("2025-01-01", "2025-04-30"),
+    )
+
+    assert any("idxLotLedgerDeemedDisposal" in step for step in plan), plan
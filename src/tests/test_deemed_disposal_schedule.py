@@ -0,0 +1,63 @@
+import os
+import sys
+import pytest
+import tempfile
+
+from pathlib import Path
+from datetime import date, timedelta
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.assets.scripts.shares_detail import SharesDetail
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.deemed_disposal_schedule import get_upcoming_deemed_disposals
+
+TODAY = date(2025, 1, 1)
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_schedule_matches_shares_detail(db_manipulator):
+    purchase_dates = [date(2016, 2, 29) + timedelta(days=offset) for offset in range(0, 1500, 37)]
+    db_manipulator.insert_investments_many(
+        ("IWDA.AS", purchase_date.isoformat(), 1, 50.0, 1.0, "No")
+        for purchase_date in purchase_dates
+    )
+
+    scheduled = db_manipulator.fetch_deemed_disposals("2000-01-01", "2100-01-01")
+
+    assert [row[3] for row in scheduled] == [
+        SharesDetail(purchase_date.isoformat(), 1, 50.0, 1.0, 60.0, "No", 1, None, 0, 0)
+        .get_deemed_disposal_date()
+        .isoformat()
+        for purchase_date in purchase_dates
+    ]
+
+
+def test_get_upcoming_deemed_disposals_estimates_exit_tax(db_manipulator):
+    db_manipulator.insert_investment("VUAA.L", "2017-01-15", 10, 40.0, 1.0, "No")
+    db_manipulator.insert_investment("EMIM.AS", "2017-02-01", 20, 30.0, 1.0, "No")
+    db_manipulator.insert_investment("VUAA.L", "2018-01-15", 10, 40.0, 1.0, "No")
+
+    upcoming = get_upcoming_deemed_disposals(
+        db_manipulator, {"VUAA.L": 50.0, "EMIM.AS": 25.0}, days=60, today=TODAY
+    )
+
+    assert upcoming["ID"].tolist() == [1, 2]
+    assert upcoming["Deemed Disposal Date"].tolist() == ["2025-01-15", "2025-02-01"]
+    assert upcoming["Estimated Gain/Loss"].tolist() == [100.0, -100.0]
+    assert upcoming["Estimated Exit Tax"].tolist() == [41.0, 0.0]
@@ -0,0 +1,43 @@
+import sys
+import pytest
+
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.fifo_ledger import InsufficientSharesError, LotMatch, allocate_fifo
+
+
+def test_allocate_fifo_consumes_oldest_lots_first():
+    open_lots = [(1, 10, 50.0), (2, 5, 60.0), (3, 20, 70.0)]
+
+    matches = allocate_fifo(open_lots, 12, 80.0)
+
+    assert matches == [
+        LotMatch(investment_id=1, quantity=10, remaining_shares=0, gain=300.0),
+        LotMatch(investment_id=2, quantity=2, remaining_shares=3, gain=40.0),
+    ]
+
+
+def test_allocate_fifo_reads_only_needed_lots():
+    consumed = []
+
+    def open_lots():
+        for lot in [(1, 10, 50.0), (2, 5, 60.0)]:
+            consumed.append(lot[0])
+            yield lot
+
+    allocate_fifo(open_lots(), 10, 55.0)
+
+    assert consumed == [1]
+
+
+def test_allocate_fifo_insufficient_shares():
+    with pytest.raises(InsufficientSharesError):
+        allocate_fifo([(1, 10, 50.0)], 11, 80.0)
+
+
+def test_allocate_fifo_rejects_non_positive_quantity():
+    with pytest.raises(ValueError):
+        allocate_fifo([(1, 10, 50.0)], 0, 80.0)
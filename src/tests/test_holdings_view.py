@@ -0,0 +1,52 @@
+import sys
+import pandas as pd
+
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.holdings_view import filter_holdings, get_page_count, paginate
+from src.utils.valuation_engine import VALUED_DTYPES
+
+
+def holdings(count: int = 25) -> pd.DataFrame:
+    """Lots with the dtypes of the valued frame the home page filters."""
+    frame = pd.DataFrame(
+        {
+            "ID": range(1, count + 1),
+            "Ticker": ["IWDA.AS", "VUAA.L", "EMIM.AS", "CSPX.L", "EUNL.DE"] * (count // 5),
+            "Asset Name": ["iShares Core MSCI World", "Vanguard S&P 500", None, "iShares Core S&P 500", "iShares Core MSCI World"]
+            * (count // 5),
+            "Sold Share Status": ["No", "Partially Sold", "Sold", "No", "No"] * (count // 5),
+        }
+    )
+    return frame.astype({column: VALUED_DTYPES[column] for column in frame.columns})
+
+
+def test_filter_holdings_by_ticker_or_name():
+    df = holdings()
+
+    assert set(filter_holdings(df, "vuaa")["Ticker"]) == {"VUAA.L"}
+    assert set(filter_holdings(df, " msci world ")["Ticker"]) == {"IWDA.AS", "EUNL.DE"}
+    assert len(filter_holdings(df, "")) == len(df)
+
+
+def test_filter_holdings_by_status():
+    df = holdings()
+
+    filtered = filter_holdings(df, "s&p", ["No"])
+
+    assert set(filtered["Ticker"]) == {"CSPX.L"}
+    assert set(filter_holdings(df, statuses=["Sold", "Partially Sold"])["Ticker"]) == {"VUAA.L", "EMIM.AS"}
+
+
+def test_paginate():
+    df = holdings()
+
+    assert get_page_count(len(df), 10) == 3
+    assert get_page_count(0, 10) == 1
+    assert paginate(df, 1, 10)["ID"].tolist() == list(range(1, 11))
+    assert paginate(df, 3, 10)["ID"].tolist() == list(range(21, 26))
+    assert paginate(df, 9, 10)["ID"].tolist() == list(range(21, 26))
+    assert paginate(df.iloc[:0], 1, 10).empty
@@ -0,0 +1,85 @@
+import sys
+import pytest
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils import instrumentation
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.set_enabled(True)
+    try:
+        yield
+    finally:
+        instrumentation.set_enabled(False)
+
+
+@instrumentation.traced("square")
+def square(value):
+    instrumentation.increment("squares")
+    return value * value
+
+
+def test_disabled_records_nothing():
+    instrumentation.set_enabled(False)
+
+    recording = instrumentation.start_recording("Home")
+
+    assert recording is None
+    assert square(3) == 9
+    assert instrumentation.stop_recording(recording) is None
+
+
+def test_spans_and_counters_are_aggregated(enabled):
+    recording = instrumentation.start_recording("Home")
+    with instrumentation.span("page.Home"):
+        square(2)
+        square(3)
+    instrumentation.increment("rows_processed", 5)
+    report = instrumentation.stop_recording(recording)
+
+    spans = {entry["span"]: entry for entry in report["spans"]}
+    assert report["name"] == "Home"
+    assert spans["square"]["calls"] == 2
+    assert spans["page.Home"]["calls"] == 1
+    assert spans["page.Home"]["total_ms"] >= spans["square"]["total_ms"]
+    assert report["counters"] == {"rows_processed": 5, "squares": 2}
+
+
+def test_recording_ends_with_stop(enabled):
+    recording = instrumentation.start_recording("Home")
+    instrumentation.stop_recording(recording)
+
+    square(2)
+
+    assert instrumentation._RECORDER.get() is None
+
+
+def test_exceptions_still_close_the_span(enabled):
+    @instrumentation.traced("failing")
+    def failing():
+        raise ValueError("boom")
+
+    recording = instrumentation.start_recording()
+    with pytest.raises(ValueError):
+        failing()
+    report = instrumentation.stop_recording(recording)
+
+    assert report["spans"][0]["span"] == "failing"
+
+
+def test_submit_records_worker_spans(enabled):
+    recording = instrumentation.start_recording()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [instrumentation.submit(executor, square, value) for value in range(10)]
+        results = [future.result() for future in futures]
+    report = instrumentation.stop_recording(recording)
+
+    assert results == [value * value for value in range(10)]
+    assert report["spans"][0]["calls"] == 10
+    assert report["counters"]["squares"] == 10
@@ -0,0 +1,106 @@
+import io
+import os
+import sys
+import pytest
+import tempfile
+import sqlite3
+
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.investment_importer import InvestmentImporter, InvestmentImportError
+
+
+@pytest.fixture
+def importer():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield InvestmentImporter(db_manipulator, chunk_size=2), db_path
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def count_rows(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+
+
+def test_import_csv(importer):
+    csv_importer, db_path = importer
+    csv_file = io.StringIO(
+        "ticker,purchaseDate,initialAmount,initialUnitPrice,transactionFee\n"
+        "iwda.as,2016-01-04,10,40.5,1.0\n"
+        "VUAA.L,04/03/2021,5,60.0,\n"
+        "EMIM.AS,2022-07-01,20,27.1,0.5\n"
+    )
+
+    inserted = csv_importer.import_csv(csv_file)
+
+    assert inserted == 3
+    investments = csv_importer.database_manipulator.fetch_investments()
+    assert [investment[1] for investment in investments] == ["IWDA.AS", "VUAA.L", "EMIM.AS"]
+    assert investments[1][2] == "2021-03-04"
+    assert investments[1][5] == 0.0
+    assert count_rows(db_path, "assetSalesHistory") == 3
+
+
+def test_import_csv_binary_with_aliases(importer):
+    csv_importer, _ = importer
+    csv_file = io.BytesIO(
+        "\ufeffSymbol,Date,Quantity,Price,Fees\nCSPX.L,2020-02-03,2,300.0,1.0\n".encode("utf-8")
+    )
+
+    assert csv_importer.import_csv(csv_file) == 1
+
+
+def test_import_csv_path(importer, tmp_path):
+    csv_importer, _ = importer
+    csv_path = tmp_path / "purchases.csv"
+    csv_path.write_text(
+        "ticker,purchaseDate,initialAmount,initialUnitPrice,transactionFee\n"
+        "IWDA.AS,2016-01-04,10,40.5,1.0\n"
+    )
+
+    assert csv_importer.import_csv(str(csv_path)) == 1
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        (",2016-01-04,10,40.5,1.0", "Line 3: missing ticker"),
+        ("IWDA.AS,2016-13-04,10,40.5,1.0", "Line 3: invalid purchase date"),
+        ("IWDA.AS,2016-01-04,ten,40.5,1.0", "Line 3: invalid number"),
+        ("IWDA.AS,2016-01-04,0,40.5,1.0", "Line 3: amount must be positive"),
+        ("IWDA.AS,2016-01-04,10,-1,1.0", "Line 3: prices and fees cannot be negative"),
+    ],
+)
+def test_import_csv_invalid_row_rolls_back(importer, line, message):
+    csv_importer, db_path = importer
+    csv_file = io.StringIO(
+        "ticker,purchaseDate,initialAmount,initialUnitPrice,transactionFee\n"
+        "VUAA.L,2021-03-04,5,60.0,1.0\n"
+        f"{line}\n"
+    )
+
+    with pytest.raises(InvestmentImportError, match=message):
+        csv_importer.import_csv(csv_file)
+
+    assert count_rows(db_path, "assetInvestments") == 0
+    assert count_rows(db_path, "assetSalesHistory") == 0
+
+
+def test_import_csv_missing_column(importer):
+    csv_importer, _ = importer
+    csv_file = io.StringIO("ticker,purchaseDate,initialAmount\nIWDA.AS,2016-01-04,10\n")
+
+    with pytest.raises(InvestmentImportError, match="Missing column: initialUnitPrice"):
+        csv_importer.import_csv(csv_file)
@@ -0,0 +1,80 @@
+import sys
+import logging
+import pytest
+import threading
+
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils import log_config
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    root_level = logging.getLogger().level
+    path = tmp_path / "logs" / "user_log.log"
+    try:
+        yield path
+    finally:
+        log_config.stop_logging()
+        logging.getLogger().setLevel(root_level)
+        logging.getLogger("tests.quiet").setLevel(logging.NOTSET)
+
+
+def test_parse_levels():
+    assert log_config.parse_levels("a.b=debug, c = WARNING,,") == {"a.b": "DEBUG", "c": "WARNING"}
+    assert log_config.parse_levels("") == {}
+
+
+def test_structured_formatter_appends_fields():
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "Sold %s", ("IWDA.AS",), None)
+    record.fields = {"quantity": 3, "sale_date": "2024-11-01"}
+
+    message = log_config.StructuredFormatter("%(message)s").format(record)
+
+    assert message == 'Sold IWDA.AS quantity=3 sale_date="2024-11-01"'
+
+
+def test_sampling_filter_keeps_one_in_every():
+    sampling_filter = log_config.SamplingFilter(3)
+    record = logging.LogRecord("tests", logging.INFO, __file__, 1, "row", None, None)
+
+    assert [sampling_filter.filter(record) for _ in range(7)] == [
+        True, False, False, True, False, False, True,
+    ]
+
+
+def test_configure_logging_writes_through_queue(log_file):
+    listener = log_config.configure_logging(
+        str(log_file),
+        levels={"tests.quiet": "WARNING"},
+        sample_every={"tests.rows": 2},
+    )
+    assert log_config.configure_logging(str(log_file)) is listener
+
+    logging.getLogger("tests").info("Updating investment %s", 3, extra=log_config.fields(remaining_shares=0))
+    logging.getLogger("tests.quiet").info("dropped")
+    for row in range(4):
+        logging.getLogger("tests.rows").info("row %d", row)
+    log_config.stop_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert lines[0].endswith("INFO tests Updating investment 3 remaining_shares=0")
+    assert [line.split(" INFO ")[1] for line in lines[1:]] == ["tests.rows row 0", "tests.rows row 2"]
+    assert not logging.getLogger("tests.rows").filters
+
+
+def test_arguments_are_formatted_on_the_listener_thread(log_file):
+    class Argument:
+        def __str__(self):
+            formatted_on.append(threading.current_thread().name)
+            return "argument"
+
+    formatted_on = []
+    log_config.configure_logging(str(log_file))
+    logging.getLogger("tests").info("%s", Argument())
+    log_config.stop_logging()
+
+    assert formatted_on and formatted_on != [threading.current_thread().name]
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import pytest
+
+from pathlib import Path
+from datetime import timedelta
+from unittest.mock import Mock
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.metadata_cache import AssetMetadataCache
+
+
+@pytest.fixture
+def mock_asset_ticker():
+    asset_ticker = Mock()
+    asset_ticker.ticker = "IWDA.AS"
+    asset_ticker.get_metadata.return_value = {
+        "long_name": "iShares Core MSCI World UCITS ETF",
+        "currency": "EUR",
+        "exchange": "AMS",
+    }
+    return asset_ticker
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "asset_metadata.json")
+
+
+def test_get_long_name_fetches_once(cache_path, mock_asset_ticker):
+    cache = AssetMetadataCache(cache_path)
+
+    assert cache.get_long_name(mock_asset_ticker) == "iShares Core MSCI World UCITS ETF"
+    assert cache.get_long_name(mock_asset_ticker) == "iShares Core MSCI World UCITS ETF"
+    mock_asset_ticker.get_metadata.assert_called_once()
+
+
+def test_get_metadata_persisted(cache_path, mock_asset_ticker):
+    cache = AssetMetadataCache(cache_path)
+    cache.get_metadata(mock_asset_ticker)
+    cache.save()
+
+    with open(cache_path, encoding="utf-8") as file:
+        stored = json.load(file)
+    assert stored["IWDA.AS"]["currency"] == "EUR"
+    assert stored["IWDA.AS"]["exchange"] == "AMS"
+
+    reloaded_cache = AssetMetadataCache(cache_path)
+    metadata = reloaded_cache.get_metadata(mock_asset_ticker)
+
+    assert metadata["long_name"] == "iShares Core MSCI World UCITS ETF"
+    mock_asset_ticker.get_metadata.assert_called_once()
+
+
+def test_get_metadata_expired_entry_refreshed(cache_path, mock_asset_ticker):
+    cache = AssetMetadataCache(cache_path, ttl=timedelta(0))
+
+    cache.get_metadata(mock_asset_ticker)
+    cache.get_metadata(mock_asset_ticker)
+
+    assert mock_asset_ticker.get_metadata.call_count == 2
+
+
+def test_unreadable_cache_file_ignored(cache_path, mock_asset_ticker):
+    with open(cache_path, "w", encoding="utf-8") as file:
+        file.write("not json")
+
+    cache = AssetMetadataCache(cache_path)
+
+    assert cache.entries == {}
+    assert cache.get_long_name(mock_asset_ticker) == "iShares Core MSCI World UCITS ETF"
+
+
+def test_save_writes_once_per_batch(cache_path, mock_asset_ticker, monkeypatch):
+    cache = AssetMetadataCache(cache_path)
+    replace = Mock(wraps=os.replace)
+    monkeypatch.setattr("src.utils.metadata_cache.os.replace", replace)
+
+    for ticker in ("IWDA.AS", "VUAA.L", "EQQQ.DE"):
+        mock_asset_ticker.ticker = ticker
+        cache.get_metadata(mock_asset_ticker)
+    assert not os.path.exists(cache_path)
+
+    cache.save()
+    cache.save()
+
+    replace.assert_called_once()
+    assert set(AssetMetadataCache(cache_path).entries) == {"IWDA.AS", "VUAA.L", "EQQQ.DE"}
@@ -0,0 +1,90 @@
+import os
+import sys
+import pytest
+import tempfile
+import pandas as pd
+import pyarrow as pa
+
+from pathlib import Path
+from datetime import date
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.benchmarks.synthetic_portfolio import (
+    generate_portfolio,
+    generate_price_provider,
+    generate_tickers,
+)
+from src.utils.data_loader import DataLoader
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.portfolio_export import (
+    VALUED_SCHEMA,
+    export_portfolio,
+    read_frame,
+    read_table,
+)
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        tickers = generate_tickers(4)
+        generate_portfolio(db_manipulator, 100, tickers)
+        yield db_manipulator
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@pytest.fixture
+def valued(db_manipulator):
+    price_provider = generate_price_provider(generate_tickers(4))
+    return DataLoader(
+        db_manipulator.fetch_investments(), price_provider=price_provider
+    ).load_data_vectorized()
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_export_round_trip(db_manipulator, valued, file_format):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = export_portfolio(db_manipulator, directory, valued, file_format)
+
+        assert set(paths) == {"assetInvestments", "assetSalesHistory", "valuedPortfolio"}
+        assert all(path.endswith(f".{file_format}") for path in paths.values())
+
+        investments = read_table(paths["assetInvestments"])
+        assert investments.num_rows == 100
+        assert investments.schema.field("purchaseDate").type == pa.date32()
+        assert investments.column("purchaseDate")[0].as_py() == date.fromisoformat(
+            db_manipulator.fetch_investments(1)[0][2]
+        )
+
+        sales = read_table(paths["assetSalesHistory"])
+        assert sales.schema.field("saleDate").type == pa.date32()
+        assert sales.column("saleDate").null_count == 100
+
+        portfolio = read_table(paths["valuedPortfolio"])
+        assert portfolio.schema.remove_metadata() == VALUED_SCHEMA
+        frame = read_frame(paths["valuedPortfolio"])
+        assert frame["ID"].tolist() == valued["ID"].tolist()
+        assert frame["Realized Gain/Loss"].tolist() == valued["Realized Gain/Loss"].tolist()
+        assert pd.Timestamp(frame["Purchase Date"].iloc[0]) == valued["Purchase Date"].iloc[0]
+
+
+def test_export_without_valued_portfolio(db_manipulator):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = export_portfolio(db_manipulator, directory)
+
+        assert set(paths) == {"assetInvestments", "assetSalesHistory"}
+
+
+def test_export_rejects_unknown_format(db_manipulator):
+    with pytest.raises(ValueError):
+        export_portfolio(db_manipulator, "unused", file_format="csv")
@@ -0,0 +1,142 @@
+import os
+import sys
+import pytest
+import tempfile
+import pandas as pd
+
+from pathlib import Path
+from datetime import date
+from unittest.mock import patch
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.benchmarks.synthetic_portfolio import (
+    generate_portfolio,
+    generate_price_provider,
+    generate_tickers,
+)
+from src.utils.data_loader import DataLoader
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.portfolio_snapshot import PortfolioSnapshot
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@pytest.fixture
+def price_provider():
+    tickers = generate_tickers(5)
+    return generate_price_provider(tickers)
+
+
+@pytest.fixture
+def snapshot(db_manipulator, price_provider):
+    generate_portfolio(db_manipulator, 200, list(price_provider.closes.columns))
+    return PortfolioSnapshot(db_manipulator, price_provider=price_provider)
+
+
+def count_rows(db_manipulator) -> int:
+    with db_manipulator.connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM portfolioSnapshot").fetchone()[0]
+
+
+def test_load_matches_vectorized_valuation(snapshot, db_manipulator, price_provider):
+    expected = DataLoader(
+        db_manipulator.fetch_investments(), price_provider=price_provider
+    ).load_data_vectorized(today=TODAY)
+
+    loaded = snapshot.load(today=TODAY)
+
+    pd.testing.assert_frame_equal(
+        loaded.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_load_values_only_new_and_changed_lots(snapshot, db_manipulator):
+    snapshot.load(today=TODAY)
+    assert count_rows(db_manipulator) == 200
+
+    db_manipulator.insert_investment(
+        "ETF0000.AS", TODAY.isoformat(), 10, 60.0, 1.0, "No"
+    )
+    db_manipulator.update_investments(3, "Partially Sold", 0, TODAY.isoformat(), 1, 70.0)
+    assert count_rows(db_manipulator) == 199
+
+    with patch.object(
+        snapshot, "refresh_investments", wraps=snapshot.refresh_investments
+    ) as refresh_investments:
+        loaded = snapshot.load(today=TODAY)
+
+    refreshed_ids = sorted(row[0] for row in refresh_investments.call_args.args[0])
+    assert refreshed_ids == [3, 201]
+    assert len(loaded) == 201
+    assert loaded.loc[loaded["ID"] == 3, "Sold Share Status"].item() == "Partially Sold"
+
+
+def test_refresh_prices_reprices_stale_rows(snapshot, db_manipulator, price_provider):
+    loaded = snapshot.load(today=TODAY)
+
+    price_provider.closes.iloc[-1] += 10.0
+    assert snapshot.refresh_prices() == 0
+    assert snapshot.refresh_prices(now=pd.Timestamp.now().timestamp() + 3600) == 200
+
+    repriced = snapshot.read()
+    assert (repriced["Current Price"] - loaded["Current Price"]).round(2).eq(10.0).all()
+    assert (
+        (repriced["Unrealized Gain/Loss"] - loaded["Unrealized Gain/Loss"])
+        .round(2)
+        .eq((10.0 * loaded["Initial Amount"]).round(2))
+        .all()
+    )
+
+
+def test_expire_stale_rows_revalues_newly_due_lots(snapshot, db_manipulator):
+    snapshot.load(today=date(2010, 1, 1))
+    assert snapshot.read()["Is Older Than Eight Years"].eq("No").all()
+
+    expired = snapshot.expire_stale_rows(TODAY)
+    assert expired > 0
+    assert count_rows(db_manipulator) == 200 - expired
+
+    loaded = snapshot.load(today=TODAY)
+    assert loaded["Is Older Than Eight Years"].eq("Yes").sum() == expired
+
+
+def test_truncate_clears_snapshot(snapshot, db_manipulator):
+    snapshot.load(today=TODAY)
+    db_manipulator.truncate_table()
+
+    assert count_rows(db_manipulator) == 0
+
+
+def test_load_in_chunks_reuses_market_data(db_manipulator, price_provider):
+    generate_portfolio(db_manipulator, 200, list(price_provider.closes.columns))
+    expected = PortfolioSnapshot(db_manipulator, price_provider=price_provider).load(today=TODAY)
+    db_manipulator.truncate_table()
+    generate_portfolio(db_manipulator, 200, list(price_provider.closes.columns))
+    snapshot = PortfolioSnapshot(db_manipulator, price_provider=price_provider, chunk_size=7)
+
+    with patch.object(
+        price_provider, "get_current_prices", wraps=price_provider.get_current_prices
+    ) as get_current_prices:
+        loaded = snapshot.load(today=TODAY)
+
+    assert len(loaded) == 200
+    pd.testing.assert_frame_equal(loaded.drop(columns="ID"), expected.drop(columns="ID"))
+    quoted = [ticker for call in get_current_prices.call_args_list for ticker in call.args[0]]
+    assert sorted(quoted) == sorted(set(quoted))
@@ -0,0 +1,109 @@
+import os
+import sys
+import pytest
+import tempfile
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from datetime import date
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.benchmarks.synthetic_portfolio import (
+    generate_portfolio,
+    generate_price_provider,
+    generate_tickers,
+)
+from src.assets.scripts.shares_detail import SharesDetail
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.portfolio_timeseries import PortfolioTimeSeries, fetch_lots_and_sales
+
+AS_OF = date(2024, 6, 28)
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@pytest.fixture
+def price_provider():
+    return generate_price_provider(generate_tickers(3))
+
+
+def value_by_looping(lots, sales, closes, day):
+    """Per-lot, per-day reference valuation."""
+    value = cost_basis = 0.0
+    for lot in lots.itertuples(index=False):
+        if pd.Timestamp(lot[2]) > day:
+            continue
+        lot_sales = sales[(sales["Investment ID"] == lot[0]) & (pd.to_datetime(sales["Sale Date"]) <= day)]
+        held = lot[3] - lot_sales["Quantity Sold"].sum()
+        close = closes.loc[:day, lot[1]].dropna().iloc[-1]
+        value += held * close
+        cost_basis += held * (lot[4] + lot[5] / lot[3])
+    return value, cost_basis
+
+
+def test_compute_matches_per_lot_loop(db_manipulator, price_provider):
+    generate_portfolio(db_manipulator, 60, generate_tickers(3), sold_fraction=0.5)
+    lots, sales = fetch_lots_and_sales(db_manipulator)
+
+    history = PortfolioTimeSeries(price_provider, clock=lambda: AS_OF).compute(lots, sales)
+
+    assert history.index[-1] == pd.Timestamp(AS_OF)
+    assert history.index[0] == pd.Timestamp(lots["Purchase Date"].min()) + pd.offsets.BDay(0)
+    for day in history.index[:: len(history) // 25]:
+        value, cost_basis = value_by_looping(lots, sales, price_provider.closes, day)
+        assert history.loc[day, "Value"] == pytest.approx(value, abs=0.05)
+        assert history.loc[day, "Cost Basis"] == pytest.approx(cost_basis, abs=0.05)
+    np.testing.assert_allclose(
+        history["Unrealized Gain/Loss"], history["Value"] - history["Cost Basis"], atol=0.02
+    )
+
+
+def test_unsold_lot_matches_unrealized_gain_of_shares_detail(db_manipulator, price_provider):
+    ticker = generate_tickers(1)[0]
+    db_manipulator.insert_investment(ticker, "2020-03-02", 12, 80.0, 2.5, "No")
+
+    history = PortfolioTimeSeries(price_provider, clock=lambda: AS_OF).load(db_manipulator)
+
+    close = price_provider.get_previous_price(ticker, AS_OF)
+    shares_detail = SharesDetail("2020-03-02", 12, 80.0, 2.5, close, "No", 12, None, 0, 0, today=AS_OF)
+    assert history["Unrealized Gain/Loss"].iloc[-1] == shares_detail.get_unrealized_gain_loss()
+
+
+def test_clock_sets_the_last_day(db_manipulator, price_provider):
+    generate_portfolio(db_manipulator, 10, generate_tickers(3))
+    lots, sales = fetch_lots_and_sales(db_manipulator)
+
+    earlier = PortfolioTimeSeries(price_provider, clock=lambda: date(2015, 1, 2)).compute(lots, sales)
+
+    assert earlier.index[-1] == pd.Timestamp(2015, 1, 2)
+
+
+def test_compute_empty(db_manipulator, price_provider):
+    history = PortfolioTimeSeries(price_provider, clock=lambda: AS_OF).load(db_manipulator)
+
+    assert history.empty
+    assert list(history.columns) == ["Value", "Cost Basis", "Unrealized Gain/Loss"]
+
+
+def test_shares_detail_uses_injected_today():
+    shares_detail = SharesDetail("2016-01-04", 10, 50.0, 1.0, 60.0, "No", 10, None, 0, 0, today=date(2023, 12, 31))
+
+    assert not shares_detail.is_deemed_disposal_triggered()
+    shares_detail.today = date(2024, 1, 4)
+    assert shares_detail.is_deemed_disposal_triggered()
@@ -0,0 +1,112 @@
+import sys
+import sqlite3
+import pytest
+import pandas as pd
+
+from pathlib import Path
+from datetime import date
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.assets.scripts.price_provider import LocalPriceProvider
+from src.utils.data_loader import DataLoader
+
+
+@pytest.fixture
+def price_records():
+    return pd.DataFrame(
+        {
+            "ticker": ["IWDA.AS", "IWDA.AS", "IWDA.AS", "VUAA.L", "VUAA.L"],
+            "date": ["2018-10-25", "2018-10-26", "2018-10-29", "2018-10-26", "2018-10-29"],
+            "close": [45.111, 45.5, 46.0, 50.0, 51.25],
+        }
+    )
+
+
+@pytest.fixture
+def local_provider(price_records):
+    return LocalPriceProvider.from_records(
+        price_records, metadata={"IWDA.AS": {"long_name": "iShares Core MSCI World"}}
+    )
+
+
+def test_get_current_price(local_provider):
+    assert local_provider.get_current_price("IWDA.AS") == 46.0
+
+
+def test_get_current_prices(local_provider):
+    assert local_provider.get_current_prices(["IWDA.AS", "VUAA.L", "MISSING"]) == {
+        "IWDA.AS": 46.0,
+        "VUAA.L": 51.25,
+    }
+
+
+def test_get_previous_price(local_provider):
+    assert local_provider.get_previous_price("IWDA.AS", date(2018, 10, 25)) == 45.11
+    assert local_provider.get_previous_price("IWDA.AS", date(2018, 10, 27)) == 45.5
+
+
+def test_get_previous_price_missing(local_provider):
+    with pytest.raises(KeyError):
+        local_provider.get_previous_price("VUAA.L", date(2018, 10, 25))
+    with pytest.raises(KeyError):
+        local_provider.get_previous_price("MISSING", date(2018, 10, 25))
+
+
+def test_get_history(local_provider):
+    history = local_provider.get_history(
+        ["VUAA.L", "IWDA.AS"], date(2018, 10, 26), date(2018, 10, 29)
+    )
+
+    assert list(history.columns) == ["VUAA.L", "IWDA.AS"]
+    assert history.index.tolist() == [pd.Timestamp("2018-10-26")]
+    assert history.iloc[0].tolist() == [50.0, 45.5]
+
+
+def test_get_metadata(local_provider):
+    assert local_provider.get_metadata("IWDA.AS")["long_name"] == "iShares Core MSCI World"
+    assert local_provider.get_metadata("VUAA.L")["long_name"] == "Unknown Asset"
+
+
+def test_from_csv_and_parquet(price_records, tmp_path):
+    csv_path = tmp_path / "prices.csv"
+    parquet_path = tmp_path / "prices.parquet"
+    price_records.to_csv(csv_path, index=False)
+    price_records.to_parquet(parquet_path)
+
+    for provider in (
+        LocalPriceProvider.from_csv(csv_path),
+        LocalPriceProvider.from_parquet(parquet_path),
+    ):
+        assert provider.get_current_prices(["IWDA.AS", "VUAA.L"]) == {
+            "IWDA.AS": 46.0,
+            "VUAA.L": 51.25,
+        }
+
+
+def test_from_sqlite(price_records, tmp_path):
+    db_path = str(tmp_path / "prices.db")
+    with sqlite3.connect(db_path) as conn:
+        price_records.to_sql("priceHistory", conn, index=False)
+    conn.close()
+
+    provider = LocalPriceProvider.from_sqlite(db_path)
+
+    assert provider.get_previous_price("VUAA.L", date(2018, 10, 26)) == 50.0
+
+
+def test_data_loader_with_local_provider(local_provider):
+    investments = [
+        (1, "IWDA.AS", "2010-10-26", 10, 40.0, 1.0, "No", 10, None, 0, 0),
+        (2, "VUAA.L", "2024-11-01", 4, 49.0, 1.0, "No", 4, None, 0, 0),
+    ]
+
+    valued = DataLoader(investments, price_provider=local_provider).load_data_vectorized(
+        today=date(2024, 11, 4)
+    )
+
+    assert valued["Asset Name"].tolist() == ["iShares Core MSCI World", "Unknown Asset"]
+    assert valued["Current Price"].tolist() == [46.0, 51.25]
+    assert valued["Deemed Disposal Price"].iloc[0] == 45.5
+    assert valued["Realized Gain/Loss (Deemed Disposal)"].iloc[0] == 55.0
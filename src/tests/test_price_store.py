@@ -0,0 +1,63 @@
+import os
+import sys
+import pytest
+import tempfile
+import sqlite3
+
+from pathlib import Path
+from datetime import date
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from utils.price_store import PriceStore
+
+
+@pytest.fixture
+def price_store():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    store = PriceStore(database=db_path)
+    try:
+        yield store, db_path
+    finally:
+        store.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_price_history_table_created(price_store):
+    _, db_path = price_store
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='priceHistory';"
+        )
+        assert cursor.fetchone() is not None, "priceHistory table was not created"
+
+
+def test_get_close_missing(price_store):
+    store, _ = price_store
+    assert store.get_close("IWDA.AS", date(2018, 10, 26)) is None
+
+
+def test_save_and_get_close(price_store):
+    store, _ = price_store
+
+    store.save_close("IWDA.AS", date(2018, 10, 26), 45.12)
+
+    assert store.get_close("IWDA.AS", date(2018, 10, 26)) == 45.12
+    assert store.get_close("VUAA.L", date(2018, 10, 26)) is None
+    assert store.get_close("IWDA.AS", date(2018, 10, 25)) is None
+
+
+def test_save_close_overwrites(price_store):
+    store, _ = price_store
+
+    store.save_close("IWDA.AS", date(2018, 10, 26), 45.12)
+    store.save_close("IWDA.AS", date(2018, 10, 26), 45.50)
+
+    assert store.get_close("IWDA.AS", date(2018, 10, 26)) == 45.50
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import pytest
+import tempfile
+
+from pathlib import Path
+from unittest.mock import Mock
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.connection_manager import ConnectionManager
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.metadata_cache import AssetMetadataCache
+from src.utils.quote_refresher import (
+    PublishedQuotePriceProvider,
+    QuoteRefresher,
+    QuoteStore,
+    format_quote_age,
+    get_quote_refresher,
+)
+from src.utils.result_cache import RESULT_CACHE, load_portfolio_cached
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        RESULT_CACHE.invalidate()
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@pytest.fixture
+def price_provider():
+    price_provider = Mock()
+    price_provider.get_current_prices.side_effect = lambda tickers: {
+        ticker: 100.0 + index for index, ticker in enumerate(tickers)
+    }
+    price_provider.get_metadata.return_value = {"long_name": "Test Asset"}
+    return price_provider
+
+
+def test_quote_store_persists_published_quotes(db_manipulator):
+    QuoteStore(db_manipulator.database).publish({"IWDA.AS": 95.5}, fetched_at=1000.0)
+
+    reopened = QuoteStore(db_manipulator.database, connection_manager=ConnectionManager())
+
+    assert reopened.get_quotes() == {"IWDA.AS": (95.5, 1000.0)}
+    assert reopened.get_prices(["IWDA.AS", "VUAA.L"]) == {"IWDA.AS": 95.5}
+    assert reopened.get_last_published() == 1000.0
+
+
+def test_refresh_once_publishes_every_ticker(db_manipulator, price_provider):
+    db_manipulator.insert_investment("VUAA.L", "2020-01-02", 10, 60.0, 1.0, "No")
+    db_manipulator.insert_investment("IWDA.AS", "2021-01-02", 10, 60.0, 1.0, "No")
+    refresher = QuoteRefresher(db_manipulator.database, price_provider=price_provider)
+
+    assert refresher.refresh_once() == {"IWDA.AS": 100.0, "VUAA.L": 101.0}
+    assert refresher.quote_store.get_prices() == {"IWDA.AS": 100.0, "VUAA.L": 101.0}
+
+
+def test_published_provider_never_hits_the_network_for_quotes(db_manipulator, price_provider):
+    quote_store = QuoteStore(db_manipulator.database)
+    quote_store.publish({"IWDA.AS": 95.5})
+    on_missing = Mock()
+    provider = PublishedQuotePriceProvider(quote_store, price_provider, on_missing=on_missing)
+
+    assert provider.get_current_prices(["IWDA.AS"]) == {"IWDA.AS": 95.5}
+    on_missing.assert_not_called()
+    assert provider.get_current_prices(["IWDA.AS", "VUAA.L"]) == {"IWDA.AS": 95.5}
+    on_missing.assert_called_once()
+    with pytest.raises(KeyError):
+        provider.get_current_price("VUAA.L")
+    price_provider.get_current_prices.assert_not_called()
+
+
+def test_background_refresh_and_page_reads(db_manipulator, price_provider):
+    db_manipulator.insert_investment("IWDA.AS", "2020-01-02", 10, 60.0, 1.0, "No")
+    refresher = QuoteRefresher(db_manipulator.database, price_provider=price_provider, interval=60)
+    metadata_cache = AssetMetadataCache(f"{db_manipulator.database}.metadata.json")
+    refresher.start()
+    try:
+        deadline = time.time() + 5
+        while refresher.quote_store.get_last_published() is None and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert refresher.is_running()
+        assert get_quote_refresher(db_manipulator.database) is refresher
+
+        portfolio = load_portfolio_cached(db_manipulator, metadata_cache=metadata_cache)
+        assert portfolio["Current Price"].tolist() == [100.0]
+        assert price_provider.get_current_prices.call_count == 1
+
+        price_provider.get_current_prices.side_effect = lambda tickers: {"IWDA.AS": 110.0}
+        refresher.request_refresh()
+        deadline = time.time() + 5
+        while refresher.quote_store.get_prices() != {"IWDA.AS": 110.0} and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert load_portfolio_cached(db_manipulator, metadata_cache=metadata_cache)["Current Price"].tolist() == [110.0]
+    finally:
+        refresher.stop(timeout=5)
+        os.remove(metadata_cache.path)
+
+    assert not refresher.is_running()
+    assert get_quote_refresher(db_manipulator.database) is None
+
+
+def test_format_quote_age():
+    assert format_quote_age(1000.0, now=1030.0) == "30s ago"
+    assert format_quote_age(1000.0, now=1000.0 + 5 * 60) == "5 min ago"
+    assert format_quote_age(1000.0, now=1000.0 + 2 * 3600 + 60) == "2 h 1 min ago"
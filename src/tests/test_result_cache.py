@@ -0,0 +1,110 @@
+import os
+import sys
+import pytest
+import tempfile
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.result_cache import (
+    RESULT_CACHE,
+    VersionedCache,
+    fetch_investments_cached,
+    get_upcoming_deemed_disposals_cached,
+    load_portfolio_cached,
+)
+
+
+@pytest.fixture
+def db_manipulator():
+    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+        db_path = tmpfile.name
+
+    db_manipulator = DatabaseManipulator(database=db_path)
+    try:
+        yield db_manipulator
+    finally:
+        RESULT_CACHE.invalidate()
+        db_manipulator.close()
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_versioned_cache_reuses_value():
+    cache = VersionedCache()
+    compute = Mock(side_effect=["first", "second"])
+
+    assert cache.get("key", 1, compute) == "first"
+    assert cache.get("key", 1, compute) == "first"
+    assert compute.call_count == 1
+
+    assert cache.get("key", 2, compute) == "second"
+    assert compute.call_count == 2
+
+
+def test_versioned_cache_invalidate():
+    cache = VersionedCache()
+    compute = Mock(side_effect=["first", "second"])
+
+    cache.get("key", 1, compute)
+    cache.invalidate("key")
+
+    assert cache.get("key", 1, compute) == "second"
+
+
+def test_fetch_investments_cached_until_write(db_manipulator):
+    db_manipulator.insert_investment("IWDA.AS", "2020-01-02", 10, 60.0, 1.0, "No")
+
+    with patch.object(
+        db_manipulator, "fetch_investments", wraps=db_manipulator.fetch_investments
+    ) as fetch_investments:
+        assert len(fetch_investments_cached(db_manipulator)) == 1
+        assert len(fetch_investments_cached(db_manipulator)) == 1
+        assert fetch_investments.call_count == 1
+
+        db_manipulator.update_investments(1, "Partially Sold", 5, "2021-01-02", 5, 70.0)
+        assert fetch_investments_cached(db_manipulator)[0][6] == "Partially Sold"
+        assert fetch_investments.call_count == 2
+
+        db_manipulator.truncate_table()
+        assert fetch_investments_cached(db_manipulator) == []
+        assert fetch_investments.call_count == 3
+
+
+@patch("src.utils.result_cache.PortfolioSnapshot")
+def test_load_portfolio_cached_until_write(mock_snapshot, db_manipulator):
+    db_manipulator.insert_investment("IWDA.AS", "2020-01-02", 10, 60.0, 1.0, "No")
+    mock_snapshot.return_value.load.side_effect = ["first", "second"]
+
+    assert load_portfolio_cached(db_manipulator) == "first"
+    assert load_portfolio_cached(db_manipulator) == "first"
+
+    db_manipulator.insert_investment("VUAA.L", "2021-01-02", 5, 70.0, 1.0, "No")
+
+    assert load_portfolio_cached(db_manipulator) == "second"
+    assert mock_snapshot.call_count == 2
+
+
+def test_load_portfolio_cached_empty(db_manipulator):
+    assert load_portfolio_cached(db_manipulator) is None
+
+
+@patch("src.utils.result_cache.get_upcoming_deemed_disposals")
+def test_upcoming_deemed_disposals_cached_until_write(mock_upcoming, db_manipulator):
+    mock_upcoming.side_effect = ["first", "second", "third", "fourth"]
+    prices = {"IWDA.AS": 80.0, "VUAA.L": float("nan")}
+
+    assert get_upcoming_deemed_disposals_cached(db_manipulator, prices, days=90) == "first"
+    assert get_upcoming_deemed_disposals_cached(db_manipulator, dict(prices), days=90) == "first"
+    assert get_upcoming_deemed_disposals_cached(db_manipulator, prices, days=30) == "second"
+    assert get_upcoming_deemed_disposals_cached(db_manipulator, {"IWDA.AS": 81.0}, days=30) == "third"
+
+    db_manipulator.insert_investment("IWDA.AS", "2020-01-02", 10, 60.0, 1.0, "No")
+
+    assert get_upcoming_deemed_disposals_cached(db_manipulator, {"IWDA.AS": 81.0}, days=30) == "fourth"
+    assert mock_upcoming.call_count == 4
@@ -225,3 +225,67 @@ def test_get_quantity_sold(mock_shares_detail):
     result = 100
     get_quantity_sold = mock_shares_detail.get_quantity_sold()
     assert get_quantity_sold == result
+
+
+def test_get_valuation_not_triggered(mock_shares_detail, mock_asset_ticker):
+    valuation = mock_shares_detail.get_valuation(mock_asset_ticker)
+
+    assert valuation.triggered is False
+    assert valuation.deemed_disposal_date == mock_shares_detail.get_deemed_disposal_date()
+    assert valuation.deemed_disposal_price is None
+    assert valuation.deemed_disposal_gain_loss == 0
+    assert valuation.realized_gain_loss == 0
+    assert valuation.formatted_deemed_disposal_date is None
+    mock_asset_ticker.get_previous_price.assert_not_called()
+
+
+def test_get_valuation_triggered_fetches_price_once(mock_shares_detail, mock_asset_ticker):
+    mock_shares_detail.purchased_date = datetime(2010, 11, 1).date()
+    mock_shares_detail.sold_share_status = "Yes"
+    mock_shares_detail.quantity_sold = 10
+    mock_shares_detail.sale_price = 10
+    mock_asset_ticker.get_previous_price.return_value = 100
+
+    valuation = mock_shares_detail.get_valuation(mock_asset_ticker)
+    assert mock_shares_detail.get_valuation(mock_asset_ticker) is valuation
+
+    assert valuation.triggered is True
+    assert valuation.deemed_disposal_price == 100
+    assert valuation.deemed_disposal_gain_loss == 900
+    assert valuation.realized_gain_loss == -900
+    assert valuation.formatted_deemed_disposal_date == "01/11/2018"
+    mock_asset_ticker.get_previous_price.assert_called_once()
+
+
+def test_shares_detail_is_slotted(mock_shares_detail):
+    assert not hasattr(mock_shares_detail, "__dict__")
+    with pytest.raises(AttributeError):
+        mock_shares_detail.unknown_attribute = 1
+
+
+def test_derived_dates_follow_purchased_date(mock_shares_detail):
+    mock_shares_detail.purchased_date = datetime(2010, 11, 1).date()
+
+    assert mock_shares_detail.get_deemed_disposal_date() == datetime(2018, 11, 1).date()
+    assert mock_shares_detail._last_close_date == datetime(2018, 10, 26).date()
+
+
+def test_sale_date_is_formatted_once(mock_shares_detail):
+    mock_shares_detail.sale_date = "2024-11-01"
+
+    assert mock_shares_detail.sale_date == "2024-11-01"
+    with patch("assets.scripts.shares_detail.date") as mock_date:
+        assert mock_shares_detail.get_sale_date() == "01/11/2024"
+        mock_date.fromisoformat.assert_not_called()
+
+
+def test_reassigning_purchased_date_revalues(mock_shares_detail, mock_asset_ticker):
+    mock_asset_ticker.get_previous_price.return_value = 100
+    assert mock_shares_detail.get_valuation(mock_asset_ticker).triggered is False
+
+    mock_shares_detail.purchased_date = datetime(2010, 11, 1).date()
+    valuation = mock_shares_detail.get_valuation(mock_asset_ticker)
+
+    assert valuation.triggered is True
+    assert valuation.deemed_disposal_date == datetime(2018, 11, 1).date()
+    assert valuation.deemed_disposal_price == 100
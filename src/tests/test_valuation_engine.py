@@ -0,0 +1,210 @@
+import sys
+import random
+import pytest
+import pandas as pd
+
+from pathlib import Path
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
+
+src_path = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(src_path))
+
+from src.assets.scripts.shares_detail import SharesDetail
+from src.utils.data_loader import DataLoader
+from src.utils.valuation_engine import (
+    VALUED_COLUMNS,
+    VALUED_DTYPES,
+    ValuationEngine,
+    format_valued_dates,
+)
+
+TODAY = date(2024, 11, 4)
+
+
+def close_price(ticker: str, close_date: date) -> float:
+    return round(50 + len(ticker) + close_date.toordinal() % 97 / 10, 2)
+
+
+@pytest.fixture
+def synthetic_investments():
+    rng = random.Random(7)
+    tickers = ["IWDA.AS", "VUAA.L", "EMIM.AS", "CSPX.L"]
+    investments = []
+    for investment_id in range(1, 201):
+        purchase_date = date(2012, 1, 1) + timedelta(days=rng.randint(0, 4500))
+        initial_amount = rng.randint(1, 300)
+        status = rng.choice(["No", "Partially Sold", "Sold"])
+        if status == "No":
+            sale_date, quantity_sold, sale_price = None, 0, 0
+        else:
+            sale_date = (purchase_date + timedelta(days=rng.randint(1, 900))).strftime("%Y-%m-%d")
+            quantity_sold = initial_amount if status == "Sold" else rng.randint(1, initial_amount)
+            sale_price = round(rng.uniform(40, 120), 2)
+        investments.append(
+            (
+                investment_id,
+                rng.choice(tickers),
+                purchase_date.strftime("%Y-%m-%d"),
+                initial_amount,
+                round(rng.uniform(40, 120), 2),
+                round(rng.uniform(0, 5), 2),
+                status,
+                initial_amount - quantity_sold,
+                sale_date,
+                quantity_sold,
+                sale_price,
+            )
+        )
+    return investments
+
+
+@pytest.fixture
+def current_prices():
+    return {"IWDA.AS": 95.12, "VUAA.L": 101.5, "EMIM.AS": 33.3, "CSPX.L": 510.0}
+
+
+def scalar_valuation(investment, current_prices):
+    """Reference row built with SharesDetail, as DataLoader.process_investment does."""
+    (
+        investment_id,
+        ticker,
+        purchased_date,
+        initial_amount,
+        initial_unit_price,
+        transaction_fee,
+        sold_share_status,
+        remaining_shares,
+        sale_date,
+        quantity_sold,
+        sale_price,
+    ) = investment
+
+    asset_ticker = Mock()
+    asset_ticker.get_previous_price.side_effect = lambda close_date: close_price(
+        ticker, close_date
+    )
+    share_detail = SharesDetail(
+        purchased_date=purchased_date,
+        initial_amount=initial_amount,
+        initial_unit_price=initial_unit_price,
+        transaction_fee=transaction_fee,
+        current_price=current_prices[ticker],
+        sold_share_status=sold_share_status,
+        remaining_shares=remaining_shares,
+        sale_date=sale_date,
+        quantity_sold=quantity_sold,
+        sale_price=sale_price,
+    )
+    valuation = share_detail.get_valuation(asset_ticker)
+    return {
+        "Total Cost": share_detail.get_total_cost(),
+        "Unrealized Gain/Loss": share_detail.get_unrealized_gain_loss(),
+        "Is Older Than Eight Years": "Yes" if valuation.triggered else "No",
+        "Deemed Disposal Date": valuation.formatted_deemed_disposal_date,
+        "Deemed Disposal Price": valuation.deemed_disposal_price,
+        "Realized Gain/Loss (Deemed Disposal)": valuation.deemed_disposal_gain_loss,
+        "Realized Gain/Loss": valuation.realized_gain_loss,
+        "Purchase Date": share_detail.purchased_date.strftime("%d/%m/%Y"),
+        "Sale Date": share_detail.get_sale_date(),
+        "Quantity Sold": share_detail.get_quantity_sold(),
+    }
+
+
+def test_value_matches_shares_detail(synthetic_investments, current_prices):
+    engine = ValuationEngine()
+    deemed_disposal_prices = {
+        (ticker, close_date): close_price(ticker, close_date)
+        for ticker, close_date in engine.get_deemed_disposal_close_dates(synthetic_investments)
+    }
+    valued = format_valued_dates(
+        engine.value(synthetic_investments, current_prices, deemed_disposal_prices)
+    )
+
+    assert list(valued.columns) == VALUED_COLUMNS
+    assert valued["ID"].tolist() == [investment[0] for investment in synthetic_investments]
+
+    for investment, (_, row) in zip(synthetic_investments, valued.iterrows()):
+        expected = scalar_valuation(investment, current_prices)
+        for column, expected_value in expected.items():
+            if expected_value is None:
+                assert pd.isna(row[column]), f"{column} of lot {investment[0]}"
+            elif isinstance(expected_value, str):
+                assert row[column] == expected_value, f"{column} of lot {investment[0]}"
+            else:
+                assert row[column] == pytest.approx(expected_value), f"{column} of lot {investment[0]}"
+
+
+def test_get_deemed_disposal_close_dates():
+    investments = [
+        (1, "IWDA.AS", "2010-11-01", 10, 10.0, 1.0, "No", 10, None, 0, 0),
+        (2, "IWDA.AS", "2010-11-01", 5, 11.0, 1.0, "No", 5, None, 0, 0),
+        (3, "VUAA.L", "2024-11-01", 5, 11.0, 1.0, "No", 5, None, 0, 0),
+    ]
+
+    close_dates = ValuationEngine(today=TODAY).get_deemed_disposal_close_dates(investments)
+
+    assert close_dates == [("IWDA.AS", date(2018, 10, 26))]
+
+
+def test_value_not_triggered():
+    investments = [(1, "VUAA.L", "2024-11-01", 4, 10.0, 1.0, "No", 4, None, 0, 0)]
+
+    valued = ValuationEngine(today=TODAY).value(
+        investments, {"VUAA.L": 12.0}, {}, {"VUAA.L": "Vanguard S&P 500"}
+    )
+    row = valued.iloc[0]
+
+    assert row["Asset Name"] == "Vanguard S&P 500"
+    assert row["Total Cost"] == 40.0
+    assert row["Unrealized Gain/Loss"] == 7.0
+    assert row["Is Older Than Eight Years"] == "No"
+    assert pd.isna(row["Deemed Disposal Date"])
+    assert pd.isna(row["Deemed Disposal Price"])
+    assert row["Realized Gain/Loss (Deemed Disposal)"] == 0
+    assert pd.isna(row["Sale Date"])
+
+
+@patch("src.utils.data_loader.AssetTicker")
+def test_load_data_vectorized(mock_asset_ticker):
+    investments = [
+        (1, "IWDA.AS", "2010-11-01", 10, 10.0, 1.0, "No", 10, None, 0, 0),
+        (2, "IWDA.AS", "2024-11-01", 5, 11.0, 1.0, "No", 5, None, 0, 0),
+    ]
+    mock_asset_ticker.get_current_prices.return_value = {"IWDA.AS": 20.0}
+    mock_asset_ticker.return_value.get_long_name.return_value = "iShares Core MSCI World"
+    mock_asset_ticker.return_value.get_previous_price.return_value = 15.0
+
+    valued = DataLoader(investments).load_data_vectorized(today=TODAY)
+
+    assert valued["Asset Name"].tolist() == ["iShares Core MSCI World"] * 2
+    assert valued["Deemed Disposal Price"].iloc[0] == 15.0
+    assert valued["Realized Gain/Loss (Deemed Disposal)"].tolist() == [50.0, 0.0]
+    mock_asset_ticker.return_value.get_previous_price.assert_called_once_with(
+        date(2018, 10, 26)
+    )
+
+
+@patch("src.utils.data_loader.AssetTicker")
+def test_load_data_matches_load_data_vectorized(mock_asset_ticker, synthetic_investments, current_prices):
+    mock_asset_ticker.get_current_prices.return_value = current_prices
+    mock_asset_ticker.return_value.get_long_name.return_value = "Synthetic ETF"
+    mock_asset_ticker.return_value.get_previous_price.return_value = 42.0
+
+    valued = DataLoader(synthetic_investments).load_data()
+    vectorized = DataLoader(synthetic_investments).load_data_vectorized()
+
+    assert valued.dtypes.drop(
+        ["Purchase Date", "Deemed Disposal Date", "Sale Date"]
+    ).astype(str).to_dict() == VALUED_DTYPES
+    pd.testing.assert_frame_equal(valued, vectorized, check_exact=False)
+
+
+@patch("src.utils.data_loader.AssetTicker")
+def test_load_data_twice_does_not_repeat_rows(mock_asset_ticker, synthetic_investments, current_prices):
+    mock_asset_ticker.get_current_prices.return_value = current_prices
+    mock_asset_ticker.return_value.get_previous_price.return_value = 42.0
+    data_loader = DataLoader(synthetic_investments[:5])
+
+    assert len(data_loader.load_data()) == 5
+    assert len(data_loader.load_data()) == 5
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import logging
+import threading
+
+from contextlib import contextmanager
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionManager:
+    """Process-wide pool of tuned SQLite connections per database.
+
+    Connections are checked out for one `with` block and returned afterwards, so
+    they outlive the threads that use them (Streamlit runs every rerun on a new
+    thread) and are only opened and tuned when every pooled one is in use.
+    """
+
+    def __init__(
+        self,
+        busy_timeout: float = 5.0,
+        cache_size_kib: int = 20000,
+        mmap_size: int = 256 * 1024 * 1024,
+        cached_statements: int = 256,
+        max_idle: int = 8,
+    ) -> None:
+        self.busy_timeout = busy_timeout
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.max_idle = max_idle
+        self._idle = {}
+        self._generations = {}
+        self._initialized = set()
+        self._write_counts = {}
+        self._lock = threading.Lock()
+
+    def __open(self, database: str) -> sqlite3.Connection:
+        LOGGER.info(
+            "Opening connection to %s on %s", database, threading.current_thread().name
+        )
+        conn = sqlite3.connect(
+            database,
+            timeout=self.busy_timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_size_kib};")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        return conn
+
+    @contextmanager
+    def get_connection(self, database: str):
+        """Check out a connection for the block, committing on success and rolling
+        back on error as `with sqlite3.connect(...)` does, then return it to the pool."""
+        key = os.path.abspath(database)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            conn = idle.pop() if idle else None
+            generation = self._generations.get(key, 0)
+        if conn is None:
+            conn = self.__open(database)
+        try:
+            with conn:
+                yield conn
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if self._generations.get(key, 0) == generation and len(idle) < self.max_idle:
+                    idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def initialize_once(self, database: str, name: str, initializer) -> None:
+        """Run `initializer` the first time `name` is set up for `database` in this process."""
+        key = (os.path.abspath(database), name)
+        if key in self._initialized:
+            return
+        with self._lock:
+            if key not in self._initialized:
+                initializer()
+                self._initialized.add(key)
+
+    def bump_write_count(self, database: str) -> int:
+        key = os.path.abspath(database)
+        with self._lock:
+            self._write_counts[key] = self._write_counts.get(key, 0) + 1
+            return self._write_counts[key]
+
+    def get_write_count(self, database: str) -> int:
+        return self._write_counts.get(os.path.abspath(database), 0)
+
+    def close(self, database: str) -> None:
+        """Close the idle connections to `database`; checked out ones close when returned."""
+        key = os.path.abspath(database)
+        with self._lock:
+            idle = self._idle.pop(key, [])
+            self._generations[key] = self._generations.get(key, 0) + 1
+        for conn in idle:
+            conn.close()
+
+
+CONNECTION_MANAGER = ConnectionManager()
@@ -1,26 +1,220 @@
+import time
 import logging
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
 from src.assets.scripts.asset_ticker import AssetTicker
+from src.assets.scripts.price_provider import PriceProvider
 from src.assets.scripts.shares_detail import SharesDetail
+from src.utils import instrumentation
+from src.utils.valuation_engine import VALUED_COLUMNS, ValuationEngine, get_valued_frame
 
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
+# One record per lot; sampled by log_config.SAMPLED_LOGGERS when enabled.
+ROW_LOGGER = logging.getLogger(f"{__name__}.rows")
+
+
+class PrefetchedCloses:
+    """Serves `asset_ticker`'s closes from `closes`, keyed by (ticker, close date),
+    fetching and storing only the ones not resolved yet."""
+
+    def __init__(self, asset_ticker: AssetTicker, closes: dict) -> None:
+        self.asset_ticker = asset_ticker
+        self.closes = closes
+
+    def get_previous_price(self, close_date) -> float:
+        key = (self.asset_ticker.ticker, close_date)
+        if key not in self.closes:
+            self.closes[key] = self.asset_ticker.get_previous_price(close_date)
+        return self.closes[key]
 
 
 class DataLoader:
-    def __init__(self, investments: list) -> None:
+    def __init__(
+        self,
+        investments: list,
+        price_store=None,
+        metadata_cache=None,
+        price_provider: PriceProvider = None,
+        max_workers: int = None,
+        timeout: float = 30.0,
+    ) -> None:
         self.investments = investments
-        self.investment_data = []
-    
-    def process_investment(self, investment: list) -> dict:
-        LOGGER.info(f"values: {investment}")
-        
+        self.price_store = price_store
+        self.metadata_cache = metadata_cache
+        self.price_provider = price_provider
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.current_prices = {}
+        self.asset_names = {}
+        self.deemed_disposal_prices = {}
+
+    def get_asset_ticker(self, ticker: str) -> AssetTicker:
+        return AssetTicker(
+            ticker=ticker,
+            price_store=self.price_store,
+            price_provider=self.price_provider,
+        )
+
+    def get_tickers(self) -> list:
+        return sorted({investment[1] for investment in self.investments})
+
+    def get_missing_close_dates(self, engine: ValuationEngine) -> list:
+        return [
+            key
+            for key in engine.get_deemed_disposal_close_dates(self.investments)
+            if key not in self.deemed_disposal_prices
+        ]
+
+    def fetch_quotes(self) -> dict:
+        """Quotes of the tickers in `investments` that were not resolved yet.
+
+        Tickers missing from the bulk quote are fetched one at a time, once each; a
+        ticker whose quote cannot be fetched is priced as NaN.
+        """
+        tickers = [
+            ticker for ticker in self.get_tickers() if ticker not in self.current_prices
+        ]
+        self.current_prices.update(
+            AssetTicker.get_current_prices(tickers, price_provider=self.price_provider)
+        )
+        for ticker in tickers:
+            if ticker not in self.current_prices:
+                self.current_prices[ticker] = self.fetch_current_price(ticker)
+        return self.current_prices
+
+    def fetch_current_price(self, ticker: str) -> float:
+        try:
+            return self.get_asset_ticker(ticker).get_current_price()
+        except Exception as error:
+            LOGGER.warning("Failed fetching current price of %s: %s", ticker, error)
+            return float("nan")
+
+    @instrumentation.traced("DataLoader.fetch_market_data")
+    def fetch_market_data(self, engine: ValuationEngine) -> None:
+        """Resolve quotes, names and deemed disposal closes one request at a time."""
+        self.fetch_quotes()
+
+        asset_tickers = {
+            ticker: self.get_asset_ticker(ticker)
+            for ticker in self.get_tickers()
+        }
+        self.asset_names.update(
+            {
+                ticker: self.get_asset_name(asset_ticker)
+                for ticker, asset_ticker in asset_tickers.items()
+                if ticker not in self.asset_names
+            }
+        )
+        self.deemed_disposal_prices.update(
+            {
+                (ticker, close_date): asset_tickers[ticker].get_previous_price(close_date)
+                for ticker, close_date in self.get_missing_close_dates(engine)
+            }
+        )
+        self.save_metadata()
+
+    def __result(self, future, deadline: float, description: str, default=None):
+        """`future`'s result, waiting no later than `deadline` (a time.monotonic value)."""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            LOGGER.warning("Timed out after %ss fetching %s", self.timeout, description)
+        except Exception as error:
+            LOGGER.warning("Failed fetching %s: %s", description, error)
+        return default
+
+    @instrumentation.traced("DataLoader.fetch_market_data_concurrently")
+    def fetch_market_data_concurrently(self, engine: ValuationEngine) -> None:
+        """Resolve quotes, names and deemed disposal closes on a bounded worker pool,
+        waiting at most `timeout` seconds in total."""
+        deadline = time.monotonic() + self.timeout
+        tickers = self.get_tickers()
+        asset_tickers = {
+            ticker: self.get_asset_ticker(ticker)
+            for ticker in tickers
+        }
+        close_dates = self.get_missing_close_dates(engine)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            quotes_future = instrumentation.submit(
+                executor,
+                AssetTicker.get_current_prices,
+                [ticker for ticker in tickers if ticker not in self.current_prices],
+                price_provider=self.price_provider,
+            )
+            name_futures = {
+                ticker: instrumentation.submit(executor, self.get_asset_name, asset_ticker)
+                for ticker, asset_ticker in asset_tickers.items()
+                if ticker not in self.asset_names
+            }
+            close_futures = {
+                (ticker, close_date): instrumentation.submit(
+                    executor, asset_tickers[ticker].get_previous_price, close_date
+                )
+                for ticker, close_date in close_dates
+            }
+
+            self.current_prices.update(self.__result(quotes_future, deadline, "current prices", {}))
+            quote_futures = {
+                ticker: instrumentation.submit(executor, asset_ticker.get_current_price)
+                for ticker, asset_ticker in asset_tickers.items()
+                if ticker not in self.current_prices
+            }
+            for ticker, future in quote_futures.items():
+                current_price = self.__result(future, deadline, f"current price of {ticker}")
+                if current_price is not None:
+                    self.current_prices[ticker] = current_price
+
+            self.asset_names.update(
+                {
+                    ticker: self.__result(future, deadline, f"name of {ticker}", "Unknown Asset")
+                    for ticker, future in name_futures.items()
+                }
+            )
+            self.deemed_disposal_prices.update(
+                {
+                    key: close
+                    for key, future in close_futures.items()
+                    if (
+                        close := self.__result(
+                            future, deadline, f"close of {key[0]} on {key[1]}"
+                        )
+                    )
+                    is not None
+                }
+            )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.save_metadata()
+
+    def get_asset_name(self, asset_ticker: AssetTicker) -> str:
+        if self.metadata_cache is not None:
+            return self.metadata_cache.get_long_name(asset_ticker)
+        return asset_ticker.get_long_name()
+
+    def save_metadata(self) -> None:
+        """Persist the names resolved by this batch in one write."""
+        if self.metadata_cache is not None:
+            self.metadata_cache.save()
+
+    @instrumentation.traced("DataLoader.value_investment")
+    def value_investment(self, investment: list) -> tuple:
+        """One valued row in VALUED_COLUMNS order.
+
+        Purchase and sale dates are passed through as stored; get_valued_frame
+        parses each date column once rather than formatting every row.
+        """
+        ROW_LOGGER.debug("values: %s", investment)
+        instrumentation.increment("rows_processed")
+
         (
             investment_id,
             ticker,
-            purchased_date_str,
+            purchased_date,
             initial_amount,
             initial_unit_price,
             transaction_fee,
@@ -31,12 +225,14 @@ class DataLoader:
             sale_price,
         ) = investment
 
-        asset_ticker = AssetTicker(ticker=ticker)
-        current_price = asset_ticker.get_current_price()
-        asset_name = asset_ticker.get_long_name()
+        asset_ticker = self.get_asset_ticker(ticker)
+        current_price = self.current_prices.get(ticker, float("nan"))
+        asset_name = self.asset_names.get(ticker)
+        if asset_name is None:
+            asset_name = self.asset_names[ticker] = self.get_asset_name(asset_ticker)
 
         share_detail = SharesDetail(
-            purchased_date=purchased_date_str,
+            purchased_date=purchased_date,
             initial_amount=initial_amount,
             initial_unit_price=initial_unit_price,
             transaction_fee=transaction_fee,
@@ -48,44 +244,79 @@ class DataLoader:
             sale_price=sale_price,
         )
 
-        purchased_date = share_detail.purchased_date.strftime("%d/%m/%Y")
-        total_cost = share_detail.get_total_cost()
-        unrealized_gain_loss = share_detail.get_unrealized_gain_loss()
-        deemed_disposal_date = share_detail.get_deemed_disposal_date()
-        deemed_disposal_triggered = share_detail.deemed_disposal_triggered_status
-        deemed_disposal_price = share_detail.get_deemed_disposal_price(asset_ticker)
-        deemed_disposal_realized_gain_loss = share_detail.get_deemed_disposal_gain_loss(asset_ticker)
-        realized_gain_loss = share_detail.get_realized_gain_loss(asset_ticker)
-        deemed_disposal_date = share_detail.formatted_deemed_disposal_date(asset_ticker)
-        sale_date = share_detail.get_sale_date()
-        quantity_sold = share_detail.get_quantity_sold()
-
-        return {
-            "ID": investment_id,
-            "Ticker": ticker,
-            "Asset Name": asset_name,
-            "Purchase Date": purchased_date,
-            "Initial Amount": initial_amount,
-            "Initial Unit Price": initial_unit_price,
-            "Total Cost": total_cost,
-            "Current Price": current_price,
-            "Transaction Fee": transaction_fee,
-            "Unrealized Gain/Loss": unrealized_gain_loss,
-            "Is Older Than Eight Years": deemed_disposal_triggered,
-            "Deemed Disposal Date": deemed_disposal_date,
-            "Deemed Disposal Price": deemed_disposal_price,
-            "Sold Share Status": sold_share_status,
-            "Sale Date": sale_date,
-            "Quantity Sold": quantity_sold,
-            "Sale Price": sale_price,
-            "Remaining Shares": remaining_shares,
-            "Realized Gain/Loss (Deemed Disposal)": deemed_disposal_realized_gain_loss,
-            "Realized Gain/Loss": realized_gain_loss,
-        }
+        valuation = share_detail.get_valuation(
+            PrefetchedCloses(asset_ticker, self.deemed_disposal_prices)
+        )
+
+        return (
+            investment_id,
+            ticker,
+            asset_name,
+            purchased_date,
+            initial_amount,
+            initial_unit_price,
+            share_detail.get_total_cost(),
+            current_price,
+            transaction_fee,
+            share_detail.get_unrealized_gain_loss(),
+            "Yes" if valuation.triggered else "No",
+            valuation.deemed_disposal_date
+            if valuation.formatted_deemed_disposal_date
+            else None,
+            valuation.deemed_disposal_price,
+            sold_share_status,
+            sale_date,
+            share_detail.get_quantity_sold(),
+            sale_price,
+            remaining_shares,
+            valuation.deemed_disposal_gain_loss,
+            valuation.realized_gain_loss,
+        )
 
+    def process_investment(self, investment: list) -> dict:
+        return dict(zip(VALUED_COLUMNS, self.value_investment(investment)))
+
+    @instrumentation.traced("DataLoader.load_data")
     def load_data(self) -> pd.DataFrame:
-        for investment in self.investments:
-            processed_data = self.process_investment(investment)
-            self.investment_data.append(processed_data)
-        
-        return pd.DataFrame(self.investment_data)
+        """Value lot by lot, collecting one list per column for get_valued_frame."""
+        if self.max_workers:
+            self.fetch_market_data_concurrently(ValuationEngine())
+        else:
+            self.fetch_quotes()
+
+        rows = [self.value_investment(investment) for investment in self.investments]
+        self.save_metadata()
+        columns = zip(*rows) if rows else ([] for _ in VALUED_COLUMNS)
+        return get_valued_frame(dict(zip(VALUED_COLUMNS, map(list, columns))))
+
+    @instrumentation.traced("DataLoader.load_data_vectorized")
+    def load_data_vectorized(self, today=None) -> pd.DataFrame:
+        """Value every lot in one columnar pass with ValuationEngine."""
+        engine = ValuationEngine(today=today)
+        if self.max_workers:
+            self.fetch_market_data_concurrently(engine)
+        else:
+            self.fetch_market_data(engine)
+
+        return engine.value(
+            self.investments,
+            self.current_prices,
+            self.deemed_disposal_prices,
+            self.asset_names,
+        )
+
+    def load_chunk_vectorized(self, investments: list, today=None) -> pd.DataFrame:
+        """Value another chunk of investments, reusing the quotes, names and closes
+        resolved for earlier chunks."""
+        self.investments = investments
+        return self.load_data_vectorized(today=today)
+
+    @instrumentation.traced("DataLoader.load_data_chunked")
+    def load_data_chunked(self, chunks, today=None) -> pd.DataFrame:
+        """Value an iterable of investment chunks, e.g. DatabaseManipulator.iter_investments(),
+        one at a time and concatenate the valued frames."""
+        valued = [self.load_chunk_vectorized(chunk, today) for chunk in chunks]
+        if not valued:
+            return self.load_chunk_vectorized([], today)
+        # Chunks have their own categories, which concat widens back to object.
+        return get_valued_frame(pd.concat(valued, ignore_index=True))
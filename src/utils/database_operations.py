@@ -1,18 +1,76 @@
 import sqlite3
 import logging
 
+from functools import lru_cache
+from itertools import islice
+
+from src.utils.connection_manager import CONNECTION_MANAGER, ConnectionManager
+from src.utils.fifo_ledger import allocate_fifo
+from src.utils.instrumentation import increment, traced
+from src.utils.log_config import fields
+
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, filename="logs/user_log.log")
+
+FETCH_INVESTMENTS_QUERY = """
+    SELECT
+        ai.id AS investmentId,
+        ai.ticker,
+        ai.purchaseDate,
+        ai.initialAmount,
+        ai.initialUnitPrice,
+        ai.transactionFee,
+        ai.soldShareStatus,
+        ll.remainingShares AS calculatedRemainingShares,
+        ll.lastSaleDate AS last_saleDate,
+        ll.totalQuantitySold,
+        COALESCE(ROUND(ll.totalProceeds / NULLIF(ll.totalQuantitySold, 0), 2), 0.0) AS avgSalePrice
+    FROM assetInvestments ai
+    JOIN lotLedger ll ON ai.id = ll.investmentId
+"""
+
+FETCH_CHUNK_SIZE = 10000
+
+# Lookups bind at most this many ids per statement, well under SQLite's variable limit.
+LOOKUP_BATCH_SIZE = 512
+
+
+@lru_cache(maxsize=None)
+def get_lookup_query(placeholder_count: int) -> str:
+    return FETCH_INVESTMENTS_QUERY + f"WHERE ai.id IN ({', '.join('?' * placeholder_count)})"
+
+
+def get_placeholder_count(id_count: int) -> int:
+    """Round up to a power of two so only a handful of distinct lookup statements
+    exist, each compiled once and then served from the statement cache."""
+    return 1 << (id_count - 1).bit_length()
 
 
 class DatabaseManipulator:
-    def __init__(self, database: str) -> None:
-        LOGGER.info(f"Initializing database: {database}")
+    def __init__(
+        self, database: str, connection_manager: ConnectionManager = CONNECTION_MANAGER
+    ) -> None:
+        LOGGER.info("Initializing database: %s", database)
         self.database = database
-        self.__create_database()
+        self.connection_manager = connection_manager
+        self.connection_manager.initialize_once(
+            self.database, "schema", self.__create_database
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        return self.connection_manager.get_connection(self.database)
+
+    def close(self) -> None:
+        self.connection_manager.close(self.database)
+
+    def get_version(self) -> int:
+        """Number of writes made through this process; changes whenever the data does."""
+        return self.connection_manager.get_write_count(self.database)
+
+    def __bump_version(self) -> None:
+        self.connection_manager.bump_write_count(self.database)
 
     def __create_database(self):
-        with sqlite3.connect(self.database) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS assetInvestments (
@@ -37,16 +95,173 @@ class DatabaseManipulator:
                 );
             """)
             conn.commit()
+        self.create_indexes()
+        self.create_snapshot_table()
+        self.create_lot_ledger()
+
+    def create_indexes(self):
+        """Add the lookup indexes; safe to run against databases created before them."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idxSalesHistoryInvestmentSaleDate
+                ON assetSalesHistory (
+                    investmentId,
+                    saleDate,
+                    remainingShares,
+                    quantitySold,
+                    salePrice
+                );
+            """)
+            conn.commit()
+
+    def create_snapshot_table(self):
+        """Table of valued lots read by PortfolioSnapshot; a missing row means "revalue me"."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS portfolioSnapshot (
+                    investmentId INTEGER PRIMARY KEY,
+                    ticker TEXT NOT NULL,
+                    assetName TEXT,
+                    purchaseDate TEXT NOT NULL,
+                    initialAmount INTEGER NOT NULL,
+                    initialUnitPrice REAL NOT NULL,
+                    totalCost REAL NOT NULL,
+                    currentPrice REAL,
+                    transactionFee REAL NOT NULL,
+                    unrealizedGainLoss REAL,
+                    isOlderThanEightYears TEXT NOT NULL,
+                    deemedDisposalDate TEXT,
+                    deemedDisposalPrice REAL,
+                    soldShareStatus TEXT NOT NULL,
+                    saleDate TEXT,
+                    quantitySold INTEGER,
+                    salePrice REAL,
+                    remainingShares INTEGER,
+                    deemedDisposalGainLoss REAL,
+                    realizedGainLoss REAL,
+                    deemedDisposalDueDate TEXT NOT NULL,
+                    pricedAt REAL NOT NULL
+                );
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idxPortfolioSnapshotTicker
+                ON portfolioSnapshot (ticker, pricedAt);
+            """)
+            # Rows written before dates were stored as ISO strings are revalued.
+            cursor.execute("DELETE FROM portfolioSnapshot WHERE purchaseDate LIKE '__/__/____'")
+            conn.commit()
+
+    def create_lot_ledger(self):
+        """Per-lot running totals of the sales history, kept current by triggers.
+
+        Lots recorded before the ledger existed are backfilled from their sales once.
+        deemedDisposalDate (purchase date + 2922 days, i.e. 8 * 365.25) is derived
+        by SQLite and indexed for open lots, so date windows are an index range scan.
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS lotLedger (
+                    investmentId INTEGER PRIMARY KEY,
+                    ticker TEXT NOT NULL,
+                    purchaseDate TEXT NOT NULL,
+                    remainingShares INTEGER NOT NULL,
+                    totalQuantitySold INTEGER NOT NULL DEFAULT 0,
+                    totalProceeds REAL NOT NULL DEFAULT 0,
+                    realizedGainLoss REAL NOT NULL DEFAULT 0,
+                    lastSaleDate TEXT,
+                    deemedDisposalDate TEXT GENERATED ALWAYS AS (
+                        date(purchaseDate, '+2922 days')
+                    ) VIRTUAL
+                );
+            """)
+            ledger_columns = {
+                row[1] for row in cursor.execute("PRAGMA table_xinfo(lotLedger);")
+            }
+            if "deemedDisposalDate" not in ledger_columns:
+                cursor.execute("""
+                    ALTER TABLE lotLedger ADD COLUMN deemedDisposalDate TEXT
+                    GENERATED ALWAYS AS (date(purchaseDate, '+2922 days')) VIRTUAL;
+                """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idxLotLedgerDeemedDisposal
+                ON lotLedger (deemedDisposalDate, ticker, remainingShares)
+                WHERE remainingShares > 0;
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idxLotLedgerOpenLots
+                ON lotLedger (ticker, purchaseDate, investmentId, remainingShares)
+                WHERE remainingShares > 0;
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trgLotLedgerOpen
+                AFTER INSERT ON assetInvestments
+                BEGIN
+                    INSERT INTO lotLedger (investmentId, ticker, purchaseDate, remainingShares)
+                    VALUES (NEW.id, NEW.ticker, NEW.purchaseDate, NEW.initialAmount);
+                END;
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trgLotLedgerSale
+                AFTER INSERT ON assetSalesHistory
+                BEGIN
+                    UPDATE lotLedger
+                    SET remainingShares = remainingShares - NEW.quantitySold,
+                        totalQuantitySold = totalQuantitySold + NEW.quantitySold,
+                        totalProceeds = totalProceeds + NEW.quantitySold * NEW.salePrice,
+                        realizedGainLoss = realizedGainLoss + NEW.quantitySold * (
+                            NEW.salePrice
+                            - (SELECT initialUnitPrice FROM assetInvestments WHERE id = NEW.investmentId)
+                        ),
+                        lastSaleDate = MAX(COALESCE(lastSaleDate, NEW.saleDate), COALESCE(NEW.saleDate, lastSaleDate))
+                    WHERE investmentId = NEW.investmentId;
+                END;
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trgLotLedgerClose
+                AFTER DELETE ON assetInvestments
+                BEGIN
+                    DELETE FROM lotLedger WHERE investmentId = OLD.id;
+                END;
+            """)
+            cursor.execute("""
+                INSERT INTO lotLedger
+                SELECT
+                    ai.id,
+                    ai.ticker,
+                    ai.purchaseDate,
+                    ai.initialAmount - COALESCE(SUM(sa.quantitySold), 0),
+                    COALESCE(SUM(sa.quantitySold), 0),
+                    COALESCE(SUM(sa.quantitySold * sa.salePrice), 0),
+                    COALESCE(SUM(sa.quantitySold * (sa.salePrice - ai.initialUnitPrice)), 0),
+                    MAX(sa.saleDate)
+                FROM assetInvestments ai
+                LEFT JOIN assetSalesHistory sa ON sa.investmentId = ai.id
+                WHERE NOT EXISTS (SELECT 1 FROM lotLedger ll WHERE ll.investmentId = ai.id)
+                GROUP BY ai.id;
+            """)
+            conn.commit()
+
+    def explain_query_plan(self, query, parameters=()):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", parameters)
+            return [row[3] for row in cursor.fetchall()]
 
+    @traced("DatabaseManipulator.truncate_table")
     def truncate_table(self):
-        tables = ["assetInvestments", "assetSalesHistory"]
-        with sqlite3.connect(self.database) as conn:
+        tables = ["assetInvestments", "assetSalesHistory", "portfolioSnapshot", "lotLedger"]
+        with self.connect() as conn:
             cursor = conn.cursor()
             for table in tables:
                 cursor.execute(f"DELETE FROM {table};")
                 cursor.execute(f"DELETE FROM sqlite_sequence WHERE name='{table}';")
                 conn.commit()
+        self.__bump_version()
 
+    @traced("DatabaseManipulator.insert_investment")
     def insert_investment(
         self,
         ticker,
@@ -56,7 +271,7 @@ class DatabaseManipulator:
         transaction_fee,
         sold_share_status,
     ):
-        with sqlite3.connect(self.database) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -91,51 +306,110 @@ class DatabaseManipulator:
                 (investment_id, initial_amount),
             )
             conn.commit()
+        self.__bump_version()
 
-    def fetch_investments(self, investment_id=None):
-        query = f"""
-            WITH latestSales AS (
-                SELECT
-                    sa.investmentId,
-                    sa.remainingShares,
-                    sa.saleDate,
-                    ROW_NUMBER() OVER (PARTITION BY sa.investmentId ORDER BY sa.saleDate DESC) AS rn
-                FROM assetSalesHistory sa
-            ),
-            aggregatedSales AS (
-                SELECT
-                    investmentId,
-                    SUM(quantitySold) AS totalQuantitySold,
-                    ROUND(AVG(salePrice), 2) AS avgSalePrice
-                FROM assetSalesHistory
-                GROUP BY investmentId
-            )
+    @traced("DatabaseManipulator.insert_investments_many")
+    def insert_investments_many(self, investments, chunk_size=1000):
+        """Insert many lots, plus their sales history seed rows, in one transaction.
 
-            SELECT 
-                ai.id AS investmentId,
-                ai.ticker,
-                ai.purchaseDate,
-                ai.initialAmount,
-                ai.initialUnitPrice,
-                ai.transactionFee,
-                ai.soldShareStatus,
-                (ai.initialAmount - COALESCE(ag.totalQuantitySold, 0)) AS calculatedRemainingShares,
-                ls.saleDate AS last_saleDate,
-                ag.totalQuantitySold,
-                ag.avgSalePrice
-            FROM assetInvestments ai
-            LEFT JOIN latestSales ls ON ai.id = ls.investmentId AND ls.rn = 1
-            LEFT JOIN aggregatedSales ag ON ai.id = ag.investmentId
+        Rows are (ticker, purchase_date, initial_amount, initial_unit_price,
+        transaction_fee, sold_share_status); any iterable works and is read in chunks.
         """
+        investments = iter(investments)
+        inserted = 0
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE;")
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM assetInvestments;")
+            last_investment_id = cursor.fetchone()[0]
+
+            while chunk := list(islice(investments, chunk_size)):
+                cursor.executemany(
+                    """
+                    INSERT INTO assetInvestments (
+                            ticker,
+                            purchaseDate,
+                            initialAmount,
+                            initialUnitPrice,
+                            transactionFee,
+                            soldShareStatus
+                        )
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    chunk,
+                )
+                inserted += len(chunk)
 
+            cursor.execute(
+                """
+                INSERT INTO assetSalesHistory (
+                    investmentId, remainingShares, saleDate, quantitySold, salePrice
+                )
+                SELECT id, initialAmount, NULL, 0, 0
+                FROM assetInvestments
+                WHERE id > ?
+            """,
+                (last_investment_id,),
+            )
+            conn.commit()
+        self.__bump_version()
+
+        LOGGER.info("Inserted %d investments", inserted)
+        return inserted
+
+    @traced("DatabaseManipulator.fetch_investments")
+    def fetch_investments(self, investment_id=None):
         if investment_id is not None:
-            query += f"WHERE ai.id = {investment_id}"
+            return self.fetch_investments_by_ids([investment_id])
 
-        with sqlite3.connect(self.database) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute(query)
-            return cursor.fetchall()
+            cursor.execute(FETCH_INVESTMENTS_QUERY)
+            rows = cursor.fetchall()
+            increment("rows_fetched", len(rows))
+            return rows
 
+    @traced("DatabaseManipulator.fetch_investments_by_ids")
+    def fetch_investments_by_ids(self, investment_ids, batch_size=LOOKUP_BATCH_SIZE):
+        """Rows of the given lots in the order of `investment_ids`, skipping unknown
+        ids, with one parameterized query per `batch_size` ids.
+
+        A short batch is padded by repeating its last id up to the next power of two,
+        which IN ignores, so the statement text depends on the batch size alone.
+        """
+        investment_ids = list(dict.fromkeys(investment_ids))
+        rows = {}
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(investment_ids), batch_size):
+                batch = investment_ids[start : start + batch_size]
+                placeholder_count = get_placeholder_count(len(batch))
+                cursor.execute(
+                    get_lookup_query(placeholder_count),
+                    batch + batch[-1:] * (placeholder_count - len(batch)),
+                )
+                rows.update((row[0], row) for row in cursor.fetchall())
+
+        increment("rows_fetched", len(rows))
+        return [rows[investment_id] for investment_id in investment_ids if investment_id in rows]
+
+    def iter_rows(self, query, parameters=(), chunk_size=FETCH_CHUNK_SIZE):
+        """Yield the rows of `query` in lists of at most `chunk_size`, so only one
+        chunk is held in memory at a time."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, parameters)
+            while rows := cursor.fetchmany(chunk_size):
+                increment("rows_fetched", len(rows))
+                yield rows
+
+    def iter_investments(self, chunk_size=FETCH_CHUNK_SIZE):
+        """Streaming counterpart of fetch_investments()."""
+        return self.iter_rows(FETCH_INVESTMENTS_QUERY, chunk_size=chunk_size)
+
+    @traced("DatabaseManipulator.update_investments")
     def update_investments(
         self,
         investment_id,
@@ -145,15 +419,19 @@ class DatabaseManipulator:
         quantity_sold,
         sale_price,
     ):
-        LOGGER.info(f"Updating tables")
-        LOGGER.info(f"investmentId: {investment_id}")
-        LOGGER.info(f"sold_share_status: {sold_share_status}")
-        LOGGER.info(f"remainingShares: {remaining_shares}")
-        LOGGER.info(f"saleDate: {sale_date}")
-        LOGGER.info(f"quantitySold: {quantity_sold}")
-        LOGGER.info(f"salePrice: {sale_price}")
-
-        with sqlite3.connect(self.database) as conn:
+        LOGGER.info(
+            "Updating investment %s",
+            investment_id,
+            extra=fields(
+                sold_share_status=sold_share_status,
+                remaining_shares=remaining_shares,
+                sale_date=sale_date,
+                quantity_sold=quantity_sold,
+                sale_price=sale_price,
+            ),
+        )
+
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -171,7 +449,7 @@ class DatabaseManipulator:
                 (investment_id,),
             )
             sale_record = cursor.fetchone()
-            LOGGER.info(f"Sale_record: {sale_record}")
+            LOGGER.debug("Sale record of investment %s: %s", investment_id, sale_record)
 
             if sale_record:
                 cursor.execute(
@@ -194,7 +472,110 @@ class DatabaseManipulator:
                     ),
                 )
 
+            cursor.execute(
+                "DELETE FROM portfolioSnapshot WHERE investmentId = ?",
+                (investment_id,),
+            )
+            conn.commit()
+        self.__bump_version()
+
+    @traced("DatabaseManipulator.sell_shares_fifo")
+    def sell_shares_fifo(self, ticker, quantity, sale_date, sale_price):
+        """Sell `quantity` shares of `ticker` from its open lots, oldest first.
+
+        Every matched lot gets its own sales history row in a single transaction;
+        returns the LotMatch of each lot, or raises InsufficientSharesError.
+        """
+        LOGGER.info(
+            "Selling %s %s",
+            quantity,
+            ticker,
+            extra=fields(sale_date=sale_date, sale_price=sale_price),
+        )
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE;")
+            open_lots = conn.execute(
+                """
+                SELECT ll.investmentId, ll.remainingShares, ai.initialUnitPrice
+                FROM lotLedger ll
+                JOIN assetInvestments ai ON ai.id = ll.investmentId
+                WHERE ll.ticker = ? AND ll.remainingShares > 0
+                ORDER BY ll.purchaseDate, ll.investmentId
+            """,
+                (ticker,),
+            )
+            matches = allocate_fifo(open_lots, quantity, sale_price)
+            open_lots.close()
+
+            cursor.executemany(
+                """
+                INSERT INTO assetSalesHistory (
+                    investmentId, remainingShares, saleDate, quantitySold, salePrice
+                ) VALUES (?, ?, ?, ?, ?)
+            """,
+                [
+                    (match.investment_id, match.remaining_shares, sale_date, match.quantity, sale_price)
+                    for match in matches
+                ],
+            )
+            cursor.executemany(
+                "UPDATE assetInvestments SET soldShareStatus = ? WHERE id = ?",
+                [
+                    ("Sold" if match.remaining_shares == 0 else "Partially Sold", match.investment_id)
+                    for match in matches
+                ],
+            )
+            cursor.executemany(
+                "DELETE FROM portfolioSnapshot WHERE investmentId = ?",
+                [(match.investment_id,) for match in matches],
+            )
             conn.commit()
+        self.__bump_version()
+
+        return matches
+
+    @traced("DatabaseManipulator.fetch_deemed_disposals")
+    def fetch_deemed_disposals(self, start_date, end_date):
+        """Open lots whose deemed disposal falls between start_date and end_date, inclusive."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    ll.investmentId,
+                    ll.ticker,
+                    ll.purchaseDate,
+                    ll.deemedDisposalDate,
+                    ll.remainingShares,
+                    ai.initialUnitPrice
+                FROM lotLedger ll
+                JOIN assetInvestments ai ON ai.id = ll.investmentId
+                WHERE ll.deemedDisposalDate BETWEEN ? AND ?
+                  AND ll.remainingShares > 0
+                ORDER BY ll.deemedDisposalDate, ll.investmentId
+            """,
+                (str(start_date), str(end_date)),
+            )
+            return cursor.fetchall()
+
+    @traced("DatabaseManipulator.fetch_realized_gains")
+    def fetch_realized_gains(self):
+        """Matched-lot totals per ticker: (ticker, quantitySold, proceeds, realizedGainLoss)."""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    ticker,
+                    SUM(totalQuantitySold),
+                    ROUND(SUM(totalProceeds), 2),
+                    ROUND(SUM(realizedGainLoss), 2)
+                FROM lotLedger
+                GROUP BY ticker
+                ORDER BY ticker
+            """)
+            return cursor.fetchall()
 
     # def temp_function(self, investment_id=None):
     #     query = f"""
@@ -211,7 +592,7 @@ class DatabaseManipulator:
     #     if investment_id is not None:
     #         query += f" WHERE ai.id = {investment_id}"
 
-    #     with sqlite3.connect(self.database) as conn:
+    #     with self.connect() as conn:
     #         cursor = conn.cursor()
     #         cursor.execute(query)
     #         return cursor.fetchall()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date, timedelta
+
+from src.utils.database_operations import DatabaseManipulator
+
+EXIT_TAX_RATE = 0.41
+
+UPCOMING_COLUMNS = [
+    "ID",
+    "Ticker",
+    "Purchase Date",
+    "Deemed Disposal Date",
+    "Remaining Shares",
+    "Initial Unit Price",
+    "Current Price",
+    "Estimated Gain/Loss",
+    "Estimated Exit Tax",
+]
+
+
+def get_upcoming_deemed_disposals(
+    database_manipulator: DatabaseManipulator,
+    current_prices: dict,
+    days: int = 90,
+    today: date = None,
+) -> pd.DataFrame:
+    """Open lots reaching deemed disposal in the next `days` days, with the exit
+    tax they would owe if the current price held until then."""
+    today = today or date.today()
+    upcoming = pd.DataFrame.from_records(
+        database_manipulator.fetch_deemed_disposals(today, today + timedelta(days=days)),
+        columns=[
+            "ID",
+            "Ticker",
+            "Purchase Date",
+            "Deemed Disposal Date",
+            "Remaining Shares",
+            "Initial Unit Price",
+        ],
+    )
+
+    upcoming["Current Price"] = upcoming["Ticker"].map(current_prices).astype(float)
+    upcoming["Estimated Gain/Loss"] = np.round(
+        upcoming["Remaining Shares"]
+        * (upcoming["Current Price"] - upcoming["Initial Unit Price"]),
+        2,
+    )
+    upcoming["Estimated Exit Tax"] = np.round(
+        upcoming["Estimated Gain/Loss"].clip(lower=0) * EXIT_TAX_RATE, 2
+    )
+    return upcoming[UPCOMING_COLUMNS]
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+
+
+class InsufficientSharesError(ValueError):
+    """Raised when a sale is larger than the open position of its ticker."""
+
+
+@dataclass(frozen=True)
+class LotMatch:
+    investment_id: int
+    quantity: int
+    remaining_shares: int
+    gain: float
+
+
+def allocate_fifo(open_lots, quantity: int, sale_price: float) -> list:
+    """Match `quantity` sold shares against open lots, oldest first.
+
+    `open_lots` yields (investment_id, remaining_shares, initial_unit_price) in
+    purchase order and is read only as far as the sale needs.
+    """
+    if quantity <= 0:
+        raise ValueError(f"Expected a positive quantity, got {quantity}")
+
+    matches = []
+    unmatched = quantity
+    for investment_id, remaining_shares, initial_unit_price in open_lots:
+        matched = min(unmatched, remaining_shares)
+        matches.append(
+            LotMatch(
+                investment_id=investment_id,
+                quantity=matched,
+                remaining_shares=remaining_shares - matched,
+                gain=round(matched * (sale_price - initial_unit_price), 2),
+            )
+        )
+        unmatched -= matched
+        if unmatched == 0:
+            return matches
+
+    raise InsufficientSharesError(
+        f"Cannot sell {quantity} shares, only {quantity - unmatched} are open"
+    )
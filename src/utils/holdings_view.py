@@ -0,0 +1,33 @@
+import math
+import pandas as pd
+
+SOLD_SHARE_STATUSES = ["No", "Partially Sold", "Sold"]
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def contains(values: pd.Series, search: str) -> pd.Series:
+    """Case-insensitive substring match; missing values (and categoricals) never match."""
+    return values.astype("string").str.lower().str.contains(search, regex=False, na=False)
+
+
+def filter_holdings(
+    holdings: pd.DataFrame, search: str = "", statuses: list = None
+) -> pd.DataFrame:
+    """Lots whose ticker or asset name contains `search` and whose status is in `statuses`."""
+    mask = pd.Series(True, index=holdings.index)
+    search = search.strip().lower()
+    if search:
+        mask &= contains(holdings["Ticker"], search) | contains(holdings["Asset Name"], search)
+    if statuses:
+        mask &= holdings["Sold Share Status"].isin(statuses)
+    return holdings[mask]
+
+
+def get_page_count(row_count: int, page_size: int) -> int:
+    return max(1, math.ceil(row_count / page_size))
+
+
+def paginate(holdings: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """Rows of the 1-based `page`, clamped to the first and last pages."""
+    page = min(max(page, 1), get_page_count(len(holdings), page_size))
+    return holdings.iloc[(page - 1) * page_size : page * page_size]
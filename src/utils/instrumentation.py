@@ -0,0 +1,118 @@
+import os
+import time
+import functools
+import threading
+import contextvars
+
+from contextlib import contextmanager
+
+_RECORDER = contextvars.ContextVar("instrumentation_recorder", default=None)
+_ENABLED = os.environ.get("ETF_INSTRUMENTATION") == "1"
+
+
+class Recorder:
+    """Collects span durations and counters for one rerun."""
+
+    def __init__(self, name: str = None) -> None:
+        self.name = name
+        self.started_at = time.time()
+        self.spans = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, duration: float) -> None:
+        with self._lock:
+            count, total, longest = self.spans.get(name, (0, 0.0, 0.0))
+            self.spans[name] = (count + 1, total + duration, max(longest, duration))
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get_report(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "started_at": self.started_at,
+                "spans": [
+                    {
+                        "span": name,
+                        "calls": count,
+                        "total_ms": round(total * 1000, 3),
+                        "max_ms": round(longest * 1000, 3),
+                    }
+                    for name, (count, total, longest) in sorted(
+                        self.spans.items(), key=lambda item: -item[1][1]
+                    )
+                ],
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+def set_enabled(enabled: bool) -> None:
+    global _ENABLED
+    _ENABLED = enabled
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def start_recording(name: str = None):
+    """Attach a fresh Recorder to the current context; returns None when disabled."""
+    if not _ENABLED:
+        return None
+    recorder = Recorder(name)
+    return recorder, _RECORDER.set(recorder)
+
+
+def stop_recording(recording) -> dict:
+    if recording is None:
+        return None
+    recorder, token = recording
+    _RECORDER.reset(token)
+    return recorder.get_report()
+
+
+@contextmanager
+def span(name: str):
+    recorder = _RECORDER.get()
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_span(name, time.perf_counter() - start)
+
+
+def traced(name: str):
+    """Record every call of the decorated function as a span when a Recorder is active."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            recorder = _RECORDER.get()
+            if recorder is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                recorder.add_span(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def increment(name: str, amount: int = 1) -> None:
+    recorder = _RECORDER.get()
+    if recorder is not None:
+        recorder.increment(name, amount)
+
+
+def submit(executor, function, *args, **kwargs):
+    """executor.submit that keeps the caller's Recorder visible in the worker thread."""
+    return executor.submit(contextvars.copy_context().run, function, *args, **kwargs)
@@ -0,0 +1,110 @@
+import io
+import csv
+import logging
+
+from datetime import datetime
+
+from src.utils.database_operations import DatabaseManipulator
+
+LOGGER = logging.getLogger(__name__)
+
+COLUMN_ALIASES = {
+    "ticker": ("ticker", "symbol"),
+    "purchaseDate": ("purchasedate", "purchase_date", "purchase date", "date"),
+    "initialAmount": ("initialamount", "initial_amount", "amount", "quantity"),
+    "initialUnitPrice": ("initialunitprice", "initial_unit_price", "unit price", "price"),
+    "transactionFee": ("transactionfee", "transaction_fee", "fee", "fees"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y")
+
+
+class InvestmentImportError(ValueError):
+    pass
+
+
+class InvestmentImporter:
+    """Streams purchase history from a CSV file into DatabaseManipulator in bulk."""
+
+    def __init__(
+        self, database_manipulator: DatabaseManipulator, chunk_size: int = 1000
+    ) -> None:
+        self.database_manipulator = database_manipulator
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def __map_columns(header: list) -> dict:
+        normalized = {name.strip().lower(): name for name in header}
+        columns = {}
+        for column, aliases in COLUMN_ALIASES.items():
+            match = next(
+                (normalized[alias] for alias in aliases if alias in normalized), None
+            )
+            if match is None:
+                raise InvestmentImportError(f"Missing column: {column}")
+            columns[column] = match
+        return columns
+
+    @staticmethod
+    def __parse_date(value: str, line_number: int) -> str:
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), date_format).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+        raise InvestmentImportError(f"Line {line_number}: invalid purchase date {value!r}")
+
+    def validate_row(self, row: dict, columns: dict, line_number: int) -> tuple:
+        ticker = (row[columns["ticker"]] or "").strip().upper()
+        if not ticker:
+            raise InvestmentImportError(f"Line {line_number}: missing ticker")
+
+        purchase_date = self.__parse_date(row[columns["purchaseDate"]] or "", line_number)
+
+        try:
+            initial_amount = int(row[columns["initialAmount"]])
+            initial_unit_price = float(row[columns["initialUnitPrice"]])
+            transaction_fee = float(row[columns["transactionFee"]] or 0)
+        except (TypeError, ValueError):
+            raise InvestmentImportError(f"Line {line_number}: invalid number") from None
+
+        if initial_amount <= 0:
+            raise InvestmentImportError(f"Line {line_number}: amount must be positive")
+        if initial_unit_price < 0 or transaction_fee < 0:
+            raise InvestmentImportError(
+                f"Line {line_number}: prices and fees cannot be negative"
+            )
+
+        return (
+            ticker,
+            purchase_date,
+            initial_amount,
+            initial_unit_price,
+            transaction_fee,
+            "No",
+        )
+
+    def read_rows(self, file):
+        """Yield validated investment rows from a text or binary CSV file object."""
+        if not isinstance(file, io.TextIOBase):
+            file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None:
+            raise InvestmentImportError("The file is empty")
+        columns = self.__map_columns(reader.fieldnames)
+
+        for row in reader:
+            yield self.validate_row(row, columns, reader.line_num)
+
+    def import_csv(self, file) -> int:
+        """Load every row of `file` in a single transaction; nothing is kept on error."""
+        if isinstance(file, str):
+            with open(file, encoding="utf-8-sig", newline="") as csv_file:
+                return self.import_csv(csv_file)
+
+        inserted = self.database_manipulator.insert_investments_many(
+            self.read_rows(file), chunk_size=self.chunk_size
+        )
+        LOGGER.info("Imported %d investments from CSV", inserted)
+        return inserted
@@ -0,0 +1,134 @@
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FILE = "logs/user_log.log"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# Loggers written to once per row, and the 1-in-N rate their records are kept at.
+SAMPLED_LOGGERS = {"src.utils.data_loader.rows": 100}
+
+_LISTENER = None
+_FILTERS = []
+_LOCK = threading.Lock()
+
+
+def fields(**values) -> dict:
+    """`extra` for a log call, e.g. LOGGER.info("Sold %s", ticker, extra=fields(quantity=3))."""
+    return {"fields": values}
+
+
+def parse_levels(spec: str) -> dict:
+    """Parse "src.utils.data_loader=DEBUG,src.utils.price_store=WARNING" into {logger: level}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.rpartition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class StructuredFormatter(logging.Formatter):
+    """LOG_FORMAT followed by the record's fields as key=value pairs, values in JSON."""
+
+    def __init__(self, fmt: str = LOG_FORMAT) -> None:
+        super().__init__(fmt)
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        values = getattr(record, "fields", None)
+        if not values:
+            return message
+        pairs = " ".join(
+            f"{key}={json.dumps(value, default=str)}" for key, value in values.items()
+        )
+        return f"{message} {pairs}"
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one record in every `every`, for loggers that log once per row."""
+
+    def __init__(self, every: int) -> None:
+        super().__init__()
+        self.every = max(1, every)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            self._count += 1
+            return (self._count - 1) % self.every == 0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records as they are, leaving the %-formatting of their arguments to the
+    listener thread. Arguments must therefore not be mutated after the call."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(
+    filename: str = LOG_FILE,
+    level: str = None,
+    levels: dict = None,
+    sample_every: dict = None,
+) -> QueueListener:
+    """Route every log record through a queue to a file written by a background thread.
+
+    `level` sets the root level (default ETF_LOG_LEVEL or INFO), `levels` maps logger
+    names to their own levels (default parsed from ETF_LOG_LEVELS) and `sample_every`
+    overrides SAMPLED_LOGGERS. Only the first call in a process configures anything;
+    later calls return the running listener.
+    """
+    global _LISTENER
+    with _LOCK:
+        if _LISTENER is not None:
+            return _LISTENER
+
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(filename, encoding="utf-8")
+        file_handler.setFormatter(StructuredFormatter())
+
+        records = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.addHandler(DeferredQueueHandler(records))
+        root.setLevel(level or os.environ.get("ETF_LOG_LEVEL", "INFO").upper())
+
+        levels = parse_levels(os.environ.get("ETF_LOG_LEVELS", "")) if levels is None else levels
+        for name, logger_level in levels.items():
+            logging.getLogger(name).setLevel(logger_level)
+        for name, every in (SAMPLED_LOGGERS if sample_every is None else sample_every).items():
+            logger, sampling_filter = logging.getLogger(name), SamplingFilter(every)
+            logger.addFilter(sampling_filter)
+            _FILTERS.append((logger, sampling_filter))
+
+        _LISTENER = QueueListener(records, file_handler)
+        _LISTENER.start()
+        atexit.register(stop_logging)
+        return _LISTENER
+
+
+def stop_logging() -> None:
+    """Flush the queue, stop the listener thread and detach its handlers."""
+    global _LISTENER
+    with _LOCK:
+        if _LISTENER is None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        _LISTENER.stop()
+        for handler in _LISTENER.handlers:
+            handler.close()
+        while _FILTERS:
+            logger, sampling_filter = _FILTERS.pop()
+            logger.removeFilter(sampling_filter)
+        _LISTENER = None
@@ -0,0 +1,72 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from datetime import timedelta
+
+from src.assets.scripts.asset_ticker import AssetTicker
+from src.utils.instrumentation import increment
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_metadata_cache_path(database: str) -> str:
+    """The metadata cache file kept next to `database`."""
+    return f"{database}.metadata.json"
+
+
+class AssetMetadataCache:
+    """Ticker metadata (long name, currency, exchange) persisted to a JSON file.
+
+    Fetched entries are kept in memory until save() writes them out, so a batch of
+    lookups costs one write.
+    """
+
+    def __init__(self, path: str, ttl: timedelta = timedelta(days=7)) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.entries = self.__load()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable metadata cache: %s", self.path)
+            return {}
+
+    def save(self) -> None:
+        """Write the entries fetched since the last save, if any."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.entries, file)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def __is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl.total_seconds()
+
+    def get_metadata(self, asset_ticker: AssetTicker) -> dict:
+        entry = self.entries.get(asset_ticker.ticker)
+        if entry is None or not self.__is_fresh(entry):
+            increment("metadata_cache.misses")
+            LOGGER.info("Refreshing metadata for %s", asset_ticker.ticker)
+            entry = {**asset_ticker.get_metadata(), "fetched_at": time.time()}
+            with self._lock:
+                self.entries[asset_ticker.ticker] = entry
+                self._dirty = True
+        else:
+            increment("metadata_cache.hits")
+        return entry
+
+    def get_long_name(self, asset_ticker: AssetTicker) -> str:
+        return self.get_metadata(asset_ticker)["long_name"]
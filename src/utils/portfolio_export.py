@@ -0,0 +1,128 @@
+import os
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.valuation_engine import VALUED_COLUMNS
+
+LOGGER = logging.getLogger(__name__)
+
+FILE_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+TABLE_SCHEMAS = {
+    "assetInvestments": pa.schema(
+        [
+            ("id", pa.int64()),
+            ("ticker", pa.string()),
+            ("purchaseDate", pa.date32()),
+            ("initialAmount", pa.int64()),
+            ("initialUnitPrice", pa.float64()),
+            ("transactionFee", pa.float64()),
+            ("soldShareStatus", pa.string()),
+        ]
+    ),
+    "assetSalesHistory": pa.schema(
+        [
+            ("id", pa.int64()),
+            ("investmentId", pa.int64()),
+            ("remainingShares", pa.int64()),
+            ("saleDate", pa.date32()),
+            ("quantitySold", pa.int64()),
+            ("salePrice", pa.float64()),
+        ]
+    ),
+}
+
+VALUED_SCHEMA = pa.schema(
+    [
+        ("ID", pa.int64()),
+        ("Ticker", pa.string()),
+        ("Asset Name", pa.string()),
+        ("Purchase Date", pa.date32()),
+        ("Initial Amount", pa.int64()),
+        ("Initial Unit Price", pa.float64()),
+        ("Total Cost", pa.float64()),
+        ("Current Price", pa.float64()),
+        ("Transaction Fee", pa.float64()),
+        ("Unrealized Gain/Loss", pa.float64()),
+        ("Is Older Than Eight Years", pa.string()),
+        ("Deemed Disposal Date", pa.date32()),
+        ("Deemed Disposal Price", pa.float64()),
+        ("Sold Share Status", pa.string()),
+        ("Sale Date", pa.date32()),
+        ("Quantity Sold", pa.int64()),
+        ("Sale Price", pa.float64()),
+        ("Remaining Shares", pa.int64()),
+        ("Realized Gain/Loss (Deemed Disposal)", pa.float64()),
+        ("Realized Gain/Loss", pa.float64()),
+    ]
+)
+
+
+def get_valued_table(valued: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(
+        valued[VALUED_COLUMNS], schema=VALUED_SCHEMA, preserve_index=False
+    )
+
+
+def get_database_table(database_manipulator: DatabaseManipulator, table: str) -> pa.Table:
+    schema = TABLE_SCHEMAS[table]
+    with database_manipulator.connect() as conn:
+        frame = pd.read_sql_query(
+            f"SELECT {', '.join(schema.names)} FROM {table} ORDER BY id", conn
+        )
+    for field in schema:
+        if field.type == pa.date32():
+            frame[field.name] = pd.to_datetime(frame[field.name], format="%Y-%m-%d")
+    return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def write_table(table: pa.Table, path: str) -> None:
+    if path.endswith(FILE_FORMATS["arrow"]):
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, path)
+
+
+def read_table(path: str) -> pa.Table:
+    """Arrow IPC files are memory-mapped, so their columns are read without a copy."""
+    if path.endswith(FILE_FORMATS["arrow"]):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return pq.read_table(path, memory_map=True)
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    return read_table(path).to_pandas()
+
+
+def export_portfolio(
+    database_manipulator: DatabaseManipulator,
+    directory: str,
+    valued: pd.DataFrame = None,
+    file_format: str = "parquet",
+) -> dict:
+    """Write the raw tables, and the valued portfolio if given, to `directory`.
+
+    Returns the written path of each table.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported export format {file_format!r}, expected one of {list(FILE_FORMATS)}"
+        )
+    os.makedirs(directory, exist_ok=True)
+
+    tables = {
+        table: get_database_table(database_manipulator, table) for table in TABLE_SCHEMAS
+    }
+    if valued is not None:
+        tables["valuedPortfolio"] = get_valued_table(valued)
+
+    paths = {}
+    for name, table in tables.items():
+        paths[name] = os.path.join(directory, f"{name}{FILE_FORMATS[file_format]}")
+        write_table(table, paths[name])
+        LOGGER.info("Exported %d rows of %s to %s", table.num_rows, name, paths[name])
+    return paths
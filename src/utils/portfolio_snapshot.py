@@ -0,0 +1,228 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+
+from datetime import date
+
+from src.assets.scripts.asset_ticker import AssetTicker
+from src.assets.scripts.price_provider import PriceProvider
+from src.utils.data_loader import DataLoader
+from src.utils.database_operations import (
+    FETCH_CHUNK_SIZE,
+    FETCH_INVESTMENTS_QUERY,
+    DatabaseManipulator,
+)
+from src.utils.instrumentation import increment, traced
+from src.utils.valuation_engine import (
+    VALUED_COLUMNS,
+    ValuationEngine,
+    format_valued_dates,
+    get_valued_frame,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_COLUMNS = {
+    "ID": "investmentId",
+    "Ticker": "ticker",
+    "Asset Name": "assetName",
+    "Purchase Date": "purchaseDate",
+    "Initial Amount": "initialAmount",
+    "Initial Unit Price": "initialUnitPrice",
+    "Total Cost": "totalCost",
+    "Current Price": "currentPrice",
+    "Transaction Fee": "transactionFee",
+    "Unrealized Gain/Loss": "unrealizedGainLoss",
+    "Is Older Than Eight Years": "isOlderThanEightYears",
+    "Deemed Disposal Date": "deemedDisposalDate",
+    "Deemed Disposal Price": "deemedDisposalPrice",
+    "Sold Share Status": "soldShareStatus",
+    "Sale Date": "saleDate",
+    "Quantity Sold": "quantitySold",
+    "Sale Price": "salePrice",
+    "Remaining Shares": "remainingShares",
+    "Realized Gain/Loss (Deemed Disposal)": "deemedDisposalGainLoss",
+    "Realized Gain/Loss": "realizedGainLoss",
+}
+
+
+class PortfolioSnapshot:
+    """Valued lots materialized in the portfolioSnapshot table.
+
+    DatabaseManipulator deletes a lot's row whenever it writes to that lot, so a
+    load only values lots without a row, plus lots whose deemed disposal has come
+    due since they were valued. Quotes are refreshed in bulk once per window.
+    Unvalued lots are streamed and written `chunk_size` at a time.
+    """
+
+    def __init__(
+        self,
+        database_manipulator: DatabaseManipulator,
+        price_store=None,
+        metadata_cache=None,
+        price_provider: PriceProvider = None,
+        max_workers: int = None,
+        quote_refresh_seconds: int = 900,
+        chunk_size: int = FETCH_CHUNK_SIZE,
+    ) -> None:
+        self.database_manipulator = database_manipulator
+        self.price_store = price_store
+        self.metadata_cache = metadata_cache
+        self.price_provider = price_provider
+        self.max_workers = max_workers
+        self.quote_refresh_seconds = quote_refresh_seconds
+        self.chunk_size = chunk_size
+
+    def expire_stale_rows(self, today: date = None) -> int:
+        """Drop rows whose deemed disposal is now due or whose close is still missing."""
+        today = today or date.today()
+        with self.database_manipulator.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM portfolioSnapshot
+                WHERE (isOlderThanEightYears = 'No' AND deemedDisposalDueDate <= ?)
+                   OR (isOlderThanEightYears = 'Yes' AND deemedDisposalPrice IS NULL)
+            """,
+                (today.isoformat(),),
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def iter_unvalued_investments(self):
+        return self.database_manipulator.iter_rows(
+            FETCH_INVESTMENTS_QUERY
+            + "WHERE ai.id NOT IN (SELECT investmentId FROM portfolioSnapshot)",
+            chunk_size=self.chunk_size,
+        )
+
+    def fetch_unvalued_investments(self) -> list:
+        return [
+            investment
+            for investments in self.iter_unvalued_investments()
+            for investment in investments
+        ]
+
+    def get_data_loader(self) -> DataLoader:
+        return DataLoader(
+            [],
+            price_store=self.price_store,
+            metadata_cache=self.metadata_cache,
+            price_provider=self.price_provider,
+            max_workers=self.max_workers,
+        )
+
+    @traced("PortfolioSnapshot.refresh_investments")
+    def refresh_investments(
+        self, investments: list, today: date = None, data_loader: DataLoader = None
+    ) -> int:
+        """Value `investments` and upsert their rows. Passing the same `data_loader`
+        for successive chunks reuses the market data it already resolved."""
+        if not investments:
+            return 0
+
+        data_loader = data_loader or self.get_data_loader()
+        valued = data_loader.load_chunk_vectorized(investments, today=today)
+        due_dates = (
+            ValuationEngine(today)
+            .get_deemed_disposal_schedule(investments)["Deemed Disposal Date"]
+            .dt.strftime("%Y-%m-%d")
+        )
+
+        rows = (
+            format_valued_dates(valued, "%Y-%m-%d")
+            .astype(object)
+            .where(valued.notna(), None)
+        )
+        rows["deemedDisposalDueDate"] = due_dates.to_numpy()
+        rows["pricedAt"] = time.time()
+        columns = [*SNAPSHOT_COLUMNS.values(), "deemedDisposalDueDate", "pricedAt"]
+
+        with self.database_manipulator.connect() as conn:
+            conn.executemany(
+                f"""
+                INSERT OR REPLACE INTO portfolioSnapshot ({", ".join(columns)})
+                VALUES ({", ".join("?" * len(columns))})
+            """,
+                [
+                    tuple(value.item() if isinstance(value, np.generic) else value for value in row)
+                    for row in rows.itertuples(index=False)
+                ],
+            )
+            conn.commit()
+
+        increment("snapshot.rows_valued", len(rows))
+        LOGGER.info("Valued %d lots into the portfolio snapshot", len(rows))
+        return len(rows)
+
+    @traced("PortfolioSnapshot.refresh_prices")
+    def refresh_prices(self, now: float = None, priced_before: float = None) -> int:
+        """Reprice every row quoted before `priced_before`, by default the start of
+        the current refresh window."""
+        now = now or time.time()
+        window_start = priced_before or (
+            now // self.quote_refresh_seconds * self.quote_refresh_seconds
+        )
+
+        with self.database_manipulator.connect() as conn:
+            stale = pd.read_sql_query(
+                """
+                SELECT investmentId, ticker, initialAmount, initialUnitPrice, transactionFee
+                FROM portfolioSnapshot
+                WHERE pricedAt < ?
+            """,
+                conn,
+                params=(window_start,),
+            )
+            if stale.empty:
+                return 0
+
+            current_prices = AssetTicker.get_current_prices(
+                sorted(stale["ticker"].unique()), price_provider=self.price_provider
+            )
+            stale["currentPrice"] = stale["ticker"].map(current_prices).astype(float)
+            stale = stale[stale["currentPrice"].notna()]
+            stale["unrealizedGainLoss"] = np.round(
+                (stale["currentPrice"] - stale["initialUnitPrice"]) * stale["initialAmount"]
+                - stale["transactionFee"],
+                2,
+            )
+
+            conn.executemany(
+                """
+                UPDATE portfolioSnapshot
+                SET currentPrice = ?, unrealizedGainLoss = ?, pricedAt = ?
+                WHERE investmentId = ?
+            """,
+                zip(
+                    stale["currentPrice"].tolist(),
+                    stale["unrealizedGainLoss"].tolist(),
+                    [now] * len(stale),
+                    stale["investmentId"].tolist(),
+                ),
+            )
+            conn.commit()
+
+        increment("snapshot.rows_repriced", len(stale))
+        return len(stale)
+
+    def read(self) -> pd.DataFrame:
+        with self.database_manipulator.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {', '.join(SNAPSHOT_COLUMNS.values())} "
+                "FROM portfolioSnapshot ORDER BY investmentId"
+            )
+            snapshot = pd.DataFrame.from_records(cursor.fetchall(), columns=VALUED_COLUMNS)
+        return get_valued_frame(snapshot)
+
+    @traced("PortfolioSnapshot.load")
+    def load(self, today: date = None, priced_before: float = None) -> pd.DataFrame:
+        """Bring the snapshot up to date and return it in the home page layout."""
+        self.expire_stale_rows(today)
+        data_loader = self.get_data_loader()
+        for investments in self.iter_unvalued_investments():
+            self.refresh_investments(investments, today, data_loader)
+        self.refresh_prices(priced_before=priced_before)
+        return self.read()
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date, timedelta
+from typing import Callable
+
+from src.assets.scripts.price_provider import PriceProvider, YFinancePriceProvider
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.instrumentation import traced
+
+LOT_COLUMNS = [
+    "ID",
+    "Ticker",
+    "Purchase Date",
+    "Initial Amount",
+    "Initial Unit Price",
+    "Transaction Fee",
+]
+SALE_COLUMNS = ["Investment ID", "Sale Date", "Quantity Sold"]
+HISTORY_COLUMNS = ["Value", "Cost Basis", "Unrealized Gain/Loss"]
+
+
+def fetch_lots_and_sales(database_manipulator: DatabaseManipulator) -> tuple:
+    """Every lot, and every sale that actually sold shares, as two frames."""
+    with database_manipulator.connect() as conn:
+        lots = pd.read_sql_query(
+            """
+            SELECT id, ticker, purchaseDate, initialAmount, initialUnitPrice, transactionFee
+            FROM assetInvestments
+            ORDER BY id
+        """,
+            conn,
+        )
+        sales = pd.read_sql_query(
+            """
+            SELECT investmentId, saleDate, quantitySold
+            FROM assetSalesHistory
+            WHERE quantitySold > 0 AND saleDate IS NOT NULL
+        """,
+            conn,
+        )
+    lots.columns = LOT_COLUMNS
+    sales.columns = SALE_COLUMNS
+    return lots, sales
+
+
+class PortfolioTimeSeries:
+    """Daily value, cost basis and unrealized gain of the whole portfolio.
+
+    Holdings change only on purchase and sale dates, so each of those is scattered
+    into a ticker x date matrix of share and cost deltas and a cumulative sum over
+    dates yields what was held every day. Multiplying by the ticker x date close
+    matrix values the portfolio with array operations, whatever the lot count.
+    `clock` supplies the as-of date the series ends on.
+    """
+
+    def __init__(
+        self,
+        price_provider: PriceProvider = None,
+        clock: Callable[[], date] = date.today,
+    ) -> None:
+        self.price_provider = price_provider or YFinancePriceProvider()
+        self.clock = clock
+
+    def get_dates(self, lots: pd.DataFrame) -> pd.DatetimeIndex:
+        first_purchase = pd.to_datetime(lots["Purchase Date"], format="%Y-%m-%d").min()
+        return pd.bdate_range(first_purchase, self.clock())
+
+    def get_close_matrix(self, tickers: list, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Closes as a ticker x date array, carried forward over market holidays."""
+        history = self.price_provider.get_history(
+            tickers, dates[0].date(), dates[-1].date() + timedelta(days=1)
+        )
+        history.index = pd.to_datetime(history.index).tz_localize(None).normalize()
+        closes = (
+            history.reindex(columns=tickers)
+            .reindex(history.index.union(dates))
+            .ffill()
+            .reindex(dates)
+        )
+        return closes.to_numpy(dtype=float).T
+
+    def get_holdings(
+        self, lots: pd.DataFrame, sales: pd.DataFrame, tickers: list, dates: pd.DatetimeIndex
+    ) -> tuple:
+        """Shares held and their cost basis as ticker x date arrays."""
+        ticker_index = pd.Index(tickers)
+        lots = lots.set_index("ID")
+        sold = sales.join(lots, on="Investment ID", how="inner")
+        event_tickers = np.concatenate(
+            [ticker_index.get_indexer(lots["Ticker"]), ticker_index.get_indexer(sold["Ticker"])]
+        )
+        event_dates = dates.searchsorted(
+            pd.to_datetime(
+                np.concatenate([lots["Purchase Date"], sold["Sale Date"]]), format="%Y-%m-%d"
+            )
+        )
+        share_deltas = np.concatenate([lots["Initial Amount"], -sold["Quantity Sold"]]).astype(float)
+        cost_deltas = np.concatenate(
+            [
+                lots["Initial Amount"] * lots["Initial Unit Price"] + lots["Transaction Fee"],
+                # Sales release the fee pro rata with the shares they sell.
+                -sold["Quantity Sold"]
+                * (sold["Initial Unit Price"] + sold["Transaction Fee"] / sold["Initial Amount"]),
+            ]
+        )
+
+        in_range = event_dates < len(dates)
+        shape = (len(tickers), len(dates))
+        shares = np.zeros(shape)
+        cost_basis = np.zeros(shape)
+        np.add.at(shares, (event_tickers[in_range], event_dates[in_range]), share_deltas[in_range])
+        np.add.at(cost_basis, (event_tickers[in_range], event_dates[in_range]), cost_deltas[in_range])
+        return np.cumsum(shares, axis=1), np.cumsum(cost_basis, axis=1)
+
+    @traced("PortfolioTimeSeries.compute")
+    def compute(self, lots: pd.DataFrame, sales: pd.DataFrame) -> pd.DataFrame:
+        dates = self.get_dates(lots) if not lots.empty else pd.DatetimeIndex([])
+        if dates.empty:
+            return pd.DataFrame(columns=HISTORY_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+
+        tickers = sorted(lots["Ticker"].unique())
+        shares, cost_basis = self.get_holdings(lots, sales, tickers, dates)
+        closes = self.get_close_matrix(tickers, dates)
+
+        # A ticker with no close yet is valued at cost rather than at zero.
+        value = np.where(np.isnan(closes), cost_basis, shares * closes).sum(axis=0)
+        cost_basis = cost_basis.sum(axis=0)
+        return pd.DataFrame(
+            {
+                "Value": np.round(value, 2),
+                "Cost Basis": np.round(cost_basis, 2),
+                "Unrealized Gain/Loss": np.round(value - cost_basis, 2),
+            },
+            index=pd.DatetimeIndex(dates, name="Date"),
+        )
+
+    def load(self, database_manipulator: DatabaseManipulator) -> pd.DataFrame:
+        return self.compute(*fetch_lots_and_sales(database_manipulator))
@@ -0,0 +1,66 @@
+import sqlite3
+import logging
+
+from datetime import date
+
+from src.utils.connection_manager import CONNECTION_MANAGER, ConnectionManager
+from src.utils.instrumentation import traced
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PriceStore:
+    """Local store of daily closes, so historical prices are fetched only once."""
+
+    def __init__(
+        self, database: str, connection_manager: ConnectionManager = CONNECTION_MANAGER
+    ) -> None:
+        self.database = database
+        self.connection_manager = connection_manager
+        self.connection_manager.initialize_once(
+            self.database, "priceHistory", self.__create_table
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        return self.connection_manager.get_connection(self.database)
+
+    def close(self) -> None:
+        self.connection_manager.close(self.database)
+
+    def __create_table(self):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS priceHistory (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    close REAL NOT NULL,
+                    PRIMARY KEY (ticker, date)
+                ) WITHOUT ROWID;
+            """)
+            conn.commit()
+
+    @traced("PriceStore.get_close")
+    def get_close(self, ticker: str, close_date: date) -> float:
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT close FROM priceHistory WHERE ticker = ? AND date = ?",
+                (ticker, close_date.strftime("%Y-%m-%d")),
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    @traced("PriceStore.save_close")
+    def save_close(self, ticker: str, close_date: date, close: float) -> None:
+        LOGGER.debug("Storing close for %s on %s: %s", ticker, close_date, close)
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO priceHistory (ticker, date, close)
+                VALUES (?, ?, ?)
+            """,
+                (ticker, close_date.strftime("%Y-%m-%d"), close),
+            )
+            conn.commit()
@@ -0,0 +1,202 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from src.assets.scripts.price_provider import PriceProvider, YFinancePriceProvider
+from src.utils.connection_manager import CONNECTION_MANAGER, ConnectionManager
+from src.utils.instrumentation import increment
+
+LOGGER = logging.getLogger(__name__)
+
+REFRESHERS = {}
+
+
+class QuoteStore:
+    """Latest published quote per ticker, kept in memory and in the latestQuotes table."""
+
+    def __init__(
+        self, database: str, connection_manager: ConnectionManager = CONNECTION_MANAGER
+    ) -> None:
+        self.database = database
+        self.connection_manager = connection_manager
+        self.connection_manager.initialize_once(
+            self.database, "latestQuotes", self.__create_table
+        )
+        self._lock = threading.Lock()
+        self._quotes = self.__load()
+
+    def connect(self) -> sqlite3.Connection:
+        return self.connection_manager.get_connection(self.database)
+
+    def __create_table(self):
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS latestQuotes (
+                    ticker TEXT PRIMARY KEY,
+                    price REAL NOT NULL,
+                    fetchedAt REAL NOT NULL
+                ) WITHOUT ROWID;
+            """)
+            conn.commit()
+
+    def __load(self) -> dict:
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT ticker, price, fetchedAt FROM latestQuotes")
+            return {ticker: (price, fetched_at) for ticker, price, fetched_at in cursor.fetchall()}
+
+    def publish(self, prices: dict, fetched_at: float = None) -> None:
+        fetched_at = fetched_at or time.time()
+        with self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO latestQuotes (ticker, price, fetchedAt) VALUES (?, ?, ?)",
+                [(ticker, price, fetched_at) for ticker, price in prices.items()],
+            )
+            conn.commit()
+        with self._lock:
+            self._quotes = {
+                **self._quotes,
+                **{ticker: (price, fetched_at) for ticker, price in prices.items()},
+            }
+
+    def get_quotes(self, tickers: list = None) -> dict:
+        """ticker -> (price, fetched_at) for every published ticker in `tickers`."""
+        quotes = self._quotes
+        if tickers is None:
+            return dict(quotes)
+        return {ticker: quotes[ticker] for ticker in tickers if ticker in quotes}
+
+    def get_prices(self, tickers: list = None) -> dict:
+        return {ticker: price for ticker, (price, _) in self.get_quotes(tickers).items()}
+
+    def get_last_published(self) -> float:
+        return max((fetched_at for _, fetched_at in self._quotes.values()), default=None)
+
+
+class PublishedQuotePriceProvider(PriceProvider):
+    """Serves current prices from a QuoteStore and everything else from `price_provider`.
+
+    Tickers not published yet have no current price instead of triggering a request;
+    `on_missing` is called so the refresher can pick them up early.
+    """
+
+    def __init__(
+        self,
+        quote_store: QuoteStore,
+        price_provider: PriceProvider = None,
+        on_missing=None,
+    ) -> None:
+        self.quote_store = quote_store
+        self.price_provider = price_provider or YFinancePriceProvider()
+        self.on_missing = on_missing
+
+    def get_current_price(self, ticker: str) -> float:
+        prices = self.get_current_prices([ticker])
+        if ticker not in prices:
+            raise KeyError(f"No published quote for {ticker}")
+        return prices[ticker]
+
+    def get_current_prices(self, tickers: list) -> dict:
+        prices = self.quote_store.get_prices(tickers)
+        if len(prices) < len(tickers) and self.on_missing is not None:
+            self.on_missing()
+        return prices
+
+    def get_previous_price(self, ticker, close_date):
+        return self.price_provider.get_previous_price(ticker, close_date)
+
+    def get_history(self, tickers, start, end):
+        return self.price_provider.get_history(tickers, start, end)
+
+    def get_metadata(self, ticker):
+        return self.price_provider.get_metadata(ticker)
+
+
+class QuoteRefresher:
+    """Daemon thread refreshing the quotes of every ticker in the database every `interval` seconds."""
+
+    def __init__(
+        self,
+        database: str,
+        price_provider: PriceProvider = None,
+        interval: float = 900,
+        quote_store: QuoteStore = None,
+    ) -> None:
+        self.database = database
+        self.price_provider = price_provider or YFinancePriceProvider()
+        self.interval = interval
+        self.quote_store = quote_store or QuoteStore(database)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def get_tickers(self) -> list:
+        with self.quote_store.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT ticker FROM assetInvestments ORDER BY ticker")
+            return [row[0] for row in cursor.fetchall()]
+
+    def refresh_once(self) -> dict:
+        tickers = self.get_tickers()
+        if not tickers:
+            return {}
+        prices = self.price_provider.get_current_prices(tickers)
+        self.quote_store.publish(prices)
+        increment("quote_refresher.published", len(prices))
+        LOGGER.info("Published %d of %d quotes", len(prices), len(tickers))
+        return prices
+
+    def request_refresh(self) -> None:
+        """Refresh now rather than at the end of the current interval."""
+        self._wake.set()
+
+    def __run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_once()
+            except Exception as error:
+                LOGGER.warning("Quote refresh failed: %s", error)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self) -> "QuoteRefresher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.__run, name="quote-refresher", daemon=True
+            )
+            self._thread.start()
+            REFRESHERS[os.path.abspath(self.database)] = self
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        REFRESHERS.pop(os.path.abspath(self.database), None)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_price_provider(self) -> PublishedQuotePriceProvider:
+        return PublishedQuotePriceProvider(
+            self.quote_store, self.price_provider, on_missing=self.request_refresh
+        )
+
+
+def get_quote_refresher(database: str) -> QuoteRefresher:
+    """The refresher started for `database` in this process, if any."""
+    return REFRESHERS.get(os.path.abspath(database))
+
+
+def format_quote_age(fetched_at: float, now: float = None) -> str:
+    seconds = max(0, int((now or time.time()) - fetched_at))
+    if seconds < 60:
+        return f"{seconds}s ago"
+    if seconds < 3600:
+        return f"{seconds // 60} min ago"
+    return f"{seconds // 3600} h {seconds % 3600 // 60} min ago"
@@ -0,0 +1,137 @@
+import time
+import logging
+import threading
+
+import pandas as pd
+
+from datetime import date
+
+from src.assets.scripts.price_provider import PriceProvider
+from src.utils.database_operations import DatabaseManipulator
+from src.utils.deemed_disposal_schedule import get_upcoming_deemed_disposals
+from src.utils.instrumentation import increment
+from src.utils.metadata_cache import AssetMetadataCache, get_metadata_cache_path
+from src.utils.portfolio_snapshot import PortfolioSnapshot
+from src.utils.portfolio_timeseries import PortfolioTimeSeries
+from src.utils.price_store import PriceStore
+from src.utils.quote_refresher import get_quote_refresher
+
+LOGGER = logging.getLogger(__name__)
+
+QUOTE_REFRESH_SECONDS = 15 * 60
+FETCH_WORKERS = 8
+
+
+class VersionedCache:
+    """Keeps the last computed value per key and recomputes it only when its version changes."""
+
+    def __init__(self) -> None:
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, compute):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            increment("result_cache.hits")
+            return entry[1]
+
+        increment("result_cache.misses")
+
+        LOGGER.info("Recomputing %s for version %s", key, version)
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self, key=None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+RESULT_CACHE = VersionedCache()
+
+
+def fetch_investments_cached(database_manipulator: DatabaseManipulator) -> list:
+    return RESULT_CACHE.get(
+        (database_manipulator.database, "investments"),
+        database_manipulator.get_version(),
+        database_manipulator.fetch_investments,
+    )
+
+
+def load_portfolio_cached(
+    database_manipulator: DatabaseManipulator,
+    price_provider: PriceProvider = None,
+    metadata_cache: AssetMetadataCache = None,
+) -> pd.DataFrame:
+    """Valued portfolio from the snapshot, reread when the database changes or the quotes go stale.
+
+    While a QuoteRefresher runs for the database, quotes come from what it last
+    published rather than from the network.
+    """
+    investments = fetch_investments_cached(database_manipulator)
+    if not investments:
+        return None
+
+    quote_refresher = (
+        get_quote_refresher(database_manipulator.database) if price_provider is None else None
+    )
+    if quote_refresher is not None:
+        price_provider = quote_refresher.get_price_provider()
+        priced_before = quote_refresher.quote_store.get_last_published()
+        quotes_version = priced_before
+    else:
+        priced_before = None
+        quotes_version = int(time.time() // QUOTE_REFRESH_SECONDS)
+
+    def load_portfolio() -> pd.DataFrame:
+        return PortfolioSnapshot(
+            database_manipulator,
+            price_store=PriceStore(database_manipulator.database),
+            metadata_cache=metadata_cache
+            or AssetMetadataCache(get_metadata_cache_path(database_manipulator.database)),
+            price_provider=price_provider,
+            max_workers=FETCH_WORKERS,
+            quote_refresh_seconds=QUOTE_REFRESH_SECONDS,
+        ).load(priced_before=priced_before)
+
+    return RESULT_CACHE.get(
+        (database_manipulator.database, "portfolio"),
+        (database_manipulator.get_version(), quotes_version),
+        load_portfolio,
+    )
+
+
+def load_portfolio_history_cached(
+    database_manipulator: DatabaseManipulator, price_provider: PriceProvider = None
+) -> pd.DataFrame:
+    """Daily portfolio value since the first purchase, rebuilt on writes and once a day."""
+    today = date.today()
+    return RESULT_CACHE.get(
+        (database_manipulator.database, "history"),
+        (database_manipulator.get_version(), today),
+        lambda: PortfolioTimeSeries(price_provider, clock=lambda: today).load(
+            database_manipulator
+        ),
+    )
+
+
+def get_upcoming_deemed_disposals_cached(
+    database_manipulator: DatabaseManipulator, current_prices: dict, days: int = 90
+) -> pd.DataFrame:
+    """Upcoming deemed disposals, recomputed on writes, once a day, or when the window
+    or the prices they are estimated at change."""
+    today = date.today()
+    prices = tuple(
+        sorted((ticker, price) for ticker, price in current_prices.items() if pd.notna(price))
+    )
+    return RESULT_CACHE.get(
+        (database_manipulator.database, "upcoming_deemed_disposals"),
+        (database_manipulator.get_version(), today, days, prices),
+        lambda: get_upcoming_deemed_disposals(
+            database_manipulator, dict(prices), days=days, today=today
+        ),
+    )
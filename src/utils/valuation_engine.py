@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+from datetime import date
+
+from src.utils.instrumentation import increment, traced
+
+INVESTMENT_COLUMNS = [
+    "ID",
+    "Ticker",
+    "Purchase Date",
+    "Initial Amount",
+    "Initial Unit Price",
+    "Transaction Fee",
+    "Sold Share Status",
+    "Remaining Shares",
+    "Sale Date",
+    "Quantity Sold",
+    "Sale Price",
+]
+
+VALUED_COLUMNS = [
+    "ID",
+    "Ticker",
+    "Asset Name",
+    "Purchase Date",
+    "Initial Amount",
+    "Initial Unit Price",
+    "Total Cost",
+    "Current Price",
+    "Transaction Fee",
+    "Unrealized Gain/Loss",
+    "Is Older Than Eight Years",
+    "Deemed Disposal Date",
+    "Deemed Disposal Price",
+    "Sold Share Status",
+    "Sale Date",
+    "Quantity Sold",
+    "Sale Price",
+    "Remaining Shares",
+    "Realized Gain/Loss (Deemed Disposal)",
+    "Realized Gain/Loss",
+]
+
+VALUED_DATE_COLUMNS = ["Purchase Date", "Deemed Disposal Date", "Sale Date"]
+
+# Repeated labels are categoricals and numerics are nullable, so a lot without a
+# quote or a sale keeps its column's dtype instead of falling back to object.
+VALUED_DTYPES = {
+    "ID": "int64",
+    "Ticker": "category",
+    "Asset Name": "category",
+    "Initial Amount": "Int64",
+    "Initial Unit Price": "Float64",
+    "Total Cost": "Float64",
+    "Current Price": "Float64",
+    "Transaction Fee": "Float64",
+    "Unrealized Gain/Loss": "Float64",
+    "Is Older Than Eight Years": "category",
+    "Deemed Disposal Price": "Float64",
+    "Sold Share Status": "category",
+    "Quantity Sold": "Int64",
+    "Sale Price": "Float64",
+    "Remaining Shares": "Int64",
+    "Realized Gain/Loss (Deemed Disposal)": "Float64",
+    "Realized Gain/Loss": "Float64",
+}
+
+DEEMED_DISPOSAL_PERIOD = pd.Timedelta(days=365.25 * 8)
+
+
+def format_dates(dates: pd.Series, date_format: str = "%d/%m/%Y") -> pd.Series:
+    """strftime each distinct date once; lots share far fewer dates than rows."""
+    codes, uniques = pd.factorize(dates)
+    formatted = np.append(np.asarray(uniques.strftime(date_format), dtype=object), None)
+    return pd.Series(formatted[codes], index=dates.index, dtype=object)
+
+
+def get_valued_frame(columns) -> pd.DataFrame:
+    """Build the valued frame from one sequence per column, with VALUED_DTYPES applied
+    and the date columns (dates, datetimes or ISO strings) as datetimes.
+
+    Every loader returns this schema; dates become strings only where they are shown,
+    through format_valued_dates.
+    """
+    return pd.DataFrame(
+        {
+            column: (
+                pd.Series(pd.to_datetime(columns[column]), dtype="datetime64[ns]")
+                if column in VALUED_DATE_COLUMNS
+                else pd.Series(columns[column], dtype=VALUED_DTYPES[column])
+            )
+            for column in VALUED_COLUMNS
+        }
+    )
+
+
+def format_valued_dates(valued: pd.DataFrame, date_format: str = "%d/%m/%Y") -> pd.DataFrame:
+    """The valued frame with its date columns as strings, for display or storage."""
+    return valued.assign(
+        **{column: format_dates(valued[column], date_format) for column in VALUED_DATE_COLUMNS}
+    )
+
+
+class ValuationEngine:
+    """Columnar counterpart of SharesDetail, valuing every lot with array operations."""
+
+    def __init__(self, today: date = None) -> None:
+        self.today = today or date.today()
+
+    def get_deemed_disposal_schedule(self, investments: list) -> pd.DataFrame:
+        raw = pd.DataFrame.from_records(investments, columns=INVESTMENT_COLUMNS)
+        return self._get_deemed_disposal_schedule(raw)
+
+    def _get_deemed_disposal_schedule(self, raw: pd.DataFrame) -> pd.DataFrame:
+        purchase_date = pd.to_datetime(raw["Purchase Date"], format="%Y-%m-%d")
+        deemed_disposal_date = purchase_date + DEEMED_DISPOSAL_PERIOD
+        last_close_date = deemed_disposal_date - pd.to_timedelta(
+            (deemed_disposal_date.dt.weekday - 4) % 7, unit="D"
+        )
+        return pd.DataFrame(
+            {
+                "Ticker": raw["Ticker"],
+                "Purchase Date": purchase_date,
+                "Deemed Disposal Date": deemed_disposal_date,
+                "Last Close Date": last_close_date,
+                "Triggered": pd.Timestamp(self.today) >= deemed_disposal_date,
+            }
+        )
+
+    def get_deemed_disposal_close_dates(self, investments: list) -> list:
+        """Distinct (ticker, close date) pairs whose close is needed for triggered lots."""
+        schedule = self.get_deemed_disposal_schedule(investments)
+        triggered = schedule.loc[schedule["Triggered"], ["Ticker", "Last Close Date"]]
+        return [
+            (ticker, close_date.date())
+            for ticker, close_date in triggered.drop_duplicates().itertuples(index=False)
+        ]
+
+    @traced("ValuationEngine.value")
+    def value(
+        self,
+        investments: list,
+        current_prices: dict,
+        deemed_disposal_prices: dict,
+        asset_names: dict = None,
+    ) -> pd.DataFrame:
+        raw = pd.DataFrame.from_records(investments, columns=INVESTMENT_COLUMNS)
+        increment("rows_processed", len(raw))
+        schedule = self._get_deemed_disposal_schedule(raw)
+        triggered = schedule["Triggered"].to_numpy()
+
+        initial_amount = raw["Initial Amount"].to_numpy(dtype=float)
+        initial_unit_price = raw["Initial Unit Price"].to_numpy(dtype=float)
+        transaction_fee = raw["Transaction Fee"].to_numpy(dtype=float)
+        quantity_sold = raw["Quantity Sold"].fillna(0).to_numpy(dtype=float)
+        sale_price = raw["Sale Price"].fillna(0).to_numpy(dtype=float)
+        current_price = raw["Ticker"].map(current_prices).to_numpy(dtype=float)
+
+        if deemed_disposal_prices:
+            close_keys = pd.MultiIndex.from_arrays(
+                [raw["Ticker"], schedule["Last Close Date"].dt.date]
+            )
+            closes = (
+                pd.Series(deemed_disposal_prices, dtype=float)
+                .reindex(close_keys)
+                .to_numpy()
+            )
+        else:
+            closes = np.full(len(raw), np.nan)
+        deemed_disposal_price = np.where(triggered, closes, np.nan)
+
+        deemed_disposal_gain_loss = np.where(
+            triggered,
+            np.round(initial_amount * (deemed_disposal_price - initial_unit_price), 2),
+            0.0,
+        )
+        sale_gain_loss = quantity_sold * (sale_price - initial_unit_price)
+        realized_gain_loss = np.round(
+            np.where(
+                raw["Sold Share Status"].to_numpy() != "No",
+                sale_gain_loss - deemed_disposal_gain_loss,
+                sale_gain_loss,
+            ),
+            2,
+        )
+
+        has_deemed_disposal_price = triggered & (
+            np.nan_to_num(deemed_disposal_price) != 0
+        )
+
+        return get_valued_frame(
+            {
+                "ID": raw["ID"],
+                "Ticker": raw["Ticker"],
+                "Asset Name": raw["Ticker"].map(asset_names or {}),
+                "Purchase Date": schedule["Purchase Date"],
+                "Initial Amount": raw["Initial Amount"],
+                "Initial Unit Price": raw["Initial Unit Price"],
+                "Total Cost": initial_amount * initial_unit_price,
+                "Current Price": current_price,
+                "Transaction Fee": raw["Transaction Fee"],
+                "Unrealized Gain/Loss": np.round(
+                    (current_price - initial_unit_price) * initial_amount
+                    - transaction_fee,
+                    2,
+                ),
+                "Is Older Than Eight Years": np.where(triggered, "Yes", "No"),
+                "Deemed Disposal Date": schedule["Deemed Disposal Date"].where(
+                    has_deemed_disposal_price
+                ),
+                "Deemed Disposal Price": deemed_disposal_price,
+                "Sold Share Status": raw["Sold Share Status"],
+                "Sale Date": pd.to_datetime(raw["Sale Date"], format="%Y-%m-%d"),
+                "Quantity Sold": raw["Quantity Sold"].fillna(0),
+                "Sale Price": raw["Sale Price"],
+                "Remaining Shares": raw["Remaining Shares"],
+                "Realized Gain/Loss (Deemed Disposal)": deemed_disposal_gain_loss,
+                "Realized Gain/Loss": realized_gain_loss,
+            }
+        )